@@ -0,0 +1,143 @@
+"""
+Startup benchmark for the bot.
+
+Prints a `python -X importtime` breakdown of importing the bot module and
+measures time-to-first-update: main.py is started against a fake Bot API
+server that delivers a single /start update, and the clock stops when the
+bot's reply arrives.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 3] [--top 15]
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOT_TOKEN = "123456:benchmark"
+
+
+def import_time_breakdown(top: int) -> None:
+    """Print the slowest imports of src.bot.telegram_bot by cumulative time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.bot.telegram_bot"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        self_us, cumulative_us, module = int(fields[0]), int(fields[1]), fields[2].rstrip()
+        rows.append((cumulative_us, self_us, module))
+
+    # Top-level imports are the ones not nested (indented) under another
+    total_us = sum(cumulative for cumulative, _, module in rows if not module.startswith("  "))
+    print(f"Import of src.bot.telegram_bot: {total_us / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, module in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+
+
+class QuietServer(ThreadingHTTPServer):
+    """Server that ignores connections dropped by the terminated bot."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        pass
+
+
+class FakeBotApi(BaseHTTPRequestHandler):
+    """Minimal Bot API: getMe, one /start update, and any send* method."""
+
+    update_delivered = False
+    reply_received = threading.Event()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _respond(self, result) -> None:
+        body = json.dumps({"ok": True, "result": result}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        method = self.path.rsplit("/", 1)[-1]
+        now = int(time.time())
+        chat = {"id": 1, "type": "private", "first_name": "Bench"}
+        if method == "getMe":
+            self._respond({"id": 123456, "is_bot": True, "first_name": "Bench", "username": "bench_bot"})
+        elif method == "getUpdates":
+            if FakeBotApi.update_delivered:
+                time.sleep(0.2)
+                self._respond([])
+                return
+            FakeBotApi.update_delivered = True
+            self._respond([{
+                "update_id": 1,
+                "message": {
+                    "message_id": 1, "date": now, "chat": chat, "text": "/start",
+                    "from": {"id": 1, "is_bot": False, "first_name": "Bench", "username": "bench"},
+                    "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+                },
+            }])
+        elif method.startswith("send"):
+            FakeBotApi.reply_received.set()
+            self._respond({"message_id": 2, "date": now, "chat": chat, "text": "ok"})
+        else:
+            self._respond(True)
+
+
+def time_to_first_update(timeout: float) -> float:
+    """Start main.py against the fake API and time until its first reply."""
+    FakeBotApi.update_delivered = False
+    FakeBotApi.reply_received.clear()
+    server = QuietServer(("127.0.0.1", 0), FakeBotApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    env = dict(
+        os.environ,
+        BOT_TOKEN=BOT_TOKEN,
+        BOT_API_BASE_URL=f"http://127.0.0.1:{server.server_address[1]}/bot",
+        ENABLE_USER_RESTRICTION="false",
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "main.py")],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            if not FakeBotApi.reply_received.wait(timeout):
+                raise RuntimeError("bot did not reply to the benchmark update")
+            return time.perf_counter() - start
+        finally:
+            process.terminate()
+            process.wait()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure bot cold start.")
+    parser.add_argument("--runs", type=int, default=3, help="time-to-first-update runs")
+    parser.add_argument("--top", type=int, default=15, help="number of imports to list")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for a reply")
+    args = parser.parse_args()
+
+    import_time_breakdown(args.top)
+    print()
+    timings = [time_to_first_update(args.timeout) for _ in range(args.runs)]
+    print("Time to first update: " + ", ".join(f"{t * 1000:.0f} ms" for t in timings))
+    print(f"Best: {min(timings) * 1000:.0f} ms")
@@ -0,0 +1,155 @@
+"""
+Worker benchmark for the bot.
+
+Measures update throughput for different numbers of worker processes:
+main.py is started against a fake Bot API server with WORKERS set, every
+simulated user sends /start once to warm the workers up, then a burst of
+/help updates from all users is delivered and the clock stops when the
+last reply arrives. WORKERS=0 handles the updates in the polling process.
+
+Usage:
+    python benchmarks/worker_benchmark.py [--workers 0 1 2 4] [--updates 2000] [--users 64]
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOT_TOKEN = "123456:benchmark"
+# Telegram returns at most this many updates per getUpdates call
+UPDATES_PER_POLL = 100
+
+
+class QuietServer(ThreadingHTTPServer):
+    """Server that ignores connections dropped by the terminated bot."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        pass
+
+
+class FakeBotApi(BaseHTTPRequestHandler):
+    """Minimal Bot API: getMe, queued updates, and any send* method."""
+
+    lock = threading.Lock()
+    pending = []
+    next_update_id = 1
+    replies = 0
+    replies_changed = threading.Condition(lock)
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _respond(self, result) -> None:
+        body = json.dumps({"ok": True, "result": result}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        method = self.path.rsplit("/", 1)[-1]
+        now = int(time.time())
+        chat = {"id": 1, "type": "private", "first_name": "Bench"}
+        if method == "getMe":
+            self._respond({"id": 123456, "is_bot": True, "first_name": "Bench", "username": "bench_bot"})
+        elif method == "getUpdates":
+            with FakeBotApi.lock:
+                updates = FakeBotApi.pending[:UPDATES_PER_POLL]
+                del FakeBotApi.pending[:UPDATES_PER_POLL]
+            if not updates:
+                time.sleep(0.05)
+            self._respond(updates)
+        elif method.startswith("send"):
+            with FakeBotApi.lock:
+                FakeBotApi.replies += 1
+                FakeBotApi.replies_changed.notify_all()
+            self._respond({"message_id": 2, "date": now, "chat": chat, "text": "ok"})
+        else:
+            self._respond(True)
+
+    @classmethod
+    def deliver(cls, text: str, users: int, count: int) -> None:
+        """Queue count commands, sent by the users in turn."""
+        with cls.lock:
+            for i in range(count):
+                user_id = 1000 + i % users
+                cls.pending.append({
+                    "update_id": cls.next_update_id,
+                    "message": {
+                        "message_id": cls.next_update_id, "date": int(time.time()), "text": text,
+                        "chat": {"id": user_id, "type": "private", "first_name": "Bench"},
+                        "from": {"id": user_id, "is_bot": False, "first_name": "Bench", "username": f"bench{user_id}"},
+                        "entities": [{"type": "bot_command", "offset": 0, "length": len(text)}],
+                    },
+                })
+                cls.next_update_id += 1
+
+    @classmethod
+    def wait_for_replies(cls, count: int, timeout: float) -> None:
+        """Wait until count replies arrived in total."""
+        with cls.lock:
+            if not cls.replies_changed.wait_for(lambda: cls.replies >= count, timeout):
+                raise RuntimeError(f"only {cls.replies} of {count} replies arrived")
+
+
+def throughput(workers: int, updates: int, users: int, timeout: float) -> float:
+    """Start main.py with the given number of workers and time a burst of updates."""
+    FakeBotApi.pending.clear()
+    FakeBotApi.replies = 0
+    server = QuietServer(("127.0.0.1", 0), FakeBotApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    env = dict(
+        os.environ,
+        BOT_TOKEN=BOT_TOKEN,
+        BOT_API_BASE_URL=f"http://127.0.0.1:{server.server_address[1]}/bot",
+        ENABLE_USER_RESTRICTION="false",
+        WORKERS=str(workers),
+        SNAPSHOT_INTERVAL="0",
+        DIGEST_INTERVAL="0",
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "main.py")],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            # Every user once, so every worker has started and imported its handlers
+            FakeBotApi.deliver("/start", users, users)
+            FakeBotApi.wait_for_replies(users, timeout)
+            start = time.perf_counter()
+            FakeBotApi.deliver("/help", users, updates)
+            FakeBotApi.wait_for_replies(users + updates, timeout)
+            return updates / (time.perf_counter() - start)
+        finally:
+            process.terminate()
+            process.wait()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure update throughput per number of workers.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4], help="numbers of workers to compare")
+    parser.add_argument("--updates", type=int, default=2000, help="updates in the measured burst")
+    parser.add_argument("--users", type=int, default=64, help="distinct users sending them")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for the replies")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.updates} updates from {args.users} users")
+    print(f"{'workers':>8} {'updates/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        rate = throughput(workers, args.updates, args.users, args.timeout)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>10.0f} {rate / baseline:>7.2f}x")
@@ -0,0 +1,15 @@
+import argparse
+import time
+
+from src.constant.constant import CATALOG_INDEX_SUFFIX
+from src.model.catalog import build_catalog
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index a catalog dump of anime titles for CATALOG_FILE.")
+    parser.add_argument("source", help="JSON or CSV dump of titles and episode counts")
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    count = build_catalog(args.source, args.source + CATALOG_INDEX_SUFFIX)
+
+    print(f"Indexed {count} titles into {args.source}{CATALOG_INDEX_SUFFIX} in {time.monotonic() - start:.1f} s.")
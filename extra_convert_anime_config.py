@@ -0,0 +1,21 @@
+import argparse
+
+from src.model.serializer import (
+    FORMAT_JSON,
+    FORMAT_COMPACT_JSON,
+    FORMAT_ORJSON,
+    FORMAT_MSGPACK,
+    convert_config,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert anime_config to another format.")
+    parser.add_argument("source", nargs="?", default="anime_config.json", help="config to convert (any format)")
+    parser.add_argument("--format", required=True,
+                        choices=[FORMAT_JSON, FORMAT_COMPACT_JSON, FORMAT_ORJSON, FORMAT_MSGPACK])
+    parser.add_argument("--output", help="where to write the result (default: overwrite source)")
+    args = parser.parse_args()
+
+    convert_config(args.source, args.output or args.source, args.format)
+
+    print(f"Converted {args.source} to {args.format}.")
@@ -0,0 +1,31 @@
+import argparse
+import sys
+import time
+
+from src.model.snapshot import list_snapshots, restore_snapshot
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List or restore snapshots of anime_config.")
+    parser.add_argument("snapshot", nargs="?", help="snapshot file to restore (default: the newest)")
+    parser.add_argument("--dir", default="snapshots", help="snapshot directory (default: snapshots)")
+    parser.add_argument("--config", default="anime_config.json", help="config to replace (default: anime_config.json)")
+    parser.add_argument("--list", action="store_true", help="only list the snapshots, newest first")
+    args = parser.parse_args()
+
+    snapshots = list_snapshots(args.dir, args.config)
+    if args.list:
+        for snapshot in snapshots:
+            created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot.created))
+            print(f"{created}  {snapshot.digest}  {snapshot.path}")
+        sys.exit(0)
+
+    if args.snapshot:
+        path = args.snapshot
+    elif snapshots:
+        path = snapshots[0].path
+    else:
+        sys.exit(f"No snapshots of {args.config} in {args.dir}.")
+
+    count = restore_snapshot(path, args.config)
+
+    print(f"Restored {count} animes from {path} to {args.config}.")
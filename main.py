@@ -1,11 +1,17 @@
 """Main entry point for the Telegram bot application."""
 
 from src.log.logging_config import setup_root_logging, setup_logging
-from src.bot.telegram_bot import TelegramBot
+from src.bot.bot_runner import BotRunner
+from src.config.config import Config
 
 if __name__ == '__main__':
     setup_root_logging()
     setup_logging("tg_bot")
 
-    bot = TelegramBot()
-    bot.run()
+    config = Config()
+    if config.workers > 0:
+        from src.bot.shard_runner import ShardRunner
+
+        ShardRunner(config).run()
+    else:
+        BotRunner(config).run()
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional
+import asyncio
+import os
+import shutil
+import signal
+
+from src.bot.telegram_bot import TelegramBot
+from src.config.config import Config, RESTART_SETTINGS
+from src.constant.constant import (
+    ANIME_CONFIG_FILE,
+    CHANGE_EVENT_INTERVAL,
+    LEGACY_POSITIONS_FILE,
+    RELOAD_INTERVAL,
+    SHUTDOWN_DRAIN_TIMEOUT,
+)
+from src.model.anime import AnimeDetailsManager
+from src.manager.WatchdogManager import WatchdogManager
+
+if TYPE_CHECKING:
+    from telegram.ext import ContextTypes
+
+import logging
+logger = logging.getLogger("tg_bot")
+
+class BotRunner:
+    """Run one or more bots on a single event loop.
+
+    Every bot polls with its own application, handlers and sessions, while
+    the loop, the watchdog, the reload of .env and the anime config, and with
+    BOT_STORAGE=shared the anime store are shared by all of them.
+    """
+
+    # Signals stopping the bots
+    STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+    def __init__(self, config: Config, bots: Optional[List[TelegramBot]] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            config: Configuration shared by the bots
+            bots: Bots to run, created from BOT_TOKENS if not given
+        """
+        self.config = config
+        self.bots = bots if bots is not None else self.create_bots(config)
+        self.watchdog_manager = WatchdogManager(self.bots, config.health_port)
+        self.stopping: Optional[asyncio.Event] = None
+        for anime_manager in self.anime_managers():
+            anime_manager.load_warm_start()
+            anime_manager.prepare_indexes()
+
+    @staticmethod
+    def create_bots(config: Config) -> List[TelegramBot]:
+        """
+        Create a bot per configured token.
+
+        Args:
+            config: Configuration with the bot tokens
+
+        Returns:
+            List of bots
+        """
+        if not any(name for name, _ in config.bot_tokens):
+            return [TelegramBot(config)]
+        anime_manager = None
+        if config.shared_storage:
+            anime_manager = AnimeDetailsManager(
+                columnar=config.columnar_store,
+                config_format=config.config_format,
+                lazy=config.lazy_store,
+            )
+        else:
+            BotRunner.copy_root_config(config.bot_tokens[0][0])
+        bots = [
+            TelegramBot(config, name=name, token=token, anime_manager=anime_manager)
+            for name, token in config.bot_tokens
+        ]
+        if anime_manager is not None:
+            # The first bot takes the snapshots of the shared store
+            bots[0].owns_anime_manager = True
+        return bots
+
+    @staticmethod
+    def copy_root_config(name: str) -> None:
+        """
+        Give the first named bot the anime list kept next to main.py.
+
+        With separate storage a named bot reads its own directory, so the
+        list of a single-bot setup would be ignored once BOT_TOKENS is set.
+        It is copied while the bot has no config of its own, and left in
+        place.
+
+        Args:
+            name: Name of the first bot
+        """
+        target = os.path.join(name, ANIME_CONFIG_FILE)
+        if not os.path.exists(ANIME_CONFIG_FILE) or os.path.exists(target):
+            return
+        os.makedirs(name, exist_ok=True)
+        # Old buttons of the single bot resolve through the legacy positions
+        for file_name in (ANIME_CONFIG_FILE, LEGACY_POSITIONS_FILE):
+            if os.path.exists(file_name):
+                shutil.copy2(file_name, os.path.join(name, file_name))
+        logger.warning(f"Copied {ANIME_CONFIG_FILE} to {target}; the other bots start with their own empty lists")
+
+    def anime_managers(self) -> List[AnimeDetailsManager]:
+        """
+        Get the anime stores of the bots, each once.
+
+        Returns:
+            List of anime stores
+        """
+        return list({id(bot.anime_manager): bot.anime_manager for bot in self.bots}.values())
+
+    async def reload_files(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job applying edits made to .env and the anime configs while running."""
+        changed = self.config.reload()
+        restart = [name for name in changed if name in RESTART_SETTINGS]
+        if restart:
+            logger.warning(f"Changed settings {restart} take effect after a restart")
+        for anime_manager in self.anime_managers():
+            try:
+                anime_manager.reload_if_changed()
+            except Exception:
+                # Retried when the file changes again, e.g. once an editor finished saving
+                logger.warning(f"Failed to reload {anime_manager.config}, keeping the loaded animes", exc_info=True)
+
+    async def deliver_change_events(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job applying queued anime changes to the indexes in one batch per index."""
+        for anime_manager in self.anime_managers():
+            anime_manager.deliver_events()
+
+    async def start_updates(self, bot: TelegramBot) -> None:
+        """
+        Start feeding updates to a started bot.
+
+        Args:
+            bot: The bot, with its application started
+        """
+        await bot.application.updater.start_polling()
+
+    async def stop_updates(self, bot: TelegramBot) -> None:
+        """
+        Stop feeding updates to a bot; the ones already fed are still handled.
+
+        Args:
+            bot: The bot
+        """
+        if bot.application.updater.running:
+            await bot.application.updater.stop()
+
+    async def drain(self, bots: List[TelegramBot]) -> None:
+        """
+        Stop the applications once they handled the updates they received,
+        abandoning what is left after SHUTDOWN_DRAIN_TIMEOUT.
+
+        Args:
+            bots: Bots whose intake is stopped
+        """
+        stopping = {}
+        for bot in bots:
+            application = bot.application
+            if application.running:
+                pending = application.update_queue.qsize()
+                if pending:
+                    logger.info(f"Bot {bot.name or 'default'}: finishing {pending} received updates")
+                stopping[asyncio.ensure_future(application.stop())] = bot
+        if not stopping:
+            return
+        _, unfinished = await asyncio.wait(stopping, timeout=SHUTDOWN_DRAIN_TIMEOUT)
+        for task in unfinished:
+            bot = stopping[task]
+            logger.warning(f"Bot {bot.name or 'default'}: abandoning {bot.application.update_queue.qsize()} "
+                           f"updates not handled within {SHUTDOWN_DRAIN_TIMEOUT} seconds")
+            task.cancel()
+            if bot.application.job_queue is not None:
+                await bot.application.job_queue.stop(wait=False)
+
+    def run(self) -> None:
+        """Start the bots and block until the process is interrupted."""
+        asyncio.run(self._run())
+
+    async def _run(self) -> None:
+        """Run every bot until one of STOP_SIGNALS."""
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in self.STOP_SIGNALS:
+            try:
+                loop.add_signal_handler(signum, self.stopping.set)
+            except NotImplementedError:
+                # Windows, where Ctrl+C raises KeyboardInterrupt instead
+                pass
+
+        started = []
+        try:
+            for bot in self.bots:
+                application = bot.build_application()
+                await application.initialize()
+                started.append(bot)
+                await application.start()
+                await self.start_updates(bot)
+                logger.info(f"Bot {bot.name or 'default'} started successfully")
+            await self.watchdog_manager.start()
+
+            job_queue = self.bots[0].application.job_queue
+            if job_queue is not None:
+                job_queue.run_repeating(self.reload_files, RELOAD_INTERVAL)
+                job_queue.run_repeating(self.deliver_change_events, CHANGE_EVENT_INTERVAL)
+            else:
+                logger.warning("JobQueue is not available (install python-telegram-bot[job-queue]); "
+                               "sessions are only written on shutdown and time out when next used, "
+                               "edits to .env are ignored, edits to the anime config are merged on the next change "
+                               "and indexes catch up with changes when next read")
+            await self.stopping.wait()
+        finally:
+            logger.info("Stopping bots")
+            # Stop taking updates everywhere before waiting for any handler
+            for bot in started:
+                try:
+                    await self.stop_updates(bot)
+                except Exception:
+                    logger.error(f"Failed to stop updates of bot {bot.name or 'default'}", exc_info=True)
+            await self.drain(started)
+            for bot in reversed(started):
+                try:
+                    await bot.application.shutdown()
+                finally:
+                    await bot.shutdown(bot.application)
+            for anime_manager in self.anime_managers():
+                try:
+                    await asyncio.to_thread(anime_manager.save_warm_start)
+                except Exception:
+                    logger.error(f"Failed to save {anime_manager.warm_start_path}", exc_info=True)
+            # Closing the health server blocks the loop, so it is closed last
+            self.watchdog_manager.stop()
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+from multiprocessing.process import BaseProcess
+from typing import TYPE_CHECKING, Dict, List, Optional
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+from src.bot.bot_runner import BotRunner
+from src.bot.telegram_bot import TelegramBot
+from src.config.config import Config
+from src.constant.constant import (
+    WORKER_DIR,
+    WORKER_CHECK_INTERVAL,
+    WORKER_STOP_TIMEOUT,
+    WORKER_READ_TIMEOUT,
+)
+from src.manager.WatchdogManager import WatchdogManager
+from src.model.anime import AnimeDetailsManager
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+    from telegram import Update
+
+import logging
+logger = logging.getLogger("tg_bot")
+
+class ShardRunner:
+    """Spread updates over worker processes by user ID.
+
+    The front process polls Telegram and forwards each update to the worker
+    chosen by the ID of its user, so all updates of a user are handled in
+    order by the same worker, which keeps that user's sessions. Workers
+    answer through the Bot API themselves. An exited worker is started
+    again with a new queue, and the updates forwarded meanwhile are moved
+    to it.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialize the runner.
+
+        Args:
+            config: Configuration with the number of workers
+        """
+        if any(name for name, _ in config.bot_tokens):
+            raise ValueError("WORKERS cannot be combined with BOT_TOKENS")
+        self.config = config
+        self.context = multiprocessing.get_context('spawn')
+        self.queues: List[Queue] = [self.context.Queue() for _ in range(config.workers)]
+        # Serializes the workers' writes of the shared anime config
+        self.write_lock = self.context.Lock()
+        self.workers: List[Optional[BaseProcess]] = [None] * config.workers
+        self.forwarded = [0] * config.workers
+        # Liveness of the workers as last seen by _watch_workers
+        self.alive = [False] * config.workers
+        self.restarts = [0] * config.workers
+        self.exitcodes: List[Optional[int]] = [None] * config.workers
+        self.polling = False
+        # Workers would compete for the health port, so this process serves it
+        self.watchdog_manager = WatchdogManager([], config.health_port)
+        self.watchdog_manager.shard_status = self.get_status
+        # Worker index -> updates forwarded while its queue is being replaced
+        self.held: Dict[int, List[str]] = {}
+        self.stopping: Optional[asyncio.Event] = None
+
+    async def start_worker(self, index: int) -> None:
+        """
+        Start a worker process.
+
+        Args:
+            index: Index of the worker
+        """
+        if self.workers[index] is not None:
+            # A killed worker may still hold the read lock of its queue, so the
+            # new one gets a fresh queue with what could still be read. The
+            # blocking reads run in a thread; updates forwarded meanwhile are
+            # held back and queued after the moved ones, keeping their order.
+            old_queue, new_queue = self.queues[index], self.context.Queue()
+            self.held[index] = []
+            try:
+                moved = await asyncio.to_thread(self._move_queued, old_queue, new_queue)
+            finally:
+                self.queues[index] = new_queue
+                for data in self.held.pop(index):
+                    new_queue.put(data)
+            old_queue.cancel_join_thread()
+            old_queue.close()
+            logger.info(f"Moved {moved} queued updates to the new worker {index}")
+        process = self.context.Process(
+            target=run_worker, args=(index, self.queues[index], self.write_lock), name=f"worker-{index}"
+        )
+        process.start()
+        self.workers[index] = process
+        self.alive[index] = True
+        logger.info(f"Started worker {index} (PID {process.pid})")
+
+    @staticmethod
+    def _move_queued(old_queue: Queue, new_queue: Queue) -> int:
+        """Move the updates that can still be read from one queue to another."""
+        moved = 0
+        try:
+            while True:
+                new_queue.put(old_queue.get(timeout=WORKER_READ_TIMEOUT))
+                moved += 1
+        except queue.Empty:
+            pass
+        return moved
+
+    def shard(self, update: Update) -> int:
+        """
+        Choose the worker of an update.
+
+        Args:
+            update: The update
+
+        Returns:
+            Index of the worker handling the update's user
+        """
+        user = update.effective_user
+        return user.id % len(self.queues) if user is not None else 0
+
+    def forward(self, update: Update) -> None:
+        """
+        Send an update to its worker.
+
+        Args:
+            update: The update
+        """
+        index = self.shard(update)
+        data = json.dumps(update.to_dict())
+        if index in self.held:
+            self.held[index].append(data)
+        else:
+            self.queues[index].put(data)
+        self.forwarded[index] += 1
+
+    async def _forward_updates(self, update_queue: asyncio.Queue) -> None:
+        """Forward polled updates until cancelled."""
+        while True:
+            self.forward(await update_queue.get())
+
+    async def _watch_workers(self) -> None:
+        """Start workers again once they exit, recording their liveness for the health checks."""
+        while True:
+            await asyncio.sleep(WORKER_CHECK_INTERVAL)
+            for index, process in enumerate(self.workers):
+                if not process.is_alive():
+                    self.alive[index] = False
+                    self.exitcodes[index] = process.exitcode
+                    self.restarts[index] += 1
+                    logger.warning(f"Worker {index} exited with code {process.exitcode}, starting it again")
+                    await self.start_worker(index)
+
+    def get_status(self) -> Dict:
+        """
+        Get the figures of the front process and its workers; safe to call from any thread.
+
+        Returns:
+            Dictionary with whether the front process polls, and the PID,
+            liveness, restarts, last exit code and forwarded updates of every
+            worker
+        """
+        workers = []
+        for index, process in enumerate(self.workers):
+            workers.append({
+                'pid': process.pid if process is not None else None,
+                'alive': self.alive[index],
+                'restarts': self.restarts[index],
+                'last_exitcode': self.exitcodes[index],
+                'forwarded': self.forwarded[index],
+            })
+        return {'polling': self.polling, 'workers': workers}
+
+    def run(self) -> None:
+        """Start the workers and poll until the process is interrupted."""
+        asyncio.run(self._run())
+
+    async def _run(self) -> None:
+        """Poll and forward updates until SIGINT or SIGTERM, then stop the workers."""
+        from telegram import Bot
+        from telegram.ext import Updater
+
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in BotRunner.STOP_SIGNALS:
+            try:
+                loop.add_signal_handler(signum, self.stopping.set)
+            except NotImplementedError:
+                # Windows, where Ctrl+C raises KeyboardInterrupt instead
+                pass
+
+        await self.watchdog_manager.start()
+        for index in range(len(self.workers)):
+            await self.start_worker(index)
+        kwargs = {'base_url': self.config.bot_api_base_url} if self.config.bot_api_base_url else {}
+        update_queue: asyncio.Queue = asyncio.Queue()
+        updater = Updater(Bot(self.config.bot_token, **kwargs), update_queue)
+        tasks = []
+        try:
+            await updater.initialize()
+            await updater.start_polling()
+            self.polling = True
+            tasks.append(loop.create_task(self._forward_updates(update_queue)))
+            tasks.append(loop.create_task(self._watch_workers()))
+            logger.info(f"Forwarding updates to {len(self.workers)} workers")
+            await self.stopping.wait()
+        finally:
+            logger.info("Stopping workers")
+            self.polling = False
+            for task in tasks:
+                task.cancel()
+            if updater.running:
+                await updater.stop()
+            await updater.shutdown()
+            while not update_queue.empty():
+                self.forward(update_queue.get_nowait())
+            # Workers handle the updates already queued before they stop
+            for updates in self.queues:
+                updates.put(None)
+            for index, process in enumerate(self.workers):
+                if process is None:
+                    continue
+                await asyncio.to_thread(process.join, WORKER_STOP_TIMEOUT)
+                if process.is_alive():
+                    logger.warning(f"Worker {index} did not stop in {WORKER_STOP_TIMEOUT} seconds, terminating it")
+                    process.terminate()
+            logger.info(f"Updates forwarded per worker: {self.forwarded}")
+            self.watchdog_manager.stop()
+
+
+class WorkerRunner(BotRunner):
+    """Run the bot of one worker process on updates forwarded by the front process.
+
+    Sessions and digests of the worker are kept in WORKER_DIR/<index>. The
+    anime config is shared by all workers: each merges the edits of the
+    others before it writes and reloads them every RELOAD_INTERVAL.
+    """
+
+    # SIGINT reaches the whole process group; the front process stops the
+    # workers once it forwarded everything it polled
+    STOP_SIGNALS = (signal.SIGTERM,)
+
+    def __init__(self, config: Config, index: int, updates: Queue, write_lock):
+        """
+        Initialize the worker.
+
+        Args:
+            config: Configuration
+            index: Index of the worker
+            updates: Queue of updates forwarded to this worker, ended by None
+            write_lock: Lock serializing the workers' writes of the anime config
+        """
+        anime_manager = AnimeDetailsManager(
+            columnar=config.columnar_store,
+            config_format=config.config_format,
+            lazy=config.lazy_store,
+        )
+        anime_manager.write_lock = write_lock
+        bot = TelegramBot(config, name=os.path.join(WORKER_DIR, str(index)), anime_manager=anime_manager)
+        # The first worker takes the snapshots of the shared anime config
+        bot.owns_anime_manager = index == 0
+        super().__init__(config, [bot])
+        # The front process serves the health port; stalls are still logged
+        self.watchdog_manager.port = None
+        self.updates = updates
+        self._reader: Optional[threading.Thread] = None
+        self._reader_stopped = threading.Event()
+
+    async def start_updates(self, bot: TelegramBot) -> None:
+        """Feed forwarded updates to the bot from a reader thread."""
+        self._reader = threading.Thread(
+            target=self._read_updates, args=(bot, asyncio.get_running_loop()), name="update-reader", daemon=True
+        )
+        self._reader.start()
+
+    async def stop_updates(self, bot: TelegramBot) -> None:
+        """Stop the reader thread, leaving unread updates to the next worker."""
+        self._reader_stopped.set()
+        if self._reader is not None:
+            await asyncio.to_thread(self._reader.join)
+
+    def _read_updates(self, bot: TelegramBot, loop: asyncio.AbstractEventLoop) -> None:
+        """Move updates from the worker queue to the application until stopped or None arrives."""
+        from telegram import Update
+
+        application = bot.application
+        while not self._reader_stopped.is_set():
+            try:
+                data = self.updates.get(timeout=WORKER_READ_TIMEOUT)
+            except queue.Empty:
+                continue
+            if data is None:
+                loop.call_soon_threadsafe(self.stopping.set)
+                return
+            update = Update.de_json(json.loads(data), application.bot)
+            loop.call_soon_threadsafe(application.update_queue.put_nowait, update)
+
+
+def run_worker(index: int, updates: Queue, write_lock) -> None:
+    """
+    Entry point of a worker process.
+
+    Args:
+        index: Index of the worker
+        updates: Queue of updates forwarded to this worker
+        write_lock: Lock serializing the workers' writes of the anime config
+    """
+    from src.log.logging_config import setup_root_logging, setup_logging
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_root_logging()
+    setup_logging("tg_bot")
+    WorkerRunner(Config(), index, updates, write_lock).run()
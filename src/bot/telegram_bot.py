@@ -1,33 +1,46 @@
-from telegram import (
-    Update,
-)
-from telegram.ext import (
-    Application,
-    CommandHandler,
-    CallbackQueryHandler,
-    ContextTypes,
-    MessageHandler,
-    filters,
-    ConversationHandler,
-)
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+import os
 
 from src.config.config import Config
 from src.constant.constant import (
-    STATE_ANIME_NAME,
-    STATE_EDIT_DESCRIPTION,
-    STATE_EDIT_EPISODE,
+    STATE_END,
+    ANIME_CONFIG_FILE,
+    SESSION_FILE,
+    SESSION_TTL,
+    SESSION_FLUSH_INTERVAL,
+    SESSION_SWEEP_INTERVAL,
+    PANEL_MAX_AGE,
+    SNAPSHOT_FIRST_DELAY,
+    SEEN_UPDATES_FILE,
+    SEEN_UPDATES_WINDOW,
+    SEEN_UPDATES_LIMIT,
     UNAUTHORIZED_MESSAGE,
 )
 from src.model.anime import AnimeDetailsManager
-from src.keyboard.keyboard import (
-    get_core_function_keyboard,
+from src.model.catalog import Catalog, get_catalog
+from src.model.serializer import FORMAT_JSON, FORMAT_COMPACT_JSON, get_serializer
+from src.model.seen_updates import SeenUpdates
+from src.model.session_store import SessionStore
+from src.manager.ButtonCallbackManager import ButtonCallbackManager
+from src.manager.FeatureHandlerManager import (
+    FeatureHandlerManager,
+    FEATURE_COMMANDS,
+    FEATURE_TEXTS,
+    FEATURE_STATE_INPUTS,
+    FEATURE_BUTTON_CALLBACKS,
 )
+from src.manager.DigestManager import DigestManager
+from src.manager.PanelManager import PanelManager
+from src.manager.SnapshotManager import SnapshotManager
+from src.manager.StateMachineManager import StateMachineManager
 
-from src.functionality.StartFeature.StartFeatureHandler import StartFeatureHandler
-from src.functionality.AddAnimeFeature.AddAnimeFeatureHandler import AddAnimeFeatureHandler
-from src.functionality.GetAnimesFeature.GetAnimesFeatureHandler import GetAnimesFeatureHandler
-from src.functionality.HelpFeature.HelpFeatureHandler import HelpFeatureHandler
-from src.manager.ButtonCallbackManager import ButtonCallbackManager
+# telegram, the keyboards and the feature handlers are imported on first use
+# to keep cold start short
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import Application, ContextTypes
 
 import logging
 logger = logging.getLogger("tg_bot")
@@ -35,20 +48,93 @@ logger = logging.getLogger("tg_bot")
 class TelegramBot:
     """Main Telegram bot class for anime management."""
     
-    def __init__(self):
-        """Initialize the bot with configuration and managers."""
-        logger.info("Initializing TelegramBot")
-        self.config = Config()
-        self.anime_manager = AnimeDetailsManager()
-        self.current_edit = {}
+    def __init__(self, config: Optional[Config] = None, name: str = '', token: Optional[str] = None,
+                 anime_manager: Optional[AnimeDetailsManager] = None):
+        """
+        Initialize the bot with configuration and managers.
+
+        Args:
+            config: Configuration, read from the environment if not given
+            name: Name of the bot when several run in one process; its files
+                are kept in a directory of that name
+            token: Bot token, defaults to BOT_TOKEN
+            anime_manager: Anime store shared with other bots; by default the
+                bot loads its own
+        """
+        logger.info(f"Initializing TelegramBot {name}".rstrip())
+        self.config = config or Config()
+        self.name = name
+        self.token = token or self.config.bot_token
+        if name:
+            os.makedirs(name, exist_ok=True)
+        self.owns_anime_manager = anime_manager is None
+        self.anime_manager = anime_manager or AnimeDetailsManager(
+            columnar=self.config.columnar_store,
+            config_format=self.config.config_format,
+            lazy=self.config.lazy_store,
+            path=self.storage_path(ANIME_CONFIG_FILE),
+        )
+        # Sessions are small and rewritten often, so never pretty-print them
+        session_format = FORMAT_COMPACT_JSON if self.config.config_format == FORMAT_JSON else self.config.config_format
+        session_file = self.storage_path(SESSION_FILE)
+        self.session_store = SessionStore(
+            session_file, get_serializer(session_format), SESSION_TTL, PANEL_MAX_AGE
+        )
+        try:
+            self.session_store.load()
+        except FileNotFoundError:
+            logger.info(f"{session_file} not found, starting without sessions")
+        except Exception:
+            logger.warning(f"Failed to restore sessions from {session_file}, starting without sessions", exc_info=True)
+        seen_file = self.storage_path(SEEN_UPDATES_FILE)
+        self.seen_updates = SeenUpdates(
+            seen_file, get_serializer(session_format), SEEN_UPDATES_WINDOW, SEEN_UPDATES_LIMIT
+        )
+        try:
+            self.seen_updates.load()
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.warning(f"Failed to restore {seen_file}, redelivered updates may be handled twice", exc_info=True)
+        self.application: Optional[Application] = None
+        self.update_count = 0
+        # Pending edits per user, persisted with the conversation states
+        # kept by the state machine
+        self.current_edit = self.session_store
         self.button_callback_manager = ButtonCallbackManager(self)
-        
-        self.start_handler = StartFeatureHandler(self)
-        self.add_anime_handler = AddAnimeFeatureHandler(self)
-        self.get_animes_handler = GetAnimesFeatureHandler(self)
-        self.help_handler = HelpFeatureHandler(self)
+        self.feature_handler_manager = FeatureHandlerManager(self)
+        self.state_machine_manager = StateMachineManager(self)
+        self.panel_manager = PanelManager(self)
+        self.snapshot_manager = SnapshotManager(self)
+        self.digest_manager = DigestManager(self)
         logger.info("TelegramBot initialization completed")
 
+    def storage_path(self, file_name: str) -> str:
+        """
+        Get the path of a file of this bot.
+
+        Args:
+            file_name: Name of the file
+
+        Returns:
+            Path inside the bot's directory, or the name itself for an unnamed bot
+        """
+        return os.path.join(self.name, file_name)
+
+    @property
+    def catalog(self) -> Optional[Catalog]:
+        """Catalog of known titles from CATALOG_FILE, or None if not configured."""
+        if not self.config.catalog_file:
+            return None
+        return get_catalog(self.config.catalog_file)
+
+    def __getattr__(self, name: str):
+        """Resolve feature handlers such as self.get_animes_handler lazily."""
+        feature_handler_manager = self.__dict__.get('feature_handler_manager')
+        if feature_handler_manager is not None and feature_handler_manager.is_registered(name):
+            return feature_handler_manager.get_handler(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
     async def check_user_permission(self, update: Update) -> bool:
         """
         Check if user is allowed to use the bot.
@@ -68,7 +154,9 @@ class TelegramBot:
             
         if user_id not in self.config.allowed_users:
             logging.warning(f"Unauthorized access attempt by user {username} (ID: {user_id})")
-            await update.message.reply_text(UNAUTHORIZED_MESSAGE)
+            # Callback and inline queries have no message to reply to
+            if update.message:
+                await update.message.reply_text(UNAUTHORIZED_MESSAGE)
             return False
             
         logger.info("")
@@ -110,6 +198,8 @@ class TelegramBot:
         Returns:
             End of conversation
         """
+        from src.keyboard.keyboard import get_core_function_keyboard
+
         user_id = update.effective_user.id
         if user_id in self.current_edit:
             del self.current_edit[user_id]
@@ -118,83 +208,113 @@ class TelegramBot:
             "Operation cancelled.",
             reply_markup=get_core_function_keyboard()
         )
-        return ConversationHandler.END
+        return STATE_END
 
-    def run(self) -> None:
-        """Start the bot."""
-        # Register button callbacks directly in the constructor
-        self.button_callback_manager.register_callback(self.get_animes_handler.handle_anime_edit_button_callback, 'anime_edit')
-        self.button_callback_manager.register_callback(self.get_animes_handler.handle_episode_button_callback, 'episode_edit')
-        self.button_callback_manager.register_callback(self.get_animes_handler.handle_rating_button_callback, 'rating')
-        self.button_callback_manager.register_callback(self.get_animes_handler.handle_status_button_callback, 'status')
-        self.button_callback_manager.register_callback(self.get_animes_handler.show_anime_details, 'anime_detail')
+    async def flush_sessions(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job writing changed sessions and recently seen updates."""
+        self.session_store.flush()
+        self.seen_updates.flush()
+
+    async def sweep_sessions(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job timing out edits and conversations abandoned for SESSION_TTL."""
+        evicted = self.state_machine_manager.sweep()
+        if evicted:
+            logger.info(f"Timed out {evicted} abandoned conversations")
+            logger.info(f"State transitions: {self.state_machine_manager.get_transition_counts()}")
+
+    async def drop_duplicate(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Stop handling an update that was already handled, e.g. one redelivered after a restart."""
+        from telegram.ext import ApplicationHandlerStop
+
+        query_id = update.callback_query.id if update.callback_query else None
+        if self.seen_updates.check(f"u{update.update_id}", query_id and f"q{query_id}"):
+            logger.info(f"Dropped duplicate update {update.update_id} "
+                        f"({self.seen_updates.duplicates} duplicates so far)")
+            raise ApplicationHandlerStop
+
+    async def count_update(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Count an update received by this bot."""
+        self.update_count += 1
+
+    async def shutdown(self, application) -> None:
+        """Write pending sessions when the application stops."""
+        self.session_store.flush()
+        self.seen_updates.flush()
+        # Keep the times watching titles were last changed
+        if self.digest_manager.subscribers:
+            self.digest_manager.save()
+        logger.info(f"Bot {self.name or 'default'}: {self.update_count} updates, "
+                    f"{self.seen_updates.duplicates} duplicates dropped, "
+                    f"state transitions: {self.state_machine_manager.get_transition_counts()}")
+
+    def build_application(self) -> Application:
+        """
+        Create the application of this bot with its handlers and jobs.
+
+        Returns:
+            Application, not yet initialized
+        """
+        from telegram import Update
+        from telegram.ext import (
+            Application,
+            InlineQueryHandler,
+            TypeHandler,
+        )
+
+        # Register button callbacks; feature handlers are imported on first use
+        for pattern, handler_name, method in FEATURE_BUTTON_CALLBACKS:
+            self.button_callback_manager.register_callback(
+                self.feature_handler_manager.get_callback(handler_name, method), pattern
+            )
         ## uncomment for debug
         # self.button_callback_manager.register_callback(self.error_button_callback, None)
-        
-        application = Application.builder().token(self.config.bot_token).build()
-        
-        # Add command handlers
-        application.add_handler(CommandHandler("start", self.start_handler.start_command))
-        application.add_handler(CommandHandler("s", self.start_handler.start_command))
-        application.add_handler(CommandHandler("help", self.help_handler.help_command))
-        application.add_handler(CommandHandler("h", self.help_handler.help_command))
-        application.add_handler(CommandHandler("get_animes", self.get_animes_handler.get_animes_command))
-        
-        # Add conversation handlers for adding anime and editing
-        add_anime_handler = ConversationHandler(
-            entry_points=[
-                MessageHandler(filters.Regex("^📺 Add Anime$"), self.add_anime_handler.add_anime_command),
-                CommandHandler("add_anime", self.add_anime_handler.add_anime_command)
-            ],
-            states={
-                STATE_ANIME_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.add_anime_handler.add_anime_name)]
-            },
-            fallbacks=[CommandHandler("cancel", self.cancel)]
-        )
-        application.add_handler(add_anime_handler)
-
-        # Add conversation handler for editing anime descriptions
-        logger.info("Adding anime edit handler")
-        anime_edit_handler = ConversationHandler(
-            entry_points=[CallbackQueryHandler(self.button_callback_manager.get_callback_query_handler('anime_edit'), pattern='^anime_edit,')],
-            states={
-                STATE_EDIT_DESCRIPTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.get_animes_handler.handle_description_edit)],
-            },
-            fallbacks=[
-                CommandHandler("cancel", self.cancel),
-                CallbackQueryHandler(self.button_callback_manager.get_callback_query_handler('anime_detail'), pattern='^anime_detail,')
-            ]
-        )
-        application.add_handler(anime_edit_handler)
-
-        logger.info("Adding episode edit handler")
-        # Add conversation handler for editing episodes
-        episode_edit_handler = ConversationHandler(
-            entry_points=[CallbackQueryHandler(self.button_callback_manager.get_callback_query_handler('episode_edit'), pattern='^episode_edit,')],
-            states={
-                STATE_EDIT_EPISODE: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.get_animes_handler.edit_episode)],
-            },
-            fallbacks=[
-                CommandHandler("cancel", self.cancel),
-                CallbackQueryHandler(self.button_callback_manager.get_callback_query_handler('anime_detail'), pattern='^anime_detail,')
-            ]
-        )
-        application.add_handler(episode_edit_handler)
-        
-        ### fuck
-        ### must add the callback handler after the conversation handler
-        ### otherwise, the conversation handler will not be triggered.....
-        
-        # Add CallbackQueryHandlers for patterns through the ButtonCallbackManager
-        for app_callback_query_handlers in self.button_callback_manager.get_callback_query_handlers():
-            application.add_handler(app_callback_query_handlers)
-
-        # Add handler for "My Anime List" button
-        application.add_handler(MessageHandler(
-            filters.Regex("^📚 My Anime List$"),
-            self.get_animes_handler.get_animes_command
+
+        # Commands, menu texts and conversation inputs are routed by the state machine
+        for command, handler_name, method in FEATURE_COMMANDS:
+            self.state_machine_manager.register_command(
+                command, self.feature_handler_manager.get_callback(handler_name, method)
+            )
+        self.state_machine_manager.register_command('cancel', self.cancel)
+        for text, handler_name, method in FEATURE_TEXTS:
+            self.state_machine_manager.register_text(
+                text, self.feature_handler_manager.get_callback(handler_name, method)
+            )
+        for state, input_type, handler_name, method in FEATURE_STATE_INPUTS:
+            self.state_machine_manager.register_state_input(
+                state, input_type, self.feature_handler_manager.get_callback(handler_name, method)
+            )
+
+        builder = Application.builder().token(self.token)
+        if self.config.bot_api_base_url:
+            builder = builder.base_url(self.config.bot_api_base_url)
+        application = builder.build()
+
+        # Drop updates handled before, then count every update before it is handled
+        application.add_handler(TypeHandler(Update, self.drop_duplicate), group=-2)
+        application.add_handler(TypeHandler(Update, self.count_update), group=-1)
+        # Add handler for inline queries (@bot <prefix>)
+        application.add_handler(InlineQueryHandler(
+            self.feature_handler_manager.get_callback('inline_query_handler', 'inline_query')
         ))
+        # Every other update goes to the state machine
+        application.add_handler(TypeHandler(Update, self.state_machine_manager.dispatch))
+
+        # Write sessions in batches and time out abandoned ones
+        if application.job_queue is not None:
+            application.job_queue.run_repeating(self.flush_sessions, SESSION_FLUSH_INTERVAL)
+            application.job_queue.run_repeating(self.sweep_sessions, SESSION_SWEEP_INTERVAL)
+            if self.owns_anime_manager and self.config.snapshot_interval > 0:
+                application.job_queue.run_repeating(
+                    self.snapshot_manager.snapshot_job, self.config.snapshot_interval, first=SNAPSHOT_FIRST_DELAY
+                )
+            if self.config.digest_interval > 0:
+                self.digest_manager.start(application.job_queue)
+
+        self.application = application
+        return application
+
+    def run(self) -> None:
+        """Start the bot and block until it is stopped."""
+        from src.bot.bot_runner import BotRunner
 
-        # Start the bot
-        logger.info("Bot started successfully")
-        application.run_polling()
\ No newline at end of file
+        BotRunner(self.config, [self]).run()
@@ -1,23 +1,129 @@
 """Configuration management for the application."""
 
+import copy
 import os
 import logging
-from typing import List
-from dotenv import load_dotenv
+from typing import Dict, List, Tuple
+from dotenv import dotenv_values, find_dotenv
+
+from src.model.serializer import file_signature
 
 logger = logging.getLogger()
 
+# Settings only read at startup; changing them in .env needs a restart
+RESTART_SETTINGS = (
+    'bot_token', 'bot_api_base_url', 'columnar_store', 'config_format', 'lazy_store',
+    'health_port', 'snapshot_interval', 'digest_interval', 'bot_tokens', 'shared_storage',
+    'workers',
+)
+
 class Config:
     """Configuration class for managing environment variables and settings."""
     
     def __init__(self):
         """Initialize configuration by loading environment variables."""
-        load_dotenv()
-        
+        # Variables set before .env is read take precedence over it
+        self._process_env = set(os.environ)
+        self._env_file = find_dotenv() or os.path.abspath('.env')
+        self._env_signature = file_signature(self._env_file)
+        self._dotenv = self._read_dotenv()
+        self._load_settings()
+        self._apply_dotenv({})
+
+    def _read_dotenv(self) -> Dict[str, str]:
+        """Read the variables of .env that the process environment does not set."""
+        values = dotenv_values(self._env_file) if self._env_signature else {}
+        return {
+            key: value for key, value in values.items()
+            if key not in self._process_env and value is not None
+        }
+
+    def _apply_dotenv(self, previous: Dict[str, str]) -> None:
+        """
+        Copy .env into the environment, dropping variables removed from it.
+
+        Args:
+            previous: Variables of .env as it was read before
+        """
+        for key in set(previous) - set(self._dotenv):
+            os.environ.pop(key, None)
+        for key, value in self._dotenv.items():
+            os.environ[key] = value
+
+    def reload(self) -> List[str]:
+        """
+        Read .env again if it changed since it was last read.
+
+        Every setting is parsed into a new Config first; only if all of them
+        parse are they swapped into this one, so everything holding this
+        Config sees either the old or the new settings, never a mix.
+
+        Returns:
+            Names of the settings whose value changed
+        """
+        signature = file_signature(self._env_file)
+        if signature == self._env_signature:
+            return []
+        fresh = copy.copy(self)
+        fresh._env_signature = signature
+        try:
+            fresh._dotenv = fresh._read_dotenv()
+            fresh._load_settings()
+        except ValueError:
+            # Not tried again until .env changes
+            self._env_signature = signature
+            logger.warning(f"Failed to reload {self._env_file}, keeping the current settings", exc_info=True)
+            return []
+        before = self._settings()
+        previous = self._dotenv
+        vars(self).update(vars(fresh))
+        self._apply_dotenv(previous)
+        after = self._settings()
+        changed = [name for name, value in after.items() if before.get(name) != value]
+        logger.info(f"Reloaded {self._env_file}, changed settings: {changed}")
+        return changed
+
+    def _settings(self) -> dict:
+        """Get the current value of every setting."""
+        return {name: value for name, value in vars(self).items() if not name.startswith('_')}
+
+    def _load_settings(self) -> None:
+        """Read every setting from the environment."""
         # Bot configuration
         self.bot_token = self._get_env('BOT_TOKEN')
+        self.bot_tokens = self._parse_bot_tokens()
+        self.shared_storage = self._get_env('BOT_STORAGE', 'separate').lower() == 'shared'
+        self.bot_api_base_url = self._get_env('BOT_API_BASE_URL')
         self.enable_restriction = self._get_env('ENABLE_USER_RESTRICTION', 'false').lower() == 'true'
         self.allowed_users = self._parse_allowed_users()
+
+        # Storage configuration
+        self.columnar_store = self._get_env('ANIME_STORE_COLUMNAR', 'false').lower() == 'true'
+        self.config_format = self._get_env('ANIME_CONFIG_FORMAT', 'json').lower()
+        self.lazy_store = self._get_env('ANIME_STORE_LAZY', 'false').lower() == 'true'
+
+        # Catalog configuration
+        self.catalog_file = self._get_env('CATALOG_FILE', '')
+
+        # Navigation configuration
+        self.panel_navigation = self._get_env('PANEL_NAVIGATION', 'true').lower() == 'true'
+
+        # Snapshot configuration
+        self.snapshot_interval = int(self._get_env('SNAPSHOT_INTERVAL', '3600'))
+        self.snapshot_dir = self._get_env('SNAPSHOT_DIR', 'snapshots')
+        self.snapshot_keep = int(self._get_env('SNAPSHOT_KEEP', '24'))
+        self.snapshot_keep_daily = int(self._get_env('SNAPSHOT_KEEP_DAILY', '7'))
+
+        # Digest configuration
+        self.digest_interval = int(self._get_env('DIGEST_INTERVAL', str(24 * 60 * 60)))
+        self.digest_stale_days = int(self._get_env('DIGEST_STALE_DAYS', '14'))
+
+        # Monitoring configuration
+        health_port = self._get_env('HEALTH_PORT', '')
+        self.health_port = int(health_port) if health_port.strip().isdigit() else None
+
+        # Process configuration
+        self.workers = int(self._get_env('WORKERS', '0'))
     
     def _get_env(self, key: str, default: str = None) -> str:
         """
@@ -28,10 +134,34 @@ class Config:
             default: Default value if key doesn't exist
             
         Returns:
-            Value of environment variable or default
+            Value from the process environment, else from .env, else default
         """
-        return os.getenv(key, default)
+        if key in self._process_env:
+            return os.getenv(key, default)
+        return self._dotenv.get(key, default)
     
+    def _parse_bot_tokens(self) -> List[Tuple[str, str]]:
+        """
+        Parse the bots to run from BOT_TOKENS, falling back to BOT_TOKEN.
+
+        BOT_TOKENS is a comma separated list of name=token; a token without
+        a name is named after its bot ID.
+
+        Returns:
+            List of (name, token); the name is empty for BOT_TOKEN alone
+        """
+        bot_tokens_str = self._get_env('BOT_TOKENS', '')
+        if not bot_tokens_str.strip():
+            return [('', self.bot_token)] if self.bot_token else []
+        bot_tokens = []
+        for entry in bot_tokens_str.split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            name, _, token = entry.rpartition('=')
+            bot_tokens.append((name.strip() or token.split(':')[0], token.strip()))
+        return bot_tokens
+
     def _parse_allowed_users(self) -> List[int]:
         """
         Parse allowed users from environment variable.
@@ -4,6 +4,62 @@
 STATE_ANIME_NAME = "STATE_ANIME_NAME"
 STATE_EDIT_DESCRIPTION = "STATE_EDIT_DESCRIPTION"
 STATE_EDIT_EPISODE = "STATE_EDIT_EPISODE"
+STATE_IMPORT_DOCUMENT = "STATE_IMPORT_DOCUMENT"
+STATE_END = -1  # same value as ConversationHandler.END
+STATE_IDLE = "idle"  # not in a conversation, for transition counters
+STATE_TIMEOUT = "timeout"  # conversation expired, for transition counters
+
+# Input types handled per conversation state
+INPUT_TEXT = "text"
+INPUT_DOCUMENT = "document"
+
+# Sessions (pending edits and conversation states)
+ANIME_CONFIG_FILE = "anime_config.json"
+LEGACY_POSITIONS_FILE = "legacy_positions.json"  # list order when indexes stopped being positions
+SESSION_FILE = "session_state.json"
+SESSION_TTL = 30 * 60  # seconds before an abandoned edit or conversation times out
+SESSION_FLUSH_INTERVAL = 5  # seconds between writes of changed sessions
+SESSION_SWEEP_INTERVAL = 60  # seconds between evictions of expired sessions
+PANEL_MAX_AGE = 48 * 60 * 60  # seconds after which a panel is replaced by a new message
+SESSION_SEARCH = "search"  # session value holding the user's last search text
+SESSION_CATALOG_SUGGESTIONS = "catalog_suggestions"  # session value holding the typed name and the titles offered for it
+SEEN_UPDATES_FILE = "seen_updates.json"
+SEEN_UPDATES_WINDOW = 30 * 60  # seconds an update is remembered to drop a redelivery of it
+SEEN_UPDATES_LIMIT = 2000  # most update and callback query IDs remembered
+RELOAD_INTERVAL = 2  # seconds between checks for edits to .env and the anime config
+CHANGE_EVENT_INTERVAL = 1  # seconds between deliveries of queued anime changes to the indexes
+SNAPSHOT_FIRST_DELAY = 10  # seconds after startup before the first snapshot
+
+# Watching digests
+DIGEST_STATE_FILE = "digest_state.json"
+DIGEST_FIRST_DELAY = 60  # seconds after startup before a digest run can start or resume
+DIGEST_BATCH_SIZE = 20  # digests sent per batch, below Telegram's 30 messages per second
+DIGEST_WINDOW = 15 * 60  # seconds a digest run is spread over
+DIGEST_LIST_LIMIT = 50  # titles listed per section of a digest
+DIGEST_MAX_LENGTH = 4096  # Telegram message length limit
+
+# Event loop watchdog
+LOOP_LAG_INTERVAL = 0.1  # seconds between heartbeats of the event loop
+LOOP_LAG_THRESHOLD = 0.25  # seconds of lag logged with the stack of the loop thread
+LOOP_STALL_LIMIT = 10  # seconds the loop may be blocked before /healthz fails
+
+# Shutdown and warm start
+SHUTDOWN_DRAIN_TIMEOUT = 20  # seconds to finish updates already received when stopping
+WARM_START_FILE = "warm_start.pickle"  # indexes of the anime config kept across restarts
+WARM_START_FORMAT = 3  # increase when an index class changes its attributes
+
+# Worker processes
+WORKER_DIR = "workers"  # directory holding the sessions and digests of each worker
+WORKER_CHECK_INTERVAL = 1  # seconds between checks for exited workers
+WORKER_STOP_TIMEOUT = 30  # seconds a worker may take to finish its updates on shutdown
+WORKER_READ_TIMEOUT = 0.5  # seconds a worker waits for an update before checking whether it stops
+WORKER_WRITE_LOCK_TIMEOUT = 5  # seconds a worker waits for another one to write the anime config
+
+# Title catalog
+CATALOG_INDEX_SUFFIX = ".idx"  # index file written next to the catalog dump
+CATALOG_CHECK_INTERVAL = 10  # seconds between checks whether the dump changed
+CATALOG_BUILD_TIMEOUT = 10 * 60  # seconds an index build may take
+CATALOG_SUGGESTIONS = 5  # catalog titles offered when an added name is not one
 
 # Default values
 DEFAULT_RATING = 0.0
@@ -11,12 +67,50 @@ DEFAULT_STATUS = "Not Started"
 DEFAULT_EPISODES = 0
 DEFAULT_DESCRIPTION = ""
 
+# Bulk add
+BULK_ADD_SUMMARY_LIMIT = 30  # names listed per section of the summary reply
+
+# Import and export
+EXPORT_CHUNK_ROWS = 1000  # rows written between yields to the event loop
+IMPORT_BATCH_SIZE = 1000  # animes added per write of the config file
+IMPORT_PROGRESS_INTERVAL = 3  # seconds between progress message edits
+
+# Search
+SEARCH_PAGE_SIZE = 10
+SEARCH_CACHE_SIZE = 256  # (query, version) rankings kept for paging through results
+
+# List views
+LIST_PAGE_SIZE = 20
+LIST_FILTER_ALL = "all"
+LIST_SORT_ADDED = "added"
+LIST_SORT_RATING = "rating"
+LIST_SORT_EPISODES = "episodes"
+LIST_SORT_NAME = "name"
+
+# Button list view options
+BUTTON_FILTER_ALL = "📚 All"
+BUTTON_SORT_ADDED = "🔢 List Order"
+BUTTON_SORT_RATING = "⭐ Rating"
+BUTTON_SORT_EPISODES = "🎬 Episodes"
+BUTTON_SORT_NAME = "🔤 Name"
+
+# Stats
+STATS_TOP_TITLES = 5
+
+# Inline queries
+INLINE_RESULTS_PER_PAGE = 50  # Telegram allows at most 50 results per answer
+INLINE_RESULTS_LIMIT = 200
+INLINE_CACHE_TIME = 10  # seconds Telegram may reuse an answer
+INLINE_CACHE_SIZE = 1024  # (user, query, version) entries kept by the bot
+
 # Status options
 STATUS_WATCHING = "watching"
 STATUS_COMPLETED = "completed"
 STATUS_ON_HOLD = "on_hold"
 STATUS_DROPPED = "dropped"
 STATUS_PLANNED = "plan_to_watch"
+KNOWN_STATUSES = (DEFAULT_STATUS, STATUS_WATCHING, STATUS_COMPLETED, STATUS_ON_HOLD, STATUS_DROPPED, STATUS_PLANNED)
+MAX_RATING = 5  # stars of the rating keyboard
 
 # Button Status options
 BUTTON_STATUS_WATCHING = "📺 Watching"
@@ -40,6 +134,16 @@ You can use these commands anytime by clicking the buttons below or typing:
 
 /get_animes - View your anime collection
 
+/search <text> - Find an anime by name or description
+
+/stats - Show statistics of your collection
+
+/export [json|csv] - Download your collection as a document
+
+/import - Add animes from a JSON or CSV document
+
+/digest [on|off] - Preview or toggle the periodic digest of titles you are watching
+
 /help or /h - Show this help message
 
 Choose an option to get started!
@@ -57,6 +161,16 @@ Available Commands:
 
 /get_animes - View your anime collection
 
+/search <text> - Find an anime by name or description
+
+/stats - Show statistics of your collection
+
+/export [json|csv] - Download your collection as a document
+
+/import - Add animes from a JSON or CSV document
+
+/digest [on|off] - Preview or toggle the periodic digest of titles you are watching
+
 Features:
 📺 Add Anime: Add new anime to your collection
 📚 My Anime List: View and manage your anime
@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from telegram import (
+    Message,
     Update,
+    User,
 )
 from telegram.ext import (
     ContextTypes,
@@ -10,9 +12,14 @@ from telegram.ext import (
 
 from src.constant.constant import (
     STATE_ANIME_NAME,
+    BULK_ADD_SUMMARY_LIMIT,
+    CATALOG_SUGGESTIONS,
+    SESSION_CATALOG_SUGGESTIONS,
 )
 from src.keyboard.keyboard import (
     get_core_function_keyboard,
+    get_view_detail_keyboard,
+    get_catalog_suggestions_keyboard,
 )
 
 import logging
@@ -42,7 +49,8 @@ class AddAnimeFeatureHandler:
         logger.info(f"User {user.username} (ID: {user.id}): add anime command")
         
         await update.message.reply_text(
-            "Please enter the name of the anime you want to add:",
+            "Please enter the name of the anime you want to add "
+            "(one per line to add several at once):",
             reply_markup=None
         )
         logger.info(f"Bot: waiting User {user.username} (ID: {user.id}) to input anime name")
@@ -63,11 +71,48 @@ class AddAnimeFeatureHandler:
             return ConversationHandler.END
             
         user = update.effective_user
-        anime_name = update.message.text
+        anime_names = [line.strip() for line in update.message.text.splitlines() if line.strip()]
+        if len(anime_names) > 1:
+            return await self.add_anime_names(update, anime_names)
+
+        anime_name = update.message.text.strip()
+        catalog = self.bot.catalog
+        if catalog is not None and self.bot.anime_manager.find_anime_name(anime_name) is None:
+            entry = catalog.lookup(anime_name)
+            if entry is not None:
+                # Use the catalog's spelling, so its episode count is found later
+                anime_name = entry[0]
+            else:
+                suggestions = catalog.search(anime_name, CATALOG_SUGGESTIONS)
+                if suggestions:
+                    return await self.suggest_catalog_titles(update, anime_name, suggestions)
+
+        await self.add_single_anime(update.message, user, anime_name)
+        return ConversationHandler.END
+
+    async def add_single_anime(self, message: Message, user: User, anime_name: str) -> None:
+        """
+        Add one anime unless it is already in the list, and confirm.
+        
+        Args:
+            message: Message to reply to
+            user: User adding the anime
+            anime_name: Name of the anime
+        """
+        existing_name = self.bot.anime_manager.find_anime_name(anime_name)
+        if existing_name is not None:
+            logger.info(f"User {user.username} (ID: {user.id}): tried to add existing anime: {anime_name}")
+            await message.reply_text(
+                f"{existing_name} is already in your list.",
+                reply_markup=get_view_detail_keyboard(self.bot.anime_manager.get_anime_index(existing_name))
+            )
+            logger.info(f"Bot: informed User {user.username} (ID: {user.id}) that '{existing_name}' already exists")
+            return
+
         self.bot.anime_manager.add_anime(anime_name)
         logger.info(f"User {user.username} (ID: {user.id}): added anime: {anime_name}")
         
-        await update.message.reply_text(
+        await message.reply_text(
             f"Added {anime_name} to your list! 🎉\n"
             f"\n"
             f"Use /add_anime to add more anime\n"
@@ -76,4 +121,91 @@ class AddAnimeFeatureHandler:
             reply_markup=get_core_function_keyboard()
         )
         logger.info(f"Bot: confirmed adding '{anime_name}' to User {user.username} (ID: {user.id})")
+
+    async def suggest_catalog_titles(self, update: Update, anime_name: str, suggestions: List[Tuple[str, int]]) -> int:
+        """
+        Offer catalog titles matching a typed name that is not one itself.
+        
+        Args:
+            update: Telegram update object
+            anime_name: Name as typed
+            suggestions: Matching (title, episodes) pairs from the catalog
+            
+        Returns:
+            End of conversation; the choice arrives as a button callback
+        """
+        user = update.effective_user
+        # Kept apart from current_edit, so /cancel and the sweep of edits
+        # do not take the suggestions for an edit
+        self.bot.session_store.set_value(user.id, SESSION_CATALOG_SUGGESTIONS, {
+            'anime_name': anime_name,
+            'suggestions': [title for title, _ in suggestions],
+        })
+        await update.message.reply_text(
+            "Did you mean one of these?",
+            reply_markup=get_catalog_suggestions_keyboard(suggestions)
+        )
+        logger.info(f"Bot: suggested {len(suggestions)} catalog titles for '{anime_name}' to User {user.username} (ID: {user.id})")
+        return ConversationHandler.END
+
+    async def handle_catalog_add_button_callback(self, query: Update.callback_query) -> None:
+        """
+        Add the catalog title, or the typed name, chosen from the suggestions.
+        
+        Args:
+            query: Callback query
+        """
+        user = query.from_user
+        choice = query.data.split(',')[-1]
+        offered = self.bot.session_store.get_value(user.id, SESSION_CATALOG_SUGGESTIONS) or {}
+        suggestions = offered.get('suggestions')
+        if suggestions is None:
+            await query.edit_message_text("These suggestions expired. Use /add_anime to add an anime.")
+            return
+        if choice == 'typed':
+            anime_name = offered['anime_name']
+        elif choice.isdigit() and int(choice) < len(suggestions):
+            anime_name = suggestions[int(choice)]
+        else:
+            logger.info(f"Bot: unknown catalog choice {query.data} from User {user.username} (ID: {user.id})")
+            return
+        self.bot.session_store.set_value(user.id, SESSION_CATALOG_SUGGESTIONS, None)
+        await query.edit_message_text(f"Chosen: {anime_name}")
+        await self.add_single_anime(query.message, user, anime_name)
+
+    async def add_anime_names(self, update: Update, anime_names: List[str]) -> int:
+        """
+        Add several animes from one message with a single write and reply.
+        
+        Args:
+            update: Telegram update object
+            anime_names: Names to add, one per input line
+            
+        Returns:
+            End of conversation
+        """
+        user = update.effective_user
+        added, skipped = self.bot.anime_manager.add_animes(anime_names)
+        logger.info(f"User {user.username} (ID: {user.id}): bulk added {len(added)} animes, skipped {len(skipped)}")
+
+        lines = []
+        if added:
+            lines.append(f"Added {len(added)} animes to your list! 🎉")
+            lines.extend(f"• {name}" for name in added[:BULK_ADD_SUMMARY_LIMIT])
+            if len(added) > BULK_ADD_SUMMARY_LIMIT:
+                lines.append(f"… and {len(added) - BULK_ADD_SUMMARY_LIMIT} more")
+        if skipped:
+            if lines:
+                lines.append("")
+            lines.append(f"Skipped {len(skipped)} already in your list:")
+            lines.extend(f"• {name}" for name in skipped[:BULK_ADD_SUMMARY_LIMIT])
+            if len(skipped) > BULK_ADD_SUMMARY_LIMIT:
+                lines.append(f"… and {len(skipped) - BULK_ADD_SUMMARY_LIMIT} more")
+        lines.extend(["", "Use /get_animes to view your list"])
+
+        await update.message.reply_text(
+            "\n".join(lines),
+            reply_markup=get_core_function_keyboard()
+        )
+        logger.info(f"Bot: confirmed bulk add to User {user.username} (ID: {user.id})")
         return ConversationHandler.END
@@ -0,0 +1,49 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from src.keyboard.keyboard import get_core_function_keyboard
+
+import logging
+logger = logging.getLogger("tg_bot")
+
+class DigestFeatureHandler:
+    """Handler for /digest command."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def digest_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Handler for previewing and turning the watching digest on or off.
+
+        Args:
+            update: Telegram update object
+            context: Callback context
+        """
+        if not await self.bot.check_user_permission(update):
+            return
+
+        user = update.effective_user
+        action = context.args[0].lower() if context.args else ''
+        logger.info(f"User {user.username} (ID: {user.id}): digest command, action: {action or 'preview'}")
+        digest_manager = self.bot.digest_manager
+
+        if action == 'on':
+            digest_manager.subscribe(user.id, update.effective_chat.id)
+            text = "🔔 You will get a digest of the titles you are watching."
+        elif action == 'off':
+            if digest_manager.unsubscribe(user.id):
+                text = "🔕 Digests turned off."
+            else:
+                text = "Digests are already off."
+        elif action:
+            text = "Usage: /digest [on|off]"
+        else:
+            if user.id in digest_manager.subscribers:
+                status = "Digests are on, turn them off with /digest off."
+            else:
+                status = "Digests are off, turn them on with /digest on."
+            text = digest_manager.build_digest(status) or f"📺 Nothing is being watched right now.\n\n{status}"
+
+        await update.message.reply_text(text, reply_markup=get_core_function_keyboard())
+        logger.info(f"Bot: answered digest command of User {user.username} (ID: {user.id})")
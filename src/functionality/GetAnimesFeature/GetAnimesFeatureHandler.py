@@ -1,3 +1,5 @@
+from typing import Optional
+
 from telegram import (
     Update,
     User
@@ -10,7 +12,11 @@ from telegram.ext import (
 from src.constant.constant import (
     STATE_EDIT_DESCRIPTION,
     STATE_EDIT_EPISODE,
+    LIST_PAGE_SIZE,
+    LIST_FILTER_ALL,
+    LIST_SORT_ADDED,
 )
+from src.model.anime import AnimeDetails
 from src.keyboard.keyboard import (
     get_core_function_keyboard,
     get_anime_details_keyboard,
@@ -18,7 +24,8 @@ from src.keyboard.keyboard import (
     get_status_keyboard,
     get_episode_editor_keyboard,
     get_anime_list_keyboard,
-    get_view_detail_keyboard
+    get_view_detail_keyboard,
+    get_delete_confirm_keyboard,
 )
 
 import logging
@@ -44,8 +51,7 @@ class GetAnimesFeatureHandler:
         user = update.effective_user
         logger.info(f"User {user.username} (ID: {user.id}): get animes command")
         
-        animes = self.bot.anime_manager.get_all_animes()
-        if not animes:
+        if not self.bot.anime_manager.get_anime_count():
             await update.message.reply_text(
                 "No animes found in the database.",
                 reply_markup=get_core_function_keyboard()
@@ -53,36 +59,85 @@ class GetAnimesFeatureHandler:
             logger.info(f"Bot: informed User {user.username} (ID: {user.id}) that no animes were found")
             return
 
-        logger.info(f"Bot: showing anime list ({len(animes)} items) to User {user.username} (ID: {user.id})")
-        await update.message.reply_text(
-            "Here are your animes:",
-            reply_markup=get_anime_list_keyboard(animes)
-        )
+        text, reply_markup = self.get_anime_list_page(LIST_FILTER_ALL, LIST_SORT_ADDED, 0, user)
+        message = await update.message.reply_text(text, reply_markup=reply_markup)
+        self.bot.panel_manager.remember(user.id, message)
 
-    async def get_animes(self, update: Update, user: User) -> None:
+    async def handle_anime_list_button_callback(self, query: Update.callback_query) -> None:
         """
-        Handler for retrieving animes.
+        Show another filter, sort or page of the anime list in place.
         
         Args:
-            update: Telegram update object
+            query: Callback query
+        """
+        _, status, sort, page = query.data.split(',')
+        text, reply_markup = self.get_anime_list_page(status, sort, int(page), query.from_user)
+        await query.edit_message_text(text, reply_markup=reply_markup)
+
+    def get_anime_list_page(self, status: str, sort: str, page: int, user: User) -> tuple:
+        """
+        Build the message for one page of a filtered and sorted anime list.
+        
+        Args:
+            status: Status to filter by, or LIST_FILTER_ALL
+            sort: One of the LIST_SORT_* keys
+            page: Page to show, starting at 0
             user: User
+            
+        Returns:
+            Message text and reply markup
         """
-        logger.info(f"User {user.username} (ID: {user.id}): get animes command")
+        indexes, total = self.bot.anime_manager.get_list_view(status, sort, page, LIST_PAGE_SIZE)
+        total_pages = max(1, (total + LIST_PAGE_SIZE - 1) // LIST_PAGE_SIZE)
+        if page >= total_pages:
+            page = total_pages - 1
+            indexes, total = self.bot.anime_manager.get_list_view(status, sort, page, LIST_PAGE_SIZE)
+        results = [(index, self.bot.anime_manager.get_anime_by_index(index)) for index in indexes]
+
+        logger.info(f"Bot: showing anime list ({status}, {sort}, page {page + 1}/{total_pages}, {total} items) to User {user.username} (ID: {user.id})")
+        text = "Here are your animes:" if total else "No animes match this filter."
+        return text, get_anime_list_keyboard(results, status, sort, page, total_pages)
+
+    @staticmethod
+    def get_anime_details_text(anime: AnimeDetails, total_episodes: Optional[int] = None) -> str:
+        """
+        Create the details text for an anime.
         
-        animes = self.bot.anime_manager.get_all_animes()
-        if not animes:
-            await update.message.reply_text(
-                "No animes found in the database.",
-                reply_markup=get_core_function_keyboard()
-            )
-            logger.info(f"Bot: informed User {user.username} (ID: {user.id}) that no animes were found")
-            return
+        Args:
+            anime: Anime to describe
+            total_episodes: Episodes the anime has, if known
+            
+        Returns:
+            Details text
+        """
+        return (
+            f"📺 Anime: {anime.name}\n"
+            f"📝 Description: {anime.description or 'Not set'}\n"
+            f"⭐ Rating: {'⭐' * int(anime.rating) if anime.rating else 'Not rated'}\n"
+            f"📊 Status: {anime.status}\n"
+            f"🎬 Episodes: {anime.episodes}{f'/{total_episodes}' if total_episodes else ''}"
+        )
 
-        logger.info(f"Bot: showing anime list ({len(animes)} items) to User {user.username} (ID: {user.id})")
-        await update.message.reply_text(
-            "Here are your animes:",
-            reply_markup=get_anime_list_keyboard(animes)
+    def get_anime_details_screen(self, anime: AnimeDetails) -> tuple:
+        """
+        Build the details message of an anime, with its position in the list.
+        
+        Args:
+            anime: Anime to describe
+            
+        Returns:
+            Message text and reply markup
+        """
+        # Buttons from older messages may carry a list position
+        index = self.bot.anime_manager.get_anime_index(anime.name)
+        position = self.bot.anime_manager.get_anime_position(anime.name)
+        catalog = self.bot.catalog
+        total_episodes = catalog.get_total_episodes(anime.name) if catalog is not None else None
+        text = (
+            f"{self.get_anime_details_text(anime, total_episodes)}\n"
+            f"🔢 Position: {position + 1}/{self.bot.anime_manager.get_anime_count()}"
         )
+        return text, get_anime_details_keyboard(index)
 
     async def show_anime_details(self, query: Update.callback_query) -> None:
         """
@@ -99,18 +154,8 @@ class GetAnimesFeatureHandler:
             logger.info(f"Bot: anime {index} not found to User {query.from_user.username} (ID: {query.from_user.id})") 
             return
             
-        details_text = (
-            f"📺 Anime: {anime.name}\n"
-            f"📝 Description: {anime.description or 'Not set'}\n"
-            f"⭐ Rating: {'⭐' * int(anime.rating) if anime.rating else 'Not rated'}\n"
-            f"📊 Status: {anime.status}\n"
-            f"🎬 Episodes: {anime.episodes}"
-        )
-        
-        await query.edit_message_text(
-            details_text,
-            reply_markup=get_anime_details_keyboard(index)
-        )
+        text, reply_markup = self.get_anime_details_screen(anime)
+        await query.edit_message_text(text, reply_markup=reply_markup)
         logger.info(f"Bot: showing details of '{anime.name}' to User {query.from_user.username} (ID: {query.from_user.id})")
 
     async def show_episode_editor(self, query: Update.callback_query, index: int) -> None:
@@ -218,11 +263,7 @@ class GetAnimesFeatureHandler:
         self.bot.anime_manager.update_anime(anime_name, description=new_description)
         logger.info(f"User {user.username} (ID: {user.id}): updated description for {anime_name}")
         
-        # Show success message with inline keyboard to view details
-        await update.message.reply_text(
-            f"Description updated for {anime_name}! 📝",
-            reply_markup=get_view_detail_keyboard(index)
-        )
+        await self.show_updated_details(update, context, anime_name, index, f"Description updated for {anime_name}! 📝")
         logger.info(f"Bot: confirmed description update for '{anime_name}' to User {user.username} (ID: {user.id})")
         return ConversationHandler.END
 
@@ -252,24 +293,41 @@ class GetAnimesFeatureHandler:
             self.bot.anime_manager.update_anime(anime_name, episodes=new_episodes)
             logger.info(f"User {user.username} (ID: {user.id}): set episodes for {anime_name} to {new_episodes}")
             
-            # Show success message with inline keyboard to view details
-            await update.message.reply_text(
-                f"Episodes updated for {anime_name}! 🎬",
-                reply_markup=get_view_detail_keyboard(index)
-            )
+            await self.show_updated_details(update, context, anime_name, index, f"Episodes updated for {anime_name}! 🎬")
             
             logger.info(f"Bot: confirmed episode update for '{anime_name}' to User {user.username} (ID: {user.id})")
             return ConversationHandler.END
             
         except ValueError as e:
-            await update.message.reply_text(
-                "Please enter a valid positive number for episodes:",
-                reply_markup=None
+            await self.bot.panel_manager.show(
+                context.bot, user.id, update.effective_chat.id,
+                f"Please enter a valid positive number of episodes for {anime_name}:"
             )
             logger.info(f"Bot: informed User {user.username} (ID: {user.id}) about invalid episode number")
             logger.info(f"Bot: waiting User {user.username} (ID: {user.id}) to input valid episode number")
             return STATE_EDIT_EPISODE
 
+    async def show_updated_details(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                   anime_name: str, index: int, header: str) -> None:
+        """
+        Show the details of an anime after a typed edit, in the user's panel.
+        
+        Args:
+            update: Telegram update object
+            context: Callback context
+            anime_name: Name of the edited anime
+            index: Index of the edited anime
+            header: Line confirming the edit
+        """
+        anime = self.bot.anime_manager.get_anime_by_index(index)
+        if anime is None or anime.name != anime_name:
+            # The anime was deleted or moved meanwhile; only offer to reopen it
+            text, reply_markup = header, get_view_detail_keyboard(index)
+        else:
+            text, reply_markup = self.get_anime_details_screen(anime)
+            text = f"{header}\n\n{text}"
+        await self.bot.panel_manager.show(context.bot, update.effective_user.id, update.effective_chat.id, text, reply_markup)
+
     async def show_episode_number_editor(self, query: Update.callback_query, index: int, anime_name: str) -> None:
         """
         Show episode number editor for a specific anime.
@@ -298,16 +356,15 @@ class GetAnimesFeatureHandler:
         index = int(index)
         anime = self.bot.anime_manager.get_anime_by_index(index)
         if anime:
-            current_episodes = anime.episodes
-            
             if action == 'plus':
-                self.bot.anime_manager.update_anime(anime.name, episodes=current_episodes + 1)
-                logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): incremented episode count for {anime.name} to {current_episodes + 1}")
+                # Read and written under the write lock, after other workers' changes
+                episodes = self.bot.anime_manager.increment_episodes(anime.name, 1)
+                logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): incremented episode count for {anime.name} to {episodes}")
                 await self.show_episode_editor(query, index)
             elif action == 'minus':
-                if current_episodes > 0:
-                    self.bot.anime_manager.update_anime(anime.name, episodes=current_episodes - 1)
-                    logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): decremented episode count for {anime.name} to {current_episodes - 1}")
+                if anime.episodes > 0:
+                    episodes = self.bot.anime_manager.increment_episodes(anime.name, -1)
+                    logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): decremented episode count for {anime.name} to {episodes}")
                     await self.show_episode_editor(query, index)
             elif action == 'set':
                 logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}) initiated manual episode set for {anime.name}")
@@ -320,11 +377,13 @@ class GetAnimesFeatureHandler:
         _, edit_type, index = query.data.split(',')
         logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): initiated edit of {edit_type} for index: {index}")
         if edit_type == 'get_animes':
-            return await self.bot.get_animes_handler.get_animes(query, query.from_user)
+            text, reply_markup = self.get_anime_list_page(LIST_FILTER_ALL, LIST_SORT_ADDED, 0, query.from_user)
+            return await query.edit_message_text(text, reply_markup=reply_markup)
 
         index = int(index)
         anime = self.bot.anime_manager.get_anime_by_index(index)
         if anime:
+            index = self.bot.anime_manager.get_anime_index(anime.name)
             logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): initiated edit of {edit_type} for anime: {anime.name}")
             self.bot.current_edit[query.from_user.id] = {
                 'anime_name': anime.name,
@@ -353,8 +412,40 @@ class GetAnimesFeatureHandler:
     async def handle_rating_button_callback(self, query: Update.callback_query) -> None:
         _, value, index = query.data.split(',')
         index = int(index)
+        # Stored as a number, so it compares equal to the rating read back from the file
+        value = int(value)
         anime = self.bot.anime_manager.get_anime_by_index(index)
         if anime:
             self.bot.anime_manager.update_anime(anime.name, rating=value)
             logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): set rating to {value} for {anime.name}")
             await self.show_anime_details(query)
+
+    async def handle_move_button_callback(self, query: Update.callback_query) -> None:
+        _, direction, index = query.data.split(',')
+        index = int(index)
+        anime = self.bot.anime_manager.get_anime_by_index(index)
+        if anime:
+            moved = self.bot.anime_manager.move_anime(index, -1 if direction == 'up' else 1)
+            logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): move {direction} {anime.name}, moved: {moved}")
+            if moved:
+                await self.show_anime_details(query)
+
+    async def handle_delete_button_callback(self, query: Update.callback_query) -> None:
+        _, action, index = query.data.split(',')
+        index = int(index)
+        anime = self.bot.anime_manager.get_anime_by_index(index)
+        if not anime:
+            logger.info(f"Bot: anime {index} not found to User {query.from_user.username} (ID: {query.from_user.id})")
+            return
+
+        if action == 'ask':
+            await query.edit_message_text(
+                f"Delete {anime.name} from your list?",
+                reply_markup=get_delete_confirm_keyboard(self.bot.anime_manager.get_anime_index(anime.name))
+            )
+            logger.info(f"Bot: asking User {query.from_user.username} (ID: {query.from_user.id}) to confirm deleting {anime.name}")
+        elif action == 'confirm':
+            self.bot.anime_manager.delete_anime(index)
+            logger.info(f"User {query.from_user.username} (ID: {query.from_user.id}): deleted anime: {anime.name}")
+            text, reply_markup = self.get_anime_list_page(LIST_FILTER_ALL, LIST_SORT_ADDED, 0, query.from_user)
+            await query.edit_message_text(f"Deleted {anime.name}. 🗑️\n\n{text}", reply_markup=reply_markup)
@@ -0,0 +1,183 @@
+from typing import List
+import asyncio
+import csv
+import os
+import tempfile
+import time
+
+from telegram import (
+    Update,
+)
+from telegram.ext import (
+    ContextTypes,
+    ConversationHandler,
+)
+from telegram.error import TelegramError
+
+from src.constant.constant import (
+    STATE_IMPORT_DOCUMENT,
+    EXPORT_CHUNK_ROWS,
+    IMPORT_BATCH_SIZE,
+    IMPORT_PROGRESS_INTERVAL,
+)
+from src.keyboard.keyboard import get_core_function_keyboard
+from src.model.anime import AnimeDetails
+from src.model.transfer import (
+    EXPORT_FORMAT_JSON,
+    EXPORT_FORMAT_CSV,
+    iter_export_chunks,
+    iter_import_records,
+    parse_import_record,
+)
+
+import logging
+logger = logging.getLogger("tg_bot")
+
+class ImportExportFeatureHandler:
+    """Handler for /export and /import commands."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def export_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Handler for exporting the collection as a JSON or CSV document.
+
+        Args:
+            update: Telegram update object
+            context: Callback context
+        """
+        if not await self.bot.check_user_permission(update):
+            return
+
+        user = update.effective_user
+        export_format = context.args[0].lower() if context.args else EXPORT_FORMAT_JSON
+        logger.info(f"User {user.username} (ID: {user.id}): export command, format: {export_format}")
+        if export_format not in (EXPORT_FORMAT_JSON, EXPORT_FORMAT_CSV):
+            await update.message.reply_text(
+                "Usage: /export [json|csv]",
+                reply_markup=get_core_function_keyboard()
+            )
+            return
+
+        # Chunks go to a temporary file as they are generated, so the whole
+        # document is never held in memory
+        with tempfile.TemporaryFile() as file:
+            for count, chunk in enumerate(iter_export_chunks(self.bot.anime_manager.iter_animes(), export_format), start=1):
+                file.write(chunk)
+                if count % EXPORT_CHUNK_ROWS == 0:
+                    await asyncio.sleep(0)
+            file.seek(0)
+            await update.message.reply_document(
+                file,
+                filename=f"anime_list.{export_format}",
+                caption=f"📤 {self.bot.anime_manager.get_anime_count()} animes",
+                reply_markup=get_core_function_keyboard()
+            )
+        logger.info(f"Bot: sent {export_format} export to User {user.username} (ID: {user.id})")
+
+    async def import_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        """
+        Handler for importing animes from a document.
+
+        Args:
+            update: Telegram update object
+            context: Callback context
+
+        Returns:
+            Next conversation state
+        """
+        if not await self.bot.check_user_permission(update):
+            return ConversationHandler.END
+
+        user = update.effective_user
+        logger.info(f"User {user.username} (ID: {user.id}): import command")
+
+        await update.message.reply_text(
+            "Please send a .json or .csv document to import "
+            "(as made by /export; a CSV only needs a name column).\n"
+            "Animes already in your list are skipped. Use /cancel to stop.",
+            reply_markup=None
+        )
+        logger.info(f"Bot: waiting User {user.username} (ID: {user.id}) to send a document")
+        return STATE_IMPORT_DOCUMENT
+
+    async def import_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        """
+        Handle the uploaded document: parse it record by record and add the
+        animes in batches, editing a progress message as it goes.
+
+        Args:
+            update: Telegram update object
+            context: Callback context
+
+        Returns:
+            End of conversation
+        """
+        if not await self.bot.check_user_permission(update):
+            return ConversationHandler.END
+
+        user = update.effective_user
+        document = update.message.document
+        file_name = document.file_name or ''
+        logger.info(f"User {user.username} (ID: {user.id}): import document {file_name} ({document.file_size} bytes)")
+
+        progress = await update.message.reply_text("📥 Importing...")
+        descriptor, path = tempfile.mkstemp(suffix=os.path.splitext(file_name)[1])
+        os.close(descriptor)
+        added = skipped = invalid = 0
+        try:
+            try:
+                telegram_file = await context.bot.get_file(document.file_id)
+                await telegram_file.download_to_drive(path)
+            except (TelegramError, OSError) as e:
+                logger.warning(f"User {user.username} (ID: {user.id}): download of {file_name} failed: {e}")
+                await progress.edit_text(f"❌ Could not download {file_name}: {e}\nPlease send it again with /import.")
+                return ConversationHandler.END
+
+            batch: List[AnimeDetails] = []
+            last_progress = time.monotonic()
+            for name, details in iter_import_records(path, file_name):
+                try:
+                    batch.append(parse_import_record(name, details))
+                except ValueError as e:
+                    invalid += 1
+                    logger.debug(f"Skipped invalid import record: {e}")
+                    continue
+                if len(batch) < IMPORT_BATCH_SIZE:
+                    continue
+
+                batch_added, batch_skipped = self.bot.anime_manager.add_anime_details(batch)
+                added += len(batch_added)
+                skipped += len(batch_skipped)
+                batch = []
+                if time.monotonic() - last_progress >= IMPORT_PROGRESS_INTERVAL:
+                    await progress.edit_text(f"📥 Importing... {added} added, {skipped} skipped, {invalid} invalid")
+                    last_progress = time.monotonic()
+                # Let other updates through between batches
+                await asyncio.sleep(0)
+
+            if batch:
+                batch_added, batch_skipped = self.bot.anime_manager.add_anime_details(batch)
+                added += len(batch_added)
+                skipped += len(batch_skipped)
+        except (ValueError, RuntimeError, csv.Error) as e:
+            logger.info(f"User {user.username} (ID: {user.id}): import of {file_name} failed: {e}")
+            await progress.edit_text(
+                f"❌ Could not read {file_name}: {str(e).replace(path, file_name)}\n"
+                f"{added} animes were added before the error."
+            )
+            return ConversationHandler.END
+        finally:
+            os.remove(path)
+
+        logger.info(f"User {user.username} (ID: {user.id}): imported {added} animes, skipped {skipped}, invalid {invalid}")
+        await progress.edit_text(
+            f"✅ Import finished: {added} added, {skipped} already in your list, {invalid} invalid."
+        )
+        await update.message.reply_text(
+            "Use /get_animes to view your list",
+            reply_markup=get_core_function_keyboard()
+        )
+        logger.info(f"Bot: confirmed import to User {user.username} (ID: {user.id})")
+        return ConversationHandler.END
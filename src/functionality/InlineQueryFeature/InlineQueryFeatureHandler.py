@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from typing import List
+
+from telegram import (
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+    Update,
+)
+from telegram.ext import ContextTypes
+
+from src.constant.constant import (
+    INLINE_CACHE_SIZE,
+    INLINE_CACHE_TIME,
+    INLINE_RESULTS_LIMIT,
+    INLINE_RESULTS_PER_PAGE,
+)
+
+import logging
+logger = logging.getLogger("tg_bot")
+
+class InlineQueryFeatureHandler:
+    """Handler for inline queries (@bot <prefix>)."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # (user id, query, collection version) -> list of inline results
+        self.cache: OrderedDict = OrderedDict()
+
+    async def inline_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Answer an inline query with animes whose name has a word starting with it.
+
+        Args:
+            update: Telegram update object
+            context: Callback context
+        """
+        inline_query = update.inline_query
+        if not await self.bot.check_user_permission(update):
+            await inline_query.answer([], cache_time=INLINE_CACHE_TIME, is_personal=True)
+            return
+
+        user = update.effective_user
+        offset = int(inline_query.offset or 0)
+        results = self.get_results(user.id, inline_query.query)
+        page = results[offset:offset + INLINE_RESULTS_PER_PAGE]
+        next_offset = offset + INLINE_RESULTS_PER_PAGE
+        logger.info(f"User {user.username} (ID: {user.id}): inline query '{inline_query.query}', {len(results)} results from offset {offset}")
+
+        # Results depend on who is asking (access rules), so Telegram must
+        # not share them between users
+        await inline_query.answer(
+            page,
+            cache_time=INLINE_CACHE_TIME,
+            is_personal=True,
+            next_offset=str(next_offset) if next_offset < len(results) else '',
+        )
+
+    def get_results(self, user_id: int, text: str) -> List[InlineQueryResultArticle]:
+        """
+        Get the inline results for a query, reusing them until the collection changes.
+
+        Args:
+            user_id: ID of the user asking
+            text: Query text
+
+        Returns:
+            List of inline results
+        """
+        key = (user_id, text, self.bot.anime_manager.version)
+        results = self.cache.get(key)
+        if results is not None:
+            self.cache.move_to_end(key)
+            return results
+
+        results = []
+        for index in self.bot.anime_manager.search_animes_by_prefix(text, INLINE_RESULTS_LIMIT):
+            anime = self.bot.anime_manager.get_anime_by_index(index)
+            results.append(InlineQueryResultArticle(
+                id=str(index),
+                title=anime.name,
+                description=f"📊 {anime.status} · 🎬 {anime.episodes}",
+                input_message_content=InputTextMessageContent(
+                    self.bot.get_animes_handler.get_anime_details_text(anime)
+                ),
+            ))
+
+        self.cache[key] = results
+        if len(self.cache) > INLINE_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return results
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from typing import List
+
+from telegram import (
+    Update,
+    User,
+)
+from telegram.ext import ContextTypes
+
+from src.constant.constant import SEARCH_CACHE_SIZE, SEARCH_PAGE_SIZE, SESSION_SEARCH
+from src.keyboard.keyboard import (
+    get_core_function_keyboard,
+    get_search_results_keyboard,
+)
+
+import logging
+logger = logging.getLogger("tg_bot")
+
+class SearchFeatureHandler:
+    """Handler for /search command."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # (query, collection version) -> ranked anime indexes
+        self.cache: OrderedDict = OrderedDict()
+
+    async def search_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Handler for searching animes by name or description.
+
+        Args:
+            update: Telegram update object
+            context: Callback context
+        """
+        if not await self.bot.check_user_permission(update):
+            return
+
+        user = update.effective_user
+        text = ' '.join(context.args or [])
+        logger.info(f"User {user.username} (ID: {user.id}): search command, text: {text}")
+
+        if not text:
+            await update.message.reply_text(
+                "Usage: /search <text>",
+                reply_markup=get_core_function_keyboard()
+            )
+            return
+
+        self.bot.session_store.set_value(user.id, SESSION_SEARCH, text)
+        message_text, reply_markup = self.get_search_page(text, 0, user)
+        await update.message.reply_text(message_text, reply_markup=reply_markup)
+
+    async def handle_search_button_callback(self, query: Update.callback_query) -> None:
+        """
+        Show another page of the user's last search.
+
+        Args:
+            query: Callback query
+        """
+        _, page = query.data.split(',')
+        user = query.from_user
+        text = self.bot.session_store.get_value(user.id, SESSION_SEARCH)
+        if text is None:
+            logger.info(f"Bot: no active search for User {user.username} (ID: {user.id})")
+            await query.edit_message_text("This search has expired. Please use /search again.")
+            return
+
+        message_text, reply_markup = self.get_search_page(text, int(page), user)
+        await query.edit_message_text(message_text, reply_markup=reply_markup)
+
+    def get_search_page(self, text: str, page: int, user: User) -> tuple:
+        """
+        Build the message for one page of search results.
+
+        Args:
+            text: Search text
+            page: Page to show, starting at 0
+            user: User
+
+        Returns:
+            Message text and reply markup
+        """
+        indexes = self.get_results(text)
+        if not indexes:
+            logger.info(f"Bot: no search results for '{text}' for User {user.username} (ID: {user.id})")
+            return f"No animes found for '{text}'.", None
+
+        total_pages = (len(indexes) + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE
+        page = min(max(page, 0), total_pages - 1)
+        page_indexes = indexes[page * SEARCH_PAGE_SIZE:(page + 1) * SEARCH_PAGE_SIZE]
+        results = [(index, self.bot.anime_manager.get_anime_by_index(index)) for index in page_indexes]
+
+        logger.info(f"Bot: showing search results page {page + 1}/{total_pages} ({len(indexes)} items) to User {user.username} (ID: {user.id})")
+        return (
+            f"Search results for '{text}':",
+            get_search_results_keyboard(results, page, total_pages)
+        )
+
+    def get_results(self, text: str) -> List[int]:
+        """
+        Get the ranked results of a search, reusing them until the collection changes.
+
+        Args:
+            text: Search text
+
+        Returns:
+            Indexes of matching animes, best matches first
+        """
+        key = (text, self.bot.anime_manager.version)
+        indexes = self.cache.get(key)
+        if indexes is not None:
+            self.cache.move_to_end(key)
+            return indexes
+
+        indexes = self.bot.anime_manager.search_animes(text)
+        self.cache[key] = indexes
+        if len(self.cache) > SEARCH_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return indexes
@@ -0,0 +1,73 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from src.constant.constant import (
+    STATUS_WATCHING,
+    STATUS_COMPLETED,
+    STATUS_ON_HOLD,
+    STATUS_DROPPED,
+    STATUS_PLANNED,
+    BUTTON_STATUS_WATCHING,
+    BUTTON_STATUS_COMPLETED,
+    BUTTON_STATUS_ON_HOLD,
+    BUTTON_STATUS_DROPPED,
+    BUTTON_STATUS_PLANNED,
+    STATS_TOP_TITLES,
+)
+from src.keyboard.keyboard import get_core_function_keyboard
+
+import logging
+logger = logging.getLogger("tg_bot")
+
+STATUS_LABELS = {
+    STATUS_WATCHING: BUTTON_STATUS_WATCHING,
+    STATUS_COMPLETED: BUTTON_STATUS_COMPLETED,
+    STATUS_ON_HOLD: BUTTON_STATUS_ON_HOLD,
+    STATUS_DROPPED: BUTTON_STATUS_DROPPED,
+    STATUS_PLANNED: BUTTON_STATUS_PLANNED,
+}
+
+class StatsFeatureHandler:
+    """Handler for /stats command."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Handler for showing collection statistics.
+
+        Args:
+            update: Telegram update object
+            context: Callback context
+        """
+        if not await self.bot.check_user_permission(update):
+            return
+
+        user = update.effective_user
+        logger.info(f"User {user.username} (ID: {user.id}): stats command")
+
+        stats = self.bot.anime_manager.get_stats(STATS_TOP_TITLES)
+        lines = ["📊 Collection stats", "", f"Total: {stats['total']}"]
+        for status, label in STATUS_LABELS.items():
+            lines.append(f"{label}: {stats['status_counts'].get(status, 0)}")
+        other = stats['total'] - sum(stats['status_counts'].get(status, 0) for status in STATUS_LABELS)
+        if other:
+            lines.append(f"❔ No status: {other}")
+        lines.append("")
+        if stats['rated_count']:
+            lines.append(f"⭐ Average rating: {stats['average_rating']:.2f} ({stats['rated_count']} rated)")
+        else:
+            lines.append("⭐ Average rating: Not rated")
+        lines.append(f"🎬 Episodes watched: {stats['total_episodes']}")
+        if stats['most_watched']:
+            lines.append("")
+            lines.append("🏆 Most watched:")
+            for i, (name, episodes) in enumerate(stats['most_watched'], start=1):
+                lines.append(f"{i}. {name} ({episodes} episodes)")
+
+        await update.message.reply_text(
+            "\n".join(lines),
+            reply_markup=get_core_function_keyboard()
+        )
+        logger.info(f"Bot: sent stats to User {user.username} (ID: {user.id})")
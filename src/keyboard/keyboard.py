@@ -11,6 +11,16 @@ from src.constant.constant import (
     BUTTON_STATUS_ON_HOLD,
     BUTTON_STATUS_DROPPED,
     BUTTON_STATUS_PLANNED,
+    LIST_FILTER_ALL,
+    LIST_SORT_ADDED,
+    LIST_SORT_RATING,
+    LIST_SORT_EPISODES,
+    LIST_SORT_NAME,
+    BUTTON_FILTER_ALL,
+    BUTTON_SORT_ADDED,
+    BUTTON_SORT_RATING,
+    BUTTON_SORT_EPISODES,
+    BUTTON_SORT_NAME,
 )
 
 import logging
@@ -47,12 +57,35 @@ def get_anime_details_keyboard(index: int) -> InlineKeyboardMarkup:
             InlineKeyboardButton("⭐ Edit Rating", callback_data=f'anime_edit,rating,{index}'),
             InlineKeyboardButton("📊 Edit Status", callback_data=f'anime_edit,status,{index}')
         ],
+        [
+            InlineKeyboardButton("🔼 Move Up", callback_data=f'anime_move,up,{index}'),
+            InlineKeyboardButton("🔽 Move Down", callback_data=f'anime_move,down,{index}'),
+            InlineKeyboardButton("🗑️ Delete", callback_data=f'anime_delete,ask,{index}')
+        ],
         [
             InlineKeyboardButton("📚 Get Animes", callback_data='anime_edit,get_animes,-1')
         ]
     ]
     return InlineKeyboardMarkup(keyboard)
 
+def get_delete_confirm_keyboard(index: int) -> InlineKeyboardMarkup:
+    """
+    Create keyboard to confirm deleting an anime.
+    
+    Args:
+        index: Index of the anime
+        
+    Returns:
+        InlineKeyboardMarkup for delete confirmation
+    """
+    keyboard = [
+        [
+            InlineKeyboardButton("🗑️ Yes, delete", callback_data=f'anime_delete,confirm,{index}'),
+            InlineKeyboardButton("🔙 Cancel", callback_data=f'anime_detail,{index}')
+        ]
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
 def get_rating_keyboard(index: int) -> InlineKeyboardMarkup:
     """
     Create keyboard for rating selection.
@@ -124,41 +157,118 @@ def get_episode_editor_keyboard(index: int, current_episodes: int) -> InlineKeyb
     ]
     return InlineKeyboardMarkup(keyboard)
 
-def get_anime_list_keyboard(animes: list) -> InlineKeyboardMarkup:
+def get_anime_button_text(anime) -> str:
+    """
+    Create the list button text for an anime.
+
+    Args:
+        anime: Anime object
+
+    Returns:
+        Status emoji, name, rating stars and episode count
     """
-    Create keyboard with anime list as buttons.
+    # Get status emoji
+    status_emoji = {
+        STATUS_WATCHING: "📺",
+        STATUS_COMPLETED: "✅",
+        STATUS_ON_HOLD: "⏸️",
+        STATUS_DROPPED: "❌",
+        STATUS_PLANNED: "📝"
+    }.get(anime.status, "❔")
+    logger.info(f"anime.status: {anime.status}")
+    logger.info(f"Status emoji: {status_emoji}")
+    
+    # Add rating stars if rated
+    rating_str = f" {'⭐' * int(anime.rating)}" if anime.rating else ""
+    
+    # Add episode count if any
+    episode_str = f" [{anime.episodes}]" if anime.episodes > 0 else ""
+    
+    # Create button text with status emoji, name, rating, and episodes
+    return f"{status_emoji} {anime.name}{rating_str}{episode_str}"
+
+def get_anime_list_keyboard(results: list, status: str, sort: str, page: int, total_pages: int) -> InlineKeyboardMarkup:
+    """
+    Create keyboard with one page of the anime list as buttons.
     
     Args:
-        animes: List of anime objects
+        results: List of (index, anime object) pairs on this page
+        status: Status filter of the view, or LIST_FILTER_ALL
+        sort: Sort of the view
+        page: Current page, starting at 0
+        total_pages: Number of pages in the view
         
     Returns:
         InlineKeyboardMarkup for anime list
     """
     keyboard = []
-    for i, anime in enumerate(animes):
-        # Get status emoji
-        status_emoji = {
-            STATUS_WATCHING: "📺",
-            STATUS_COMPLETED: "✅",
-            STATUS_ON_HOLD: "⏸️",
-            STATUS_DROPPED: "❌",
-            STATUS_PLANNED: "📝"
-        }.get(anime.status, "❔")
-        logger.info(f"anime.status: {anime.status}")
-        logger.info(f"Status emoji: {status_emoji}")
-        
-        # Add rating stars if rated
-        rating_str = f" {'⭐' * int(anime.rating)}" if anime.rating else ""
-        
-        # Add episode count if any
-        episode_str = f" [{anime.episodes}]" if anime.episodes > 0 else ""
-        
-        # Create button text with status emoji, name, rating, and episodes
-        button_text = f"{status_emoji} {anime.name}{rating_str}{episode_str}"
-        keyboard.append([InlineKeyboardButton(button_text, callback_data=f'anime_detail,{i}')])
+    for index, anime in results:
+        keyboard.append([InlineKeyboardButton(get_anime_button_text(anime), callback_data=f'anime_detail,{index}')])
+
+    def view_button(text: str, new_status: str, new_sort: str) -> InlineKeyboardButton:
+        selected = new_status == status and new_sort == sort
+        return InlineKeyboardButton(
+            f"• {text}" if selected else text,
+            callback_data=f'anime_list,{new_status},{new_sort},0'
+        )
+
+    filters = [
+        (BUTTON_FILTER_ALL, LIST_FILTER_ALL),
+        (BUTTON_STATUS_WATCHING, STATUS_WATCHING),
+        (BUTTON_STATUS_COMPLETED, STATUS_COMPLETED),
+        (BUTTON_STATUS_ON_HOLD, STATUS_ON_HOLD),
+        (BUTTON_STATUS_DROPPED, STATUS_DROPPED),
+        (BUTTON_STATUS_PLANNED, STATUS_PLANNED),
+    ]
+    keyboard.append([view_button(text, value, sort) for text, value in filters[:3]])
+    keyboard.append([view_button(text, value, sort) for text, value in filters[3:]])
+    sorts = [
+        (BUTTON_SORT_ADDED, LIST_SORT_ADDED),
+        (BUTTON_SORT_RATING, LIST_SORT_RATING),
+        (BUTTON_SORT_EPISODES, LIST_SORT_EPISODES),
+        (BUTTON_SORT_NAME, LIST_SORT_NAME),
+    ]
+    keyboard.append([view_button(text, status, value) for text, value in sorts])
+
+    navigation = []
+    if page > 0:
+        navigation.append(InlineKeyboardButton("⬅️ Prev", callback_data=f'anime_list,{status},{sort},{page - 1}'))
+    if total_pages > 1:
+        navigation.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data=f'anime_list,{status},{sort},{page}'))
+    if page < total_pages - 1:
+        navigation.append(InlineKeyboardButton("Next ➡️", callback_data=f'anime_list,{status},{sort},{page + 1}'))
+    if navigation:
+        keyboard.append(navigation)
     
     return InlineKeyboardMarkup(keyboard)
 
+def get_search_results_keyboard(results: list, page: int, total_pages: int) -> InlineKeyboardMarkup:
+    """
+    Create keyboard with one page of search results.
+    
+    Args:
+        results: List of (index, anime object) pairs on this page
+        page: Current page, starting at 0
+        total_pages: Number of result pages
+        
+    Returns:
+        InlineKeyboardMarkup for search results
+    """
+    keyboard = [
+        [InlineKeyboardButton(get_anime_button_text(anime), callback_data=f'anime_detail,{index}')]
+        for index, anime in results
+    ]
+    navigation = []
+    if page > 0:
+        navigation.append(InlineKeyboardButton("⬅️ Prev", callback_data=f'search,{page - 1}'))
+    if total_pages > 1:
+        navigation.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data=f'search,{page}'))
+    if page < total_pages - 1:
+        navigation.append(InlineKeyboardButton("Next ➡️", callback_data=f'search,{page + 1}'))
+    if navigation:
+        keyboard.append(navigation)
+    return InlineKeyboardMarkup(keyboard)
+
 def get_view_detail_keyboard(index: int) -> InlineKeyboardMarkup:
     """
     Create keyboard for viewing anime details.
@@ -171,3 +281,20 @@ def get_view_detail_keyboard(index: int) -> InlineKeyboardMarkup:
     """
     keyboard = [[InlineKeyboardButton("View Details", callback_data=f'anime_detail,{index}')]]
     return InlineKeyboardMarkup(keyboard)
+
+def get_catalog_suggestions_keyboard(suggestions: list) -> InlineKeyboardMarkup:
+    """
+    Create keyboard offering catalog titles for a typed anime name.
+    
+    Args:
+        suggestions: List of (title, episodes) pairs, episodes being 0 if unknown
+        
+    Returns:
+        InlineKeyboardMarkup with a button per title and one to keep the typed name
+    """
+    keyboard = [
+        [InlineKeyboardButton(f"{title} ({episodes} eps)" if episodes else title, callback_data=f'catalog_add,{i}')]
+        for i, (title, episodes) in enumerate(suggestions)
+    ]
+    keyboard.append([InlineKeyboardButton("✏️ Add as typed", callback_data='catalog_add,typed')])
+    return InlineKeyboardMarkup(keyboard)
@@ -1,8 +1,12 @@
-from typing import Optional, Dict, Callable, List
-from telegram import Update
-from telegram.ext import CallbackQueryHandler, ContextTypes
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Dict, Callable
 import logging
 
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import ContextTypes
+
 logger = logging.getLogger("tg_bot")
 
 class ButtonCallbackManager:
@@ -16,31 +20,28 @@ class ButtonCallbackManager:
         
         Args:
             callback: The callback function to be executed.
-            pattern: The pattern to match for the callback. If None, it acts as a fallback.
+            pattern: The callback_data prefix (the text before the first comma)
+                to match. If None, it acts as a fallback.
         """
         self.callbacks[pattern] = callback
 
-    def get_callback_query_handlers(self) -> List[CallbackQueryHandler]:
-        """Generate a list of CallbackQueryHandler instances for registered callbacks.
+    def get_callback_for_data(self, data: str) -> Optional[Callable]:
+        """Get the callback handler for a button by the prefix of its callback_data.
+        
+        Args:
+            data: callback_data of the pressed button, e.g. 'anime_detail,3'.
         
         Returns:
-            List[CallbackQueryHandler]: A list of handlers for the registered callbacks.
+            Optional[Callable]: The callback handler, the fallback handler if no
+            pattern matches, or None.
         """
-        callback_query_handlers = []
-        none_pattern_handler = None
-
-        for pattern, callback in self.callbacks.items():
-            handler = self.get_callback_query_handler(pattern)
-            if pattern is not None:
-                callback_query_handlers.append(CallbackQueryHandler(handler, pattern=pattern))
-            else:
-                none_pattern_handler = CallbackQueryHandler(handler)
-
-        # Place the None pattern handler at the end
-        if none_pattern_handler is not None:
-            callback_query_handlers.append(none_pattern_handler)
-
-        return callback_query_handlers
+        pattern = data.split(',', 1)[0]
+        if pattern not in self.callbacks:
+            if None not in self.callbacks:
+                logger.info(f"No button callback registered for data: {data}")
+                return None
+            pattern = None
+        return self.get_callback_query_handler(pattern)
 
     def get_callback_query_handler(self, pattern: Optional[str]) -> Callable:
         """Get or create a callback handler for a specific pattern.
@@ -71,6 +72,8 @@ class ButtonCallbackManager:
                 user = query.from_user
                 logger.info(f"User {user.username} (ID: {user.id}): Button callback triggered, data: {query.data}")
                 await query.answer()
+                # The message with the pressed button is the user's panel
+                self.bot.panel_manager.remember(user.id, query.message)
 
                 try:
                     res = await callback(query)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+import logging
+import time
+
+from src.constant.constant import (
+    DIGEST_STATE_FILE,
+    DIGEST_FIRST_DELAY,
+    DIGEST_BATCH_SIZE,
+    DIGEST_WINDOW,
+    DIGEST_LIST_LIMIT,
+    DIGEST_MAX_LENGTH,
+)
+from src.model.serializer import (
+    FORMAT_COMPACT_JSON,
+    get_serializer,
+    load_config,
+    dump_config,
+)
+
+if TYPE_CHECKING:
+    from telegram.ext import ContextTypes, JobQueue
+
+logger = logging.getLogger("tg_bot")
+
+class DigestManager:
+    """Send a periodic digest of the watching titles to subscribed users.
+
+    The digest is built once per run from the watching index and sent in
+    batches of DIGEST_BATCH_SIZE, spread over DIGEST_WINDOW and never faster
+    than one batch per second, which keeps the bot below Telegram's
+    broadcast limit. The recipients of a run and how many were already sent
+    are written to DIGEST_STATE_FILE after every batch, so a restart resumes
+    the run instead of starting over or skipping users.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.path = bot.storage_path(DIGEST_STATE_FILE)
+        self.serializer = get_serializer(FORMAT_COMPACT_JSON)
+        # User ID -> chat ID
+        self.subscribers: Dict[int, int] = {}
+        # Times watching titles were last changed, until the index is built
+        self.touched: Dict[str, float] = {}
+        self.last_run: Optional[float] = None
+        # {'text': digest, 'recipients': [[user ID, chat ID]], 'sent': count}
+        self.run: Optional[Dict] = None
+        try:
+            data = load_config(self.path)
+        except FileNotFoundError:
+            return
+        except Exception:
+            logger.warning(f"Failed to restore digests from {self.path}, starting without subscribers", exc_info=True)
+            return
+        self.subscribers = {user_id: chat_id for user_id, chat_id in data.get('subscribers', [])}
+        self.touched = {name: touched for name, touched in data.get('touched', [])}
+        self.last_run = data.get('last_run')
+        self.run = data.get('run')
+
+    def save(self) -> None:
+        """Write subscribers, touch times and the progress of the current run."""
+        self.bot.anime_manager.deliver_events()
+        watching_index = self.bot.anime_manager.watching_index
+        touched = watching_index.touched() if watching_index is not None else self.touched.items()
+        data = {
+            'subscribers': [[user_id, chat_id] for user_id, chat_id in self.subscribers.items()],
+            'touched': [[name, time_touched] for name, time_touched in touched],
+            'last_run': self.last_run,
+            'run': self.run,
+        }
+        dump_config(data, self.path, self.serializer)
+
+    def start(self, job_queue: JobQueue) -> None:
+        """
+        Schedule digests and resume a run interrupted by a restart.
+
+        Args:
+            job_queue: Job queue of the application
+        """
+        interval = self.bot.config.digest_interval
+        if self.subscribers:
+            # Track changes from now on so stale titles are reported correctly
+            self.bot.anime_manager.get_watching_index(self.touched)
+        if self.run is not None:
+            logger.info(f"Resuming digest run at {self.run['sent']}/{len(self.run['recipients'])}")
+            job_queue.run_once(self.send_batch, DIGEST_FIRST_DELAY)
+        first = DIGEST_FIRST_DELAY
+        if self.last_run is not None:
+            first = max(first, self.last_run + interval - time.time())
+        job_queue.run_repeating(self.digest_job, interval, first=first)
+
+    def subscribe(self, user_id: int, chat_id: int) -> None:
+        """
+        Send digests to a user.
+
+        Args:
+            user_id: ID of the user
+            chat_id: ID of the chat to send to
+        """
+        self.bot.anime_manager.get_watching_index(self.touched)
+        self.subscribers[user_id] = chat_id
+        self.save()
+
+    def unsubscribe(self, user_id: int) -> bool:
+        """
+        Stop sending digests to a user.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            True if the user was subscribed
+        """
+        if self.subscribers.pop(user_id, None) is None:
+            return False
+        self.save()
+        return True
+
+    def build_digest(self, footer: str, now: Optional[float] = None) -> Optional[str]:
+        """
+        Build the digest text from the watching index.
+
+        Args:
+            footer: Last line of the message, always kept when the list is cut
+            now: Current time, defaults to time.time()
+
+        Returns:
+            Digest text, or None if nothing is being watched
+        """
+        now = time.time() if now is None else now
+        stale_days = self.bot.config.digest_stale_days
+        watching = self.bot.anime_manager.get_watching_index(self.touched).get_watching()
+        if not watching:
+            return None
+        stale_before = now - stale_days * 24 * 60 * 60
+        stale = [item for item in watching if item[2] < stale_before]
+        # Most recently touched first
+        active = [item for item in reversed(watching) if item[2] >= stale_before]
+
+        lines = [f"📺 Watching digest ({len(watching)} titles)"]
+        if active:
+            lines.append("")
+            lines.extend(f"• {name} — episode {episodes}" for name, episodes, _ in active[:DIGEST_LIST_LIMIT])
+            if len(active) > DIGEST_LIST_LIMIT:
+                lines.append(f"…and {len(active) - DIGEST_LIST_LIMIT} more")
+        if stale:
+            lines.append("")
+            lines.append(f"💤 Not touched in {stale_days} days:")
+            lines.extend(
+                f"• {name} — episode {episodes}, {int((now - touched) // 86400)} days ago"
+                for name, episodes, touched in stale[:DIGEST_LIST_LIMIT]
+            )
+            if len(stale) > DIGEST_LIST_LIMIT:
+                lines.append(f"…and {len(stale) - DIGEST_LIST_LIMIT} more")
+        text = "\n".join(lines)
+        limit = DIGEST_MAX_LENGTH - len(footer) - 4
+        if len(text) > limit:
+            text = text[:text.rindex("\n", 0, limit)] + "\n…"
+        return f"{text}\n\n{footer}"
+
+    async def digest_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job starting a digest run."""
+        if self.run is not None or not self.subscribers:
+            return
+        text = self.build_digest("Use /digest off to stop these messages.")
+        self.last_run = time.time()
+        if text is None:
+            logger.info("Nothing is being watched, skipping the digest")
+            self.save()
+            return
+        recipients: List[List[int]] = sorted([user_id, chat_id] for user_id, chat_id in self.subscribers.items())
+        self.run = {'text': text, 'recipients': recipients, 'sent': 0}
+        self.save()
+        logger.info(f"Starting digest run to {len(recipients)} subscribers")
+        await self.send_batch(context)
+
+    async def send_batch(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job sending the next batch of the current run and scheduling the one after."""
+        from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+
+        run = self.run
+        if run is None:
+            return
+        recipients = run['recipients']
+        batch = recipients[run['sent']:run['sent'] + DIGEST_BATCH_SIZE]
+        delay = None
+        for user_id, chat_id in batch:
+            if user_id not in self.subscribers or (
+                self.bot.config.enable_restriction and user_id not in self.bot.config.allowed_users
+            ):
+                run['sent'] += 1
+                continue
+            try:
+                await context.bot.send_message(chat_id, run['text'])
+            except RetryAfter as e:
+                # Resend to this user once Telegram allows it
+                delay = e.retry_after
+                if hasattr(delay, 'total_seconds'):
+                    delay = delay.total_seconds()
+                logger.warning(f"Digest rate limited, retrying in {delay} seconds")
+                break
+            except (Forbidden, BadRequest) as e:
+                logger.info(f"Digest to User {user_id} failed ({e}), unsubscribing")
+                self.subscribers.pop(user_id, None)
+            except TelegramError as e:
+                logger.warning(f"Digest to User {user_id} failed: {e}")
+            run['sent'] += 1
+
+        if run['sent'] >= len(recipients):
+            logger.info(f"Digest run finished, sent to {len(recipients)} subscribers")
+            self.run = None
+        elif delay is None:
+            batches = -(-len(recipients) // DIGEST_BATCH_SIZE)
+            delay = max(1.0, DIGEST_WINDOW / batches)
+        self.save()
+        if self.run is not None:
+            context.job_queue.run_once(self.send_batch, delay)
@@ -0,0 +1,117 @@
+from typing import Any, Callable, Dict, List, Tuple
+import importlib
+import logging
+
+from src.constant.constant import (
+    STATE_ANIME_NAME,
+    STATE_EDIT_DESCRIPTION,
+    STATE_EDIT_EPISODE,
+    STATE_IMPORT_DOCUMENT,
+    INPUT_TEXT,
+    INPUT_DOCUMENT,
+)
+
+logger = logging.getLogger("tg_bot")
+
+# Attribute name on the bot -> "module:Class" of the feature handler.
+# Modules are imported the first time the handler is used.
+FEATURE_HANDLERS: Dict[str, str] = {
+    'start_handler': 'src.functionality.StartFeature.StartFeatureHandler:StartFeatureHandler',
+    'add_anime_handler': 'src.functionality.AddAnimeFeature.AddAnimeFeatureHandler:AddAnimeFeatureHandler',
+    'get_animes_handler': 'src.functionality.GetAnimesFeature.GetAnimesFeatureHandler:GetAnimesFeatureHandler',
+    'help_handler': 'src.functionality.HelpFeature.HelpFeatureHandler:HelpFeatureHandler',
+    'search_handler': 'src.functionality.SearchFeature.SearchFeatureHandler:SearchFeatureHandler',
+    'stats_handler': 'src.functionality.StatsFeature.StatsFeatureHandler:StatsFeatureHandler',
+    'inline_query_handler': 'src.functionality.InlineQueryFeature.InlineQueryFeatureHandler:InlineQueryFeatureHandler',
+    'import_export_handler': 'src.functionality.ImportExportFeature.ImportExportFeatureHandler:ImportExportFeatureHandler',
+    'digest_handler': 'src.functionality.DigestFeature.DigestFeatureHandler:DigestFeatureHandler',
+}
+
+# (command, feature handler, method) for commands, available in every state
+FEATURE_COMMANDS: List[Tuple[str, str, str]] = [
+    ('start', 'start_handler', 'start_command'),
+    ('s', 'start_handler', 'start_command'),
+    ('add_anime', 'add_anime_handler', 'add_anime_command'),
+    ('help', 'help_handler', 'help_command'),
+    ('h', 'help_handler', 'help_command'),
+    ('get_animes', 'get_animes_handler', 'get_animes_command'),
+    ('search', 'search_handler', 'search_command'),
+    ('stats', 'stats_handler', 'stats_command'),
+    ('export', 'import_export_handler', 'export_command'),
+    ('import', 'import_export_handler', 'import_command'),
+    ('digest', 'digest_handler', 'digest_command'),
+]
+
+# (reply keyboard text, feature handler, method) for the main menu buttons
+FEATURE_TEXTS: List[Tuple[str, str, str]] = [
+    ('📺 Add Anime', 'add_anime_handler', 'add_anime_command'),
+    ('📚 My Anime List', 'get_animes_handler', 'get_animes_command'),
+]
+
+# (state, input type, feature handler, method) for input while a conversation waits
+FEATURE_STATE_INPUTS: List[Tuple[str, str, str, str]] = [
+    (STATE_ANIME_NAME, INPUT_TEXT, 'add_anime_handler', 'add_anime_name'),
+    (STATE_EDIT_DESCRIPTION, INPUT_TEXT, 'get_animes_handler', 'handle_description_edit'),
+    (STATE_EDIT_EPISODE, INPUT_TEXT, 'get_animes_handler', 'edit_episode'),
+    (STATE_IMPORT_DOCUMENT, INPUT_DOCUMENT, 'import_export_handler', 'import_document'),
+]
+
+# (callback_data prefix, feature handler, method) for inline button callbacks
+FEATURE_BUTTON_CALLBACKS: List[Tuple[str, str, str]] = [
+    ('anime_edit', 'get_animes_handler', 'handle_anime_edit_button_callback'),
+    ('episode_edit', 'get_animes_handler', 'handle_episode_button_callback'),
+    ('rating', 'get_animes_handler', 'handle_rating_button_callback'),
+    ('status', 'get_animes_handler', 'handle_status_button_callback'),
+    ('anime_detail', 'get_animes_handler', 'show_anime_details'),
+    ('anime_list', 'get_animes_handler', 'handle_anime_list_button_callback'),
+    ('anime_move', 'get_animes_handler', 'handle_move_button_callback'),
+    ('anime_delete', 'get_animes_handler', 'handle_delete_button_callback'),
+    ('search', 'search_handler', 'handle_search_button_callback'),
+    ('catalog_add', 'add_anime_handler', 'handle_catalog_add_button_callback'),
+]
+
+
+class FeatureHandlerManager:
+    def __init__(self, bot):
+        self.bot = bot
+        self.handlers: Dict[str, Any] = {}
+
+    def is_registered(self, name: str) -> bool:
+        """Check whether a feature handler with this name is declared.
+
+        Args:
+            name: Attribute name of the feature handler, e.g. 'help_handler'.
+        """
+        return name in FEATURE_HANDLERS
+
+    def get_handler(self, name: str) -> Any:
+        """Get a feature handler, importing its module on first use.
+
+        Args:
+            name: Attribute name of the feature handler, e.g. 'help_handler'.
+
+        Returns:
+            Any: The feature handler instance.
+        """
+        if name not in self.handlers:
+            module_name, class_name = FEATURE_HANDLERS[name].split(':')
+            handler_class = getattr(importlib.import_module(module_name), class_name)
+            self.handlers[name] = handler_class(self.bot)
+            logger.debug(f"Loaded feature handler: {name}")
+        return self.handlers[name]
+
+    def get_callback(self, name: str, method: str) -> Callable:
+        """Get a callback that resolves the handler method when first called.
+
+        Args:
+            name: Attribute name of the feature handler.
+            method: Name of the handler method to call.
+
+        Returns:
+            Callable: Async function forwarding to the handler method.
+        """
+        async def feature_callback(*args, **kwargs):
+            return await getattr(self.get_handler(name), method)(*args, **kwargs)
+
+        feature_callback.__name__ = f"{name}.{method}"
+        return feature_callback
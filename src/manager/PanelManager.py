@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+import logging
+
+if TYPE_CHECKING:
+    from telegram import Bot, InlineKeyboardMarkup, Message
+
+logger = logging.getLogger("tg_bot")
+
+class PanelManager:
+    """Keep one "panel" message per user and edit it in place.
+
+    The panel is the last list, detail or editor message a user interacted
+    with. Screens shown after text input edit the panel instead of sending
+    a new message; a new message is only sent (and becomes the panel) when
+    the panel is too old to edit, is gone, or navigation mode is off.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @property
+    def enabled(self) -> bool:
+        """Whether navigation edits panels; follows PANEL_NAVIGATION when .env is reloaded."""
+        return self.bot.config.panel_navigation
+
+    def remember(self, user_id: int, message: Optional[Message]) -> None:
+        """Make a message the panel of a user.
+
+        Args:
+            user_id: ID of the user.
+            message: Message sent by the bot; inaccessible messages are ignored.
+        """
+        if not self.enabled or message is None or not message.date or not message.date.timestamp():
+            return
+        self.bot.session_store.set_panel(user_id, message.chat_id, message.message_id, message.date.timestamp())
+
+    async def show(self, telegram_bot: Bot, user_id: int, chat_id: int, text: str,
+                   reply_markup: Optional[InlineKeyboardMarkup] = None) -> None:
+        """Show a screen in the user's panel, or in a new message that becomes the panel.
+
+        Args:
+            telegram_bot: Bot used to edit or send the message.
+            user_id: ID of the user.
+            chat_id: ID of the chat the user is in.
+            text: Text of the screen.
+            reply_markup: Inline keyboard of the screen.
+        """
+        from telegram.error import BadRequest
+
+        panel = self.bot.session_store.get_panel(user_id) if self.enabled else None
+        if panel is not None and panel[0] == chat_id:
+            try:
+                await telegram_bot.edit_message_text(
+                    text, chat_id=chat_id, message_id=panel[1], reply_markup=reply_markup
+                )
+                return
+            except BadRequest as e:
+                if 'message is not modified' in str(e).lower():
+                    return
+                logger.info(f"Panel of User {user_id} cannot be edited ({e}), sending a new one")
+
+        message = await telegram_bot.send_message(chat_id, text, reply_markup=reply_markup)
+        self.remember(user_id, message)
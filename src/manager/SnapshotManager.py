@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Tuple
+import asyncio
+import logging
+import os
+
+from src.model.serializer import file_signature
+from src.model.snapshot import (
+    list_snapshots,
+    prune_snapshots,
+    take_snapshot,
+)
+
+if TYPE_CHECKING:
+    from telegram.ext import ContextTypes
+
+logger = logging.getLogger("tg_bot")
+
+class SnapshotManager:
+    """Take compressed snapshots of the anime config on a schedule.
+
+    The config is compressed in a worker thread, so handlers keep running and
+    keep writing while a snapshot of a large collection is taken. A config
+    that did not change since the last snapshot is skipped without being
+    read, and one whose content equals the newest snapshot is not kept.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.last_digest: Optional[str] = None
+        self.last_signature: Optional[Tuple[int, int, int]] = None
+        self._running = False
+
+    def _snapshot(self) -> None:
+        """Take a snapshot and apply the retention policy; runs in a worker thread."""
+        config = self.bot.config
+        config_path = self.bot.anime_manager.config
+        # Snapshots are kept next to the config they were taken of
+        directory = os.path.join(os.path.dirname(config_path), config.snapshot_dir)
+        snapshots = list_snapshots(directory, config_path)
+        if self.last_digest is None and snapshots:
+            self.last_digest = snapshots[0].digest
+        snapshot = take_snapshot(config_path, directory, self.last_digest)
+        if snapshot is None:
+            logger.info(f"{config_path} is unchanged since the last snapshot")
+            return
+        self.last_digest = snapshot.digest
+        removed = prune_snapshots(
+            list_snapshots(directory, config_path), config.snapshot_keep, config.snapshot_keep_daily
+        )
+        logger.info(f"Saved snapshot {snapshot.path}, removed {len(removed)} old snapshots")
+
+    async def snapshot_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job taking a snapshot of the anime config if it changed."""
+        signature = file_signature(self.bot.anime_manager.config)
+        if signature is None or signature == self.last_signature or self._running:
+            return
+        self._running = True
+        try:
+            await asyncio.to_thread(self._snapshot)
+            self.last_signature = signature
+        except Exception:
+            logger.error(f"Failed to snapshot {self.bot.anime_manager.config}", exc_info=True)
+        finally:
+            self._running = False
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+import logging
+
+from src.constant.constant import (
+    INPUT_TEXT,
+    INPUT_DOCUMENT,
+    STATE_END,
+    STATE_IDLE,
+    STATE_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import ContextTypes
+
+logger = logging.getLogger("tg_bot")
+
+class StateMachineManager:
+    """Route every message and button press through the user's conversation state.
+
+    The state of a user is one dictionary lookup in the session store. A
+    command, a reply keyboard text, a (state, input type) pair or a
+    callback_data prefix then selects the handler with one more lookup,
+    instead of trying every registered handler in turn. A handler returning
+    a state moves the user there, STATE_END ends the conversation and None
+    leaves the state unchanged.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.commands: Dict[str, Callable] = {}
+        self.texts: Dict[str, Callable] = {}
+        self.state_inputs: Dict[Tuple[str, str], Callable] = {}
+        # (from state, to state) -> number of transitions
+        self.transitions: Counter = Counter()
+
+    def register_command(self, command: str, callback: Callable) -> None:
+        """Register a command available in every state.
+
+        Args:
+            command: Command without the leading slash.
+            callback: Async function taking (update, context).
+        """
+        self.commands[command.lower()] = callback
+
+    def register_text(self, text: str, callback: Callable) -> None:
+        """Register a reply keyboard text, used when no state handler takes the text.
+
+        Args:
+            text: Exact message text.
+            callback: Async function taking (update, context).
+        """
+        self.texts[text] = callback
+
+    def register_state_input(self, state: str, input_type: str, callback: Callable) -> None:
+        """Register the handler for an input while a user is in a state.
+
+        Args:
+            state: Conversation state.
+            input_type: INPUT_TEXT or INPUT_DOCUMENT.
+            callback: Async function taking (update, context).
+        """
+        self.state_inputs[(state, input_type)] = callback
+
+    def get_transition_counts(self) -> Dict[str, Dict[str, int]]:
+        """Get the number of transitions out of every state; safe to call from any thread.
+
+        Returns:
+            Dict[str, Dict[str, int]]: From state -> to state -> count.
+        """
+        counts: Dict[str, Dict[str, int]] = {}
+        for (from_state, to_state), count in list(self.transitions.items()):
+            counts.setdefault(from_state, {})[to_state] = count
+        return counts
+
+    def _transition(self, user_id: int, from_state: Optional[str], to_state: Optional[str], timed_out: bool = False) -> None:
+        """Move a user to a state and count the transition."""
+        self.bot.session_store.set_state(user_id, to_state)
+        target = STATE_TIMEOUT if timed_out else (to_state or STATE_IDLE)
+        self.transitions[(from_state or STATE_IDLE, target)] += 1
+        logger.debug(f"User {user_id}: state {from_state or STATE_IDLE} -> {target}")
+
+    def sweep(self) -> int:
+        """Evict expired conversations and count them as timeouts.
+
+        Returns:
+            int: Number of evicted conversations.
+        """
+        expired = self.bot.session_store.sweep()
+        for state, count in expired.items():
+            self.transitions[(state, STATE_TIMEOUT)] += count
+        return sum(expired.values())
+
+    def _select(self, update: Update, context: ContextTypes.DEFAULT_TYPE, state: Optional[str]) -> Optional[Callable]:
+        """Find the handler for an update in a state."""
+        query = update.callback_query
+        if query is not None:
+            return self.bot.button_callback_manager.get_callback_for_data(query.data or '')
+
+        message = update.message
+        if message is None:
+            return None
+        if message.document is not None:
+            return self.state_inputs.get((state, INPUT_DOCUMENT))
+        text = message.text
+        if text is None:
+            return None
+        if text.startswith('/'):
+            words = text.split()
+            context.args = words[1:]
+            return self.commands.get(words[0][1:].split('@')[0].lower())
+        return self.state_inputs.get((state, INPUT_TEXT)) or self.texts.get(text)
+
+    async def dispatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle a message or button press according to the user's state.
+
+        Args:
+            update: The update object from Telegram.
+            context: The context object from Telegram.
+        """
+        user = update.effective_user
+        if user is None:
+            return
+        state, expired = self.bot.session_store.get_state(user.id)
+        if expired:
+            logger.info(f"User {user.username} (ID: {user.id}): conversation in {state} timed out")
+            self._transition(user.id, state, None, timed_out=True)
+            state = None
+
+        callback = self._select(update, context, state)
+        if callback is None:
+            logger.debug(f"User {user.username} (ID: {user.id}): no handler in state {state or STATE_IDLE}")
+            return
+
+        result = await callback(update, context)
+        if result == STATE_END:
+            if state is not None:
+                self._transition(user.id, state, None)
+        elif isinstance(result, str):
+            self._transition(user.id, state, result)
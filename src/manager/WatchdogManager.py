@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from src.constant.constant import (
+    LOOP_LAG_INTERVAL,
+    LOOP_LAG_THRESHOLD,
+    LOOP_STALL_LIMIT,
+    STATS_TOP_TITLES,
+)
+
+if TYPE_CHECKING:
+    from src.bot.telegram_bot import TelegramBot
+
+logger = logging.getLogger("tg_bot")
+
+class WatchdogManager:
+    """Measure event loop lag and report health over a local HTTP port.
+
+    A task on the event loop records a heartbeat every LOOP_LAG_INTERVAL.
+    A thread outside the loop checks the heartbeat, so a handler blocking the
+    loop is noticed while it still blocks, and the stack of the loop thread
+    at that moment is logged. /healthz and /readyz are served from another
+    thread, so they answer even when the loop is stuck.
+    """
+
+    def __init__(self, bots: List[TelegramBot], port: Optional[int]):
+        self.bots = bots
+        self.port = port
+        self.loop_thread_id: Optional[int] = None
+        self.heartbeat = time.monotonic()
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        # Figures of the worker processes when the bots run in them, reported
+        # by the front process; safe to call from any thread
+        self.shard_status: Optional[Callable[[], Dict]] = None
+
+    async def start(self) -> None:
+        """Start measuring; runs on the event loop shared by the bots."""
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+        if self.port:
+            self._server = ThreadingHTTPServer(('127.0.0.1', self.port), self._make_request_handler())
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="health-server", daemon=True).start()
+            logger.info(f"Serving /healthz and /readyz on http://127.0.0.1:{self.port}")
+
+    def stop(self) -> None:
+        """Stop measuring and close the health server."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    async def _measure(self) -> None:
+        """Record a heartbeat and the lag of every wake-up."""
+        while True:
+            start = time.monotonic()
+            self.heartbeat = start
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.lag = max(0.0, time.monotonic() - start - LOOP_LAG_INTERVAL)
+            self.max_lag = max(self.max_lag, self.lag)
+            if self.lag > LOOP_LAG_THRESHOLD:
+                logger.warning(f"Event loop lag {self.lag * 1000:.0f} ms")
+
+    def _watch(self) -> None:
+        """Log the stack of the loop thread once per stall."""
+        reported = None
+        while not self._stopped.wait(LOOP_LAG_INTERVAL):
+            heartbeat = self.heartbeat
+            stalled_for = time.monotonic() - heartbeat - LOOP_LAG_INTERVAL
+            if stalled_for <= LOOP_LAG_THRESHOLD or reported == heartbeat:
+                continue
+            reported = heartbeat
+            self.stalls += 1
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = ''.join(traceback.format_stack(frame)) if frame is not None else 'unavailable\n'
+            logger.warning(f"Event loop blocked for {stalled_for * 1000:.0f} ms, loop thread stack:\n{stack.rstrip()}")
+
+    def get_status(self) -> Dict:
+        """
+        Get the health figures; safe to call from any thread.
+
+        Returns:
+            Dictionary with loop lag figures in seconds, the total update
+            backlog, and the updates, dropped duplicates, backlog, queued anime
+            changes, collection statistics, conversation state transitions and
+            session storage state of every bot, plus the worker processes when
+            the bots run in them
+        """
+        bots = {}
+        for bot in self.bots:
+            application = bot.application
+            bots[bot.name or 'default'] = {
+                'updates': bot.update_count,
+                'duplicates': bot.seen_updates.duplicates,
+                'update_backlog': application.update_queue.qsize() if application is not None else 0,
+                'change_events': bot.anime_manager.events.get_status(),
+                'stats': bot.anime_manager.peek_stats(STATS_TOP_TITLES),
+                'transitions': bot.state_machine_manager.get_transition_counts(),
+                'running': application is not None and application.running,
+                'storage': {
+                    'dirty': bot.session_store.dirty,
+                    'last_flush': bot.session_store.last_flush,
+                    'error': bot.session_store.flush_error,
+                },
+            }
+        status = {
+            'loop_lag': round(self.lag, 4),
+            'max_loop_lag': round(self.max_lag, 4),
+            'stalled_for': round(max(0.0, time.monotonic() - self.heartbeat - LOOP_LAG_INTERVAL), 4),
+            'stalls': self.stalls,
+            'update_backlog': sum(status['update_backlog'] for status in bots.values()),
+            'bots': bots,
+        }
+        if self.shard_status is not None:
+            status['shards'] = self.shard_status()
+        return status
+
+    def check(self, path: str) -> Tuple[int, Dict]:
+        """
+        Answer a health check.
+
+        /healthz fails when the loop has been blocked for LOOP_STALL_LIMIT;
+        /readyz also fails until every bot polls, while lag is above
+        LOOP_LAG_THRESHOLD, after a failed session write of any bot and while
+        a worker process is down.
+
+        Args:
+            path: Requested path
+
+        Returns:
+            HTTP status and response body
+        """
+        status = self.get_status()
+        if path == '/healthz':
+            ok = status['stalled_for'] < LOOP_STALL_LIMIT
+        elif path == '/readyz':
+            ok = (
+                status['stalled_for'] <= LOOP_LAG_THRESHOLD
+                and status['loop_lag'] <= LOOP_LAG_THRESHOLD
+                and all(
+                    bot['running'] and bot['storage']['error'] is None
+                    for bot in status['bots'].values()
+                )
+                and ('shards' not in status or (
+                    status['shards']['polling']
+                    and all(worker['alive'] for worker in status['shards']['workers'])
+                ))
+            )
+        else:
+            return 404, {'error': 'not found'}
+        status['ok'] = ok
+        return (200 if ok else 503), status
+
+    def _make_request_handler(self) -> type:
+        """Create the request handler class of the health server."""
+        watchdog = self
+
+        class HealthRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                code, body = watchdog.check(self.path.split('?')[0])
+                raw = json.dumps(body).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug(f"Health check: {format % args}")
+
+        return HealthRequestHandler
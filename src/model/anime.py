@@ -1,15 +1,82 @@
 """Models for anime data management."""
 
-from dataclasses import dataclass
-from typing import Dict, Optional, List
-import json
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterator, Optional, List, MutableMapping, Set, Tuple
+import hashlib
+import logging
+import os
+import shutil
+import time
+import unicodedata
 
 from src.constant.constant import (
+    ANIME_CONFIG_FILE,
     DEFAULT_DESCRIPTION,
     DEFAULT_RATING,
     DEFAULT_STATUS,
-    DEFAULT_EPISODES
+    DEFAULT_EPISODES,
+    LIST_FILTER_ALL,
+    LIST_SORT_ADDED,
+    LEGACY_POSITIONS_FILE,
+    STATUS_WATCHING,
+    WARM_START_FILE,
+    WORKER_WRITE_LOCK_TIMEOUT,
 )
+from src.model.anime_order import AnimeOrder
+from src.model.change_events import (
+    AnimeAdded,
+    AnimeMoved,
+    AnimeRemoved,
+    AnimeUpdated,
+    ChangeEvent,
+    ChangeEventBus,
+)
+from src.model.collection_stats import CollectionStats
+from src.model.list_view_index import ListViewIndex
+from src.model.prefix_index import PrefixIndex
+from src.model.search_index import TrigramIndex
+from src.model.serializer import (
+    FORMAT_JSON,
+    file_signature,
+    get_serializer,
+    load_config,
+    dump_config,
+)
+from src.model.warm_start import WarmStart, save_warm_start
+from src.model.watching_index import WatchingIndex
+
+logger = logging.getLogger("tg_bot")
+
+# Indexes kept in the warm-start file, loaded on first use instead of rebuilt
+WARM_INDEXES = ('search_index', 'prefix_index', 'list_view_index', 'stats')
+
+# Subscriber writing the config file after each change
+CONFIG_SUBSCRIBER = 'config_file'
+
+# Indexes built from more than the names of the animes
+DETAIL_INDEXES = ('search_index', 'list_view_index', 'stats', 'watching_index')
+
+# Indexes derived from names start here. Smaller indexes in callback data
+# come from buttons sent when indexes were list positions.
+NAME_INDEX_BASE = 1 << 47
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize an anime name for duplicate detection.
+
+    "Frieren", "frieren " and full-width "Ｆｒｉｅｒｅｎ" all normalize to the
+    same key.
+
+    Args:
+        name: Anime name
+
+    Returns:
+        NFKC-normalized, case-folded name with collapsed whitespace
+    """
+    return ' '.join(unicodedata.normalize('NFKC', name).casefold().split())
 
 @dataclass
 class AnimeDetails:
@@ -59,38 +126,429 @@ class AnimeDetails:
 class AnimeDetailsManager:
     """Class to manage a collection of anime details."""
     
-    def __init__(self):
-        """Initialize the AnimeDetailsManager with a specified config."""
-        self.config = 'anime_config.json'
-        self.anime_list: List[str] = []
-        self.anime_details: Dict[str, AnimeDetails] = {}
+    def __init__(self, columnar: bool = False, config_format: str = FORMAT_JSON, lazy: bool = False,
+                 path: str = ANIME_CONFIG_FILE):
+        """
+        Initialize the AnimeDetailsManager with a specified config.
+
+        Args:
+            columnar: Keep anime details in a ColumnarAnimeStore instead of
+                one AnimeDetails object per anime
+            config_format: Format used when writing the config; loading
+                auto-detects the format of the existing file
+            lazy: Index the memory-mapped config and decode entries on first
+                access instead of loading everything up front
+            path: Path of the config file
+
+        Raises:
+            ValueError: If both columnar and lazy are requested
+            Exception: If the config file exists but cannot be loaded
+        """
+        if columnar and lazy:
+            raise ValueError("columnar and lazy anime stores cannot be combined")
+        self.config = path
+        self.columnar = columnar
+        self.lazy = lazy
+        self.serializer = get_serializer(config_format)
+        # Indexes are derived from names, so they stay the same when other
+        # animes are deleted or moved and across restarts
+        self.anime_order = AnimeOrder()
+        self.anime_index: Dict[str, int] = {}
+        self.anime_names: Dict[int, str] = {}
+        # List order when indexes stopped being positions, to resolve the
+        # indexes of old buttons; frozen on the first run and kept in a file
+        self.legacy_names: List[str] = []
+        self.legacy_positions_path = os.path.join(os.path.dirname(path), LEGACY_POSITIONS_FILE)
+        # Normalized name -> name, for duplicate detection
+        self.normalized_names: Dict[str, str] = {}
+        self.anime_details: MutableMapping[str, AnimeDetails] = {}
+        # Built on first use, then kept current by the change events
+        self.search_index: Optional[TrigramIndex] = None
+        self.prefix_index: Optional[PrefixIndex] = None
+        self.list_view_index: Optional[ListViewIndex] = None
+        self.stats: Optional[CollectionStats] = None
+        self.watching_index: Optional[WatchingIndex] = None
+        # Incremented on every change, for caches of derived results
+        self.version = 0
+        # Changes, delivered to the config file at the end of each change
+        # and to the indexes in batches or before they are read
+        self.events = ChangeEventBus()
+        self.events.subscribe(CONFIG_SUBSCRIBER, self._write_changes)
+        # Signature of the config as last read or written, to notice edits
+        # made by someone else
+        self.config_signature: Optional[Tuple[int, int, int]] = None
+        # Signature of an edited config that failed to load
+        self.rejected_signature: Optional[Tuple[int, int, int]] = None
+        # Lock shared with other processes writing the same config, held
+        # from merging their edits until a change is written
+        self.write_lock: Optional[Any] = None
+        # Indexes saved by the last run for this config, until the first change
+        self.warm_start: Optional[WarmStart] = None
+        # Indexes taken from the warm-start file rather than built
+        self.warm_loaded: Set[str] = set()
+        self.warm_start_path = os.path.join(os.path.dirname(path), WARM_START_FILE)
+        if columnar:
+            from src.model.columnar_store import ColumnarAnimeStore
+            self.anime_details = ColumnarAnimeStore()
+        elif lazy:
+            from src.model.lazy_store import LazyAnimeStore
+            self.anime_details = LazyAnimeStore(self.config)
         try:
             self.load_anime_list_from_config()
-        except Exception as e:
-            pass
+        except FileNotFoundError:
+            logger.info(f"{self.config} not found, starting with an empty anime list")
+        except Exception:
+            # Never fall back to an empty list here: the next write would
+            # overwrite the existing file with it.
+            logger.error(f"Failed to load anime list from {self.config}", exc_info=True)
+            raise
 
     def load_anime_list_from_config(self) -> None:
-        """Load the default anime list from the specified JSON file."""
-        with open(self.config, 'r') as file:
-            data = json.load(file)
-            for name, details in data.items():
-                self.anime_list.append(name)
-                self.anime_details[name] = AnimeDetails.from_dict(name, details)
+        """Load the default anime list from the config file."""
+        if self.lazy:
+            self.anime_details.load()
+            for name in self.anime_details:
+                self.normalized_names.setdefault(normalize_name(name), name)
+                self._register_name(name)
+            self._load_legacy_names()
+            self.config_signature = file_signature(self.config)
+            logger.info(f"Indexed {len(self.anime_index)} animes from {self.config}")
+            return
+        data = load_config(self.config)
+        for name, details in data.items():
+            self.normalized_names.setdefault(normalize_name(name), name)
+            self._register_name(name)
+            self.anime_details[name] = AnimeDetails.from_dict(name, details)
+        self._load_legacy_names()
+        self.config_signature = file_signature(self.config)
+
+    def _load_legacy_names(self) -> None:
+        """Read the frozen list order, freezing the loaded one if there is none yet."""
+        try:
+            self.legacy_names = load_config(self.legacy_positions_path).get('names', [])
+            return
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # Left as it is: the order it held cannot be recovered
+            logger.error(f"Failed to load {self.legacy_positions_path}, old buttons will not resolve", exc_info=True)
+            return
+        self.legacy_names = list(self.anime_index)
+        dump_config({'names': self.legacy_names}, self.legacy_positions_path, self.serializer)
+        logger.info(f"Froze the positions of {len(self.legacy_names)} animes in {self.legacy_positions_path}")
+
+    def reload_if_changed(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Apply edits made to the config file by someone else.
+
+        Only entries that differ from memory are added, updated or removed,
+        and the change events reach the indexes as for changes made through
+        the bot.
+        Every mutation calls this before changing anything, so an edit made
+        since the last write is merged first and never overwritten.
+
+        Returns:
+            Numbers of added, updated and removed animes, or None if the
+            file did not change
+
+        Raises:
+            Exception: If the changed file cannot be loaded; memory is left
+                untouched and that version of the file is not tried again
+        """
+        signature = file_signature(self.config)
+        if signature is None or signature in (self.config_signature, self.rejected_signature):
+            return None
+        fresh = None
+        try:
+            if self.lazy:
+                from src.model.lazy_store import LazyAnimeStore
+                fresh = LazyAnimeStore(self.config)
+                fresh.load()
+                names = list(fresh)
+                # Entries never decoded only need to point into the new file
+                raw_details = fresh.iter_raw_details(
+                    lambda name: name not in self.anime_index or self.anime_details.is_decoded(name)
+                )
+            else:
+                data = load_config(self.config)
+                names = list(data)
+                raw_details = data.items()
+            # Decode everything before touching memory
+            animes = [AnimeDetails.from_dict(name, details) for name, details in raw_details]
+        except Exception:
+            if fresh is not None:
+                fresh.close()
+            self.rejected_signature = signature
+            raise
+
+        if self.lazy:
+            # Indexes of the details read entries that were never decoded,
+            # possibly from a file edited in place since, so they are
+            # rebuilt from the new file on next use
+            for name in DETAIL_INDEXES:
+                self._drop_index(name)
+        present = set(names)
+        removed = [name for name in self.anime_index if name not in present]
+        for name in removed:
+            self._remove_anime_entry(name)
+        added = updated = 0
+        for anime in animes:
+            name = anime.name
+            if name not in self.anime_index:
+                self._insert_anime_entry(anime)
+                added += 1
+                continue
+            current = self.anime_details[name]
+            changes = {
+                key: value for key, value in anime.__dict__.items()
+                if value != getattr(current, key)
+            }
+            if changes:
+                self._update_anime_entry(name, **changes)
+                updated += 1
+
+        if list(self.iter_names()) != names:
+            self.anime_order = AnimeOrder()
+            for name in names:
+                self.anime_order.append(self.anime_index[name])
+            # Rebuilt on next use with the new order
+            self._drop_index('list_view_index')
+            self.version += 1
+        if fresh is not None:
+            self.anime_details.adopt(fresh)
+        # These changes come from the file, so they are not written back
+        self.events.skip(CONFIG_SUBSCRIBER)
+        self.config_signature = signature
+        logger.info(f"Reloaded {self.config}: {added} added, {updated} updated, {len(removed)} removed")
+        return added, updated, len(removed)
+
+    def load_warm_start(self) -> bool:
+        """
+        Use the indexes saved by the last run if they match the loaded config.
+
+        The list order is restored right away, so saved list views agree
+        with it; the other indexes are read on first use, as long as nothing
+        changed since startup.
+
+        Returns:
+            True if the warm-start file matches the config
+        """
+        if self.version != 0:
+            return False
+        warm_start = WarmStart.open(self.warm_start_path, self.config_signature)
+        if warm_start is None:
+            return False
+        anime_order = warm_start.load('anime_order')
+        if anime_order is None or list(anime_order) != list(self.anime_order):
+            logger.info(f"Ignoring {self.warm_start_path}, it does not match the list order")
+            return False
+        self.anime_order = anime_order
+        self.warm_start = warm_start
+        logger.info(f"Indexes of {self.config} will be loaded from {self.warm_start_path}")
+        return True
+
+    def _load_warm_index(self, name: str) -> Optional[Any]:
+        """
+        Take an index from the warm-start file instead of building it.
+
+        Args:
+            name: Attribute name of the index
+
+        Returns:
+            The index, or None if it has to be built
+        """
+        if self.warm_start is None:
+            return None
+        if self.version != 0:
+            # Saved before changes this index would have missed
+            self.warm_start = None
+            return None
+        index = self.warm_start.load(name)
+        if index is not None:
+            self.warm_loaded.add(name)
+            logger.info(f"Loaded {name} from {self.warm_start_path}")
+        return index
+
+    def save_warm_start(self) -> None:
+        """
+        Save the list order and the built indexes for the next start.
+
+        Nothing is written while an edit of the config is not merged yet, or
+        when the existing file is still complete because nothing changed or
+        was built since it was read.
+        """
+        signature = self.config_signature
+        if signature is None or signature != file_signature(self.config):
+            return
+        self.deliver_events()
+        unchanged = self.version == 0 and self.warm_start is not None
+        built = [
+            name for name in WARM_INDEXES
+            if getattr(self, name) is not None and name not in self.warm_loaded
+        ]
+        if unchanged and not built:
+            return
+        parts = {'anime_order': self.anime_order}
+        for name in WARM_INDEXES:
+            index = getattr(self, name)
+            if index is None and unchanged:
+                # Keep the parts this run did not use
+                index = self.warm_start.load(name)
+            if index is not None:
+                parts[name] = index
+        save_warm_start(self.warm_start_path, signature, parts)
+        logger.info(f"Saved {', '.join(parts)} to {self.warm_start_path}")
+
+    def _merge_external_changes(self) -> None:
+        """Apply edits made to the config file before changing the collection."""
+        try:
+            self.reload_if_changed()
+        except Exception:
+            logger.error(f"Failed to load the edited {self.config}", exc_info=True)
+        if self.rejected_signature is not None and self.rejected_signature == file_signature(self.config):
+            # The file is about to be replaced; keep the edit for the user
+            rejected = f"{self.config}.rejected"
+            shutil.copyfile(self.config, rejected)
+            self.rejected_signature = None
+            logger.warning(f"Replacing the edited {self.config} that failed to load, it is kept as {rejected}")
+
+    @contextmanager
+    def _changing(self) -> Iterator[None]:
+        """
+        Merge external edits and hold the write lock while the collection is
+        changed, then write the config if anything changed.
+        """
+        locked = self.write_lock is not None and self.write_lock.acquire(timeout=WORKER_WRITE_LOCK_TIMEOUT)
+        if self.write_lock is not None and not locked:
+            # The holder may have been killed while writing
+            logger.warning(f"Timed out waiting for the write lock of {self.config}, writing without it")
+        try:
+            self._merge_external_changes()
+            yield
+            self.events.deliver(CONFIG_SUBSCRIBER)
+        finally:
+            if locked:
+                self.write_lock.release()
+
+    def _register_name(self, name: str) -> int:
+        """
+        Give a name its stable index and append it to the list order.
+
+        Args:
+            name: Name of the anime
+
+        Returns:
+            Index of the anime
+        """
+        digest = hashlib.blake2b(name.encode('utf-8'), digest_size=6).digest()
+        index = NAME_INDEX_BASE | int.from_bytes(digest, 'big')
+        while index in self.anime_names:
+            index += 1
+        self.anime_index[name] = index
+        self.anime_names[index] = name
+        relabels = self.anime_order.relabels
+        self.anime_order.append(index)
+        if self.anime_order.relabels != relabels:
+            # The list views are keyed by the labels from before the compaction
+            self._drop_index('list_view_index')
+        return index
 
-    def add_anime(self, name: str) -> None:
+    def find_anime_name(self, name: str) -> Optional[str]:
+        """
+        Find the stored name of an anime, ignoring case, width and spacing.
+
+        Args:
+            name: Name to look up
+
+        Returns:
+            The name as stored if the anime exists, None otherwise
+        """
+        return self.normalized_names.get(normalize_name(name))
+
+    def add_anime(self, name: str) -> bool:
         """
         Add a new anime to the collection and update the file.
+
+        Args:
+            name: Name of the anime
+
+        Returns:
+            True if added, False if an anime with the same normalized name exists
+        """
+        with self._changing():
+            return self._add_anime_entry(AnimeDetails(name=name))
+
+    def add_animes(self, names: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Add several animes and update the file once.
+
+        Args:
+            names: Names of the animes
+
+        Returns:
+            Names that were added and names skipped as duplicates (of the
+            collection or of an earlier name in the batch)
+        """
+        return self.add_anime_details([AnimeDetails(name=name) for name in names])
+
+    def add_anime_details(self, animes: List[AnimeDetails]) -> Tuple[List[str], List[str]]:
+        """
+        Add several animes with their details and update the file once.
+
+        Args:
+            animes: Animes to add
+
+        Returns:
+            Names that were added and names skipped as duplicates (of the
+            collection or of an earlier anime in the batch)
+        """
+        added, skipped = [], []
+        with self._changing():
+            for anime in animes:
+                (added if self._add_anime_entry(anime) else skipped).append(anime.name)
+        return added, skipped
+
+    def _add_anime_entry(self, anime: AnimeDetails) -> bool:
+        """
+        Add a new anime to the collection without writing the file.
+
+        Args:
+            anime: The anime
+
+        Returns:
+            True if added, False if an anime with the same normalized name exists
         """
-        if name not in self.anime_list:
-            self.anime_list.append(name)
-            self.anime_details[name] = AnimeDetails(name=name)
-            self.update_anime_config()
+        if normalize_name(anime.name) in self.normalized_names:
+            return False
+        self._insert_anime_entry(anime)
+        return True
+
+    def _insert_anime_entry(self, anime: AnimeDetails) -> None:
+        """
+        Add an anime to the collection, even if its normalized name is taken.
+
+        Args:
+            anime: The anime
+        """
+        name = anime.name
+        self.normalized_names.setdefault(normalize_name(name), name)
+        index = self._register_name(name)
+        self.anime_details[name] = anime
+        self.version += 1
+        # A copy, as a later update changes the stored details in place
+        self.events.publish(AnimeAdded(self.version, time.time(), index, self.anime_order.label(index), replace(anime)))
+
+    def _write_changes(self, events: List[ChangeEvent]) -> None:
+        """Write the config once for a batch of changes."""
+        self.update_anime_config()
 
     def update_anime_config(self) -> None:
-        """Update the anime list in the specified JSON file with full anime details."""
-        with open(self.config, 'w') as file:
-            json_data = {anime.name: anime.to_dict() for anime in self.anime_details.values()}
-            json.dump(json_data, file, indent=4)
+        """Update the anime list in the config file with full anime details."""
+        if self.lazy:
+            self.anime_details.save(self.serializer, self.iter_names())
+        else:
+            dump_config(self.to_dict(), self.config, self.serializer)
+        self.config_signature = file_signature(self.config)
 
     def get_anime(self, name: str) -> Optional[AnimeDetails]:
         """
@@ -108,14 +566,344 @@ class AnimeDetailsManager:
         """
         Update anime details and write the updated list to the file.
         """
-        if name not in self.anime_details:
-            return False
-        for key, value in kwargs.items():
-            if key in self.anime_details[name].__dict__:
-                setattr(self.anime_details[name], key, value)
-        self.update_anime_config()
+        with self._changing():
+            if name not in self.anime_details:
+                return False
+            self._update_anime_entry(name, **kwargs)
         return True
 
+    def increment_episodes(self, name: str, delta: int) -> Optional[int]:
+        """
+        Add to the episode count of an anime and update the file.
+
+        The count is read after edits of other processes are merged, under
+        the write lock, so concurrent increments are never lost.
+
+        Args:
+            name: Name of the anime
+            delta: Episodes to add, negative to subtract; the count stays
+                at 0 or above
+
+        Returns:
+            The new episode count, or None if the anime was not found
+        """
+        with self._changing():
+            if name not in self.anime_details:
+                return None
+            current = self.anime_details[name].episodes
+            episodes = max(current + delta, 0)
+            if episodes != current:
+                self._update_anime_entry(name, episodes=episodes)
+        return episodes
+
+    def _update_anime_entry(self, name: str, **kwargs) -> None:
+        """Update anime details without writing the file."""
+        anime = self.anime_details[name]
+        before = replace(anime)
+        fields = tuple(key for key in kwargs if key in anime.__dict__)
+        for key in fields:
+            setattr(anime, key, kwargs[key])
+        # Write back so columnar stores pick up the change
+        self.anime_details[name] = anime
+        index = self.anime_index[name]
+        self.version += 1
+        self.events.publish(AnimeUpdated(
+            self.version, time.time(), index, self.anime_order.label(index), before, replace(anime), fields
+        ))
+
+    def delete_anime(self, index: int) -> Optional[str]:
+        """
+        Delete an anime and write the updated list to the file.
+
+        The indexes of the other animes do not change.
+
+        Args:
+            index: Index of the anime
+
+        Returns:
+            Name of the deleted anime, or None if not found
+        """
+        with self._changing():
+            anime = self.get_anime_by_index(index)
+            if anime is None:
+                return None
+            self._remove_anime_entry(anime.name)
+        return anime.name
+
+    def _remove_anime_entry(self, name: str) -> None:
+        """Remove an anime from the collection without writing the file."""
+        # Only decoded when an index needs the details; entries of a lazy
+        # store may point into a file that was edited in place
+        needs_details = self.events.is_subscribed('list_view_index') or self.events.is_subscribed('stats')
+        anime = self._peek_anime(name) if needs_details else None
+        index = self.anime_index.pop(name)
+        del self.anime_names[index]
+        relabels = self.anime_order.relabels
+        label = self.anime_order.remove(index)
+        if self.anime_order.relabels != relabels:
+            # The list views are keyed by the labels from before the compaction
+            self._drop_index('list_view_index')
+        key = normalize_name(name)
+        if self.normalized_names.get(key) == name:
+            del self.normalized_names[key]
+        del self.anime_details[name]
+        self.version += 1
+        self.events.publish(AnimeRemoved(self.version, time.time(), index, label, name, anime))
+
+    def move_anime(self, index: int, offset: int) -> bool:
+        """
+        Move an anime one place up or down the list and update the file.
+
+        Args:
+            index: Index of the anime
+            offset: -1 to move up, 1 to move down
+
+        Returns:
+            True if moved, False if not found or already at that end of the list
+        """
+        with self._changing():
+            anime = self.get_anime_by_index(index)
+            if anime is None:
+                return False
+            index = self.anime_index[anime.name]
+            label = self.anime_order.label(index)
+            other = self.anime_order.swap(index, offset)
+            if other is None:
+                return False
+            # The two animes exchanged labels
+            other_label = self.anime_order.label(index)
+            other_anime = self._peek_anime(self.anime_names[other])
+            self.version += 1
+            self.events.publish(AnimeMoved(
+                self.version, time.time(), index, label, replace(anime), other, other_label, replace(other_anime)
+            ))
+        return True
+
+    def deliver_events(self) -> int:
+        """
+        Apply the queued changes to every built index.
+
+        Returns:
+            Number of events delivered
+        """
+        return self.events.deliver()
+
+    def prepare_indexes(self) -> None:
+        """
+        Load or build the indexes that are slow to build, before updates are handled.
+
+        Building them on first use would block the event loop for seconds
+        on large collections. Lazy stores skip this and keep their fast
+        startup; their indexes are built on first use.
+        """
+        if self.lazy:
+            return
+        start = time.monotonic()
+        self._get_index('search_index', self._build_search_index, self._apply_to_search_index)
+        self._get_index('list_view_index', self._build_list_view_index, self._apply_to_list_view_index)
+        self._get_index('stats', self._build_stats, self._apply_to_stats)
+        logger.info(f"Prepared the indexes of {self.config} in {time.monotonic() - start:.1f} s")
+
+    def _get_index(self, name: str, build: Callable[[], Any], consume: Callable[[List[ChangeEvent]], None]) -> Any:
+        """
+        Get an index with every change applied, loading or building it on first use.
+
+        Args:
+            name: Attribute name of the index
+            build: Builds the index from the current collection
+            consume: Applies a batch of change events to the index
+
+        Returns:
+            The index
+        """
+        if getattr(self, name) is not None:
+            # An index whose consumer fails is dropped and built again below
+            self.events.deliver(name)
+        index = getattr(self, name)
+        if index is not None:
+            return index
+        if name in WARM_INDEXES:
+            index = self._load_warm_index(name)
+        if index is None:
+            index = build()
+        setattr(self, name, index)
+        self.events.subscribe(name, consume, on_error=self._drop_index)
+        return index
+
+    def _drop_index(self, name: str) -> None:
+        """
+        Forget an index, so it is built again on next use.
+
+        Args:
+            name: Attribute name of the index
+        """
+        setattr(self, name, None)
+        self.events.unsubscribe(name)
+
+    def _build_search_index(self) -> TrigramIndex:
+        """Build the search index of the collection."""
+        search_index = TrigramIndex()
+        for name in self.iter_names():
+            search_index.add(name, self._peek_anime(name).description)
+        return search_index
+
+    def _apply_to_search_index(self, events: List[ChangeEvent]) -> None:
+        """Apply change events to the search index."""
+        for event in events:
+            if isinstance(event, AnimeAdded):
+                self.search_index.add(event.anime.name, event.anime.description)
+            elif isinstance(event, AnimeUpdated) and 'description' in event.fields:
+                self.search_index.update(event.after.name, event.after.description)
+            elif isinstance(event, AnimeRemoved):
+                self.search_index.remove(event.name)
+
+    def _build_prefix_index(self) -> PrefixIndex:
+        """Build the prefix index of the collection."""
+        return PrefixIndex.build(self.iter_names())
+
+    def _apply_to_prefix_index(self, events: List[ChangeEvent]) -> None:
+        """Apply change events to the prefix index."""
+        for event in events:
+            if isinstance(event, AnimeAdded):
+                self.prefix_index.add(event.anime.name)
+            elif isinstance(event, AnimeRemoved):
+                self.prefix_index.remove(event.name)
+
+    def _build_list_view_index(self) -> ListViewIndex:
+        """Build the list view index of the collection."""
+        return ListViewIndex.build(
+            (index, self.anime_order.label(index), self._peek_anime(self.anime_names[index]))
+            for index in self.anime_order
+        )
+
+    def _apply_to_list_view_index(self, events: List[ChangeEvent]) -> None:
+        """Apply change events to the list view index."""
+        for event in events:
+            if isinstance(event, AnimeAdded):
+                self.list_view_index.add(event.index, event.label, event.anime)
+            elif isinstance(event, AnimeUpdated):
+                self.list_view_index.update(event.index, event.label, event.before, event.after)
+            elif isinstance(event, AnimeRemoved):
+                self.list_view_index.remove(event.index, event.label, event.anime)
+            elif isinstance(event, AnimeMoved):
+                self.list_view_index.remove(event.index, event.label, event.anime)
+                self.list_view_index.remove(event.other, event.other_label, event.other_anime)
+                self.list_view_index.add(event.index, event.other_label, event.anime)
+                self.list_view_index.add(event.other, event.label, event.other_anime)
+
+    def _build_stats(self) -> CollectionStats:
+        """Compute the statistics of the collection."""
+        return CollectionStats.build(self._peek_anime(name) for name in self.iter_names())
+
+    def _apply_to_stats(self, events: List[ChangeEvent]) -> None:
+        """Apply change events to the statistics."""
+        for event in events:
+            if isinstance(event, AnimeAdded):
+                self.stats.add(event.anime)
+            elif isinstance(event, AnimeUpdated):
+                self.stats.update(event.before, event.after)
+            elif isinstance(event, AnimeRemoved):
+                self.stats.remove(event.anime)
+
+    def _apply_to_watching_index(self, events: List[ChangeEvent]) -> None:
+        """Apply change events to the watching index, at the time each change was made."""
+        for event in events:
+            if isinstance(event, AnimeAdded):
+                self.watching_index.add(event.anime, event.time)
+            elif isinstance(event, AnimeUpdated):
+                self.watching_index.update(event.after, event.time)
+            elif isinstance(event, AnimeRemoved):
+                self.watching_index.remove(event.name)
+
+    def search_animes(self, text: str) -> List[int]:
+        """
+        Search anime names and descriptions.
+
+        Args:
+            text: Search text
+
+        Returns:
+            Indexes of matching animes, best matches first
+        """
+        search_index = self._get_index('search_index', self._build_search_index, self._apply_to_search_index)
+        return [self.anime_index[name] for name in search_index.search(text)]
+
+    def get_list_view(self, status: str, sort: str, page: int, page_size: int) -> Tuple[List[int], int]:
+        """
+        Get one page of the anime list, filtered by status and sorted.
+
+        Args:
+            status: Status to filter by, or LIST_FILTER_ALL
+            sort: One of the LIST_SORT_* keys
+            page: Page number, starting at 0
+            page_size: Animes per page
+
+        Returns:
+            Indexes of the animes on the page and the number of animes in the view
+        """
+        start = page * page_size
+        if status == LIST_FILTER_ALL and sort == LIST_SORT_ADDED:
+            return self.anime_order.page(start, start + page_size), len(self.anime_order)
+        list_view_index = self._get_index('list_view_index', self._build_list_view_index, self._apply_to_list_view_index)
+        return (
+            list_view_index.get_page(status, sort, start, start + page_size),
+            list_view_index.count(status),
+        )
+
+    def search_animes_by_prefix(self, prefix: str, limit: int) -> List[int]:
+        """
+        Find animes with a word in their name starting with the prefix.
+
+        Args:
+            prefix: Prefix to look up, case-insensitive
+            limit: Maximum number of results
+
+        Returns:
+            Indexes of matching animes
+        """
+        prefix_index = self._get_index('prefix_index', self._build_prefix_index, self._apply_to_prefix_index)
+        return [self.anime_index[name] for name in prefix_index.search(prefix, limit)]
+
+    def get_anime_count(self) -> int:
+        """
+        Get the number of animes in the collection.
+
+        Returns:
+            Number of animes
+        """
+        return len(self.anime_order)
+
+    def _peek_anime(self, name: str) -> AnimeDetails:
+        """Get anime details for reading; a lazy store does not keep them decoded."""
+        if self.lazy:
+            return self.anime_details.peek(name)
+        return self.anime_details[name]
+
+    def _iter_stored_animes(self) -> Iterator[AnimeDetails]:
+        """Iterate over anime details in store order, for reading only."""
+        for name in self.anime_details:
+            yield self._peek_anime(name)
+
+    def iter_names(self) -> Iterator[str]:
+        """
+        Iterate over anime names in list order.
+
+        Returns:
+            Iterator of names
+        """
+        for index in self.anime_order:
+            yield self.anime_names[index]
+
+    def iter_animes(self) -> Iterator[AnimeDetails]:
+        """
+        Iterate over all anime details in list order, one at a time.
+
+        Returns:
+            Iterator of AnimeDetails instances
+        """
+        for name in self.iter_names():
+            yield self._peek_anime(name)
+
     def get_all_animes(self) -> List[AnimeDetails]:
         """
         Get list of all anime details.
@@ -123,31 +911,148 @@ class AnimeDetailsManager:
         Returns:
             List of all AnimeDetails instances
         """
-        return [self.anime_details[name] for name in self.anime_list]
+        return list(self.iter_animes())
+
+    def get_anime_index(self, name: str) -> Optional[int]:
+        """
+        Get the index of an anime by name.
+
+        Args:
+            name: Name of the anime
+
+        Returns:
+            Stable index of the anime if found, None otherwise
+        """
+        return self.anime_index.get(name)
+
+    def get_anime_position(self, name: str) -> Optional[int]:
+        """
+        Get the position of an anime in the list order.
+
+        Args:
+            name: Name of the anime
+
+        Returns:
+            Position starting at 0 if found, None otherwise
+        """
+        index = self.anime_index.get(name)
+        return None if index is None else self.anime_order.position(index)
 
     def get_anime_by_index(self, index: int) -> Optional[AnimeDetails]:
         """
         Get anime details by index.
         
         Args:
-            index: Index in the anime list
+            index: Stable index of the anime, or a list position at startup
+                from a button sent before indexes were stable
             
         Returns:
             AnimeDetails if found, None otherwise
         """
-        if 0 <= index < len(self.anime_list):
-            name = self.anime_list[index]
-            return self.anime_details[name]
-        return None
+        if index < NAME_INDEX_BASE:
+            if not 0 <= index < len(self.legacy_names):
+                return None
+            name = self.legacy_names[index]
+        else:
+            name = self.anime_names.get(index)
+        if name is None or name not in self.anime_index:
+            return None
+        return self.anime_details[name]
+
+    def count_by_status(self) -> Dict[str, int]:
+        """
+        Count animes per status.
+
+        Returns:
+            Dictionary of status to number of animes
+        """
+        if self.columnar:
+            return self.anime_details.count_by_status()
+        return dict(Counter(anime.status for anime in self._iter_stored_animes()))
+
+    def average_rating(self) -> float:
+        """
+        Get the average rating over rated animes.
+
+        Returns:
+            Average rating, or 0.0 if no anime is rated
+        """
+        if self.columnar:
+            return self.anime_details.average_rating()
+        ratings = [float(anime.rating) for anime in self._iter_stored_animes() if anime.rating]
+        return sum(ratings) / len(ratings) if ratings else 0.0
+
+    def get_stats(self, top: int) -> Dict:
+        """
+        Get a snapshot of the collection statistics.
+
+        The statistics are computed once and then kept current by the change
+        events, so this does not depend on the collection size.
+
+        Args:
+            top: Number of most-watched titles to include
+
+        Returns:
+            Dictionary with total, status_counts, average_rating,
+            rated_count, total_episodes and most_watched
+        """
+        return self._get_index('stats', self._build_stats, self._apply_to_stats).snapshot(top)
+
+    def peek_stats(self, top: int) -> Optional[Dict]:
+        """
+        Get the statistics as of the last delivered changes; safe to call from any thread.
+
+        Args:
+            top: Number of most-watched titles to include
+
+        Returns:
+            Dictionary as returned by get_stats(), or None if the
+            statistics were not built yet
+        """
+        stats = self.stats
+        return stats.snapshot(top) if stats is not None else None
+
+    def get_watching_index(self, touched: Optional[Dict[str, float]] = None) -> WatchingIndex:
+        """
+        Get the index of watching titles, building it on first use.
+
+        Args:
+            touched: Times titles were last changed, used when building
+
+        Returns:
+            The index, kept current by the change events
+        """
+        def build() -> WatchingIndex:
+            watching_index = WatchingIndex(touched)
+            now = time.time()
+            for anime in self.get_animes_by_status(STATUS_WATCHING):
+                watching_index.add(anime, now)
+            return watching_index
+
+        return self._get_index('watching_index', build, self._apply_to_watching_index)
+
+    def get_animes_by_status(self, status: str) -> List[AnimeDetails]:
+        """
+        Get all animes with the given status.
+
+        Args:
+            status: Status to filter by
+
+        Returns:
+            List of matching AnimeDetails instances
+        """
+        if self.columnar:
+            return [self.anime_details[name] for name in self.anime_details.names_with_status(status)]
+        return [anime for anime in self._iter_stored_animes() if anime.status == status]
 
     def to_dict(self) -> Dict:
         """
         Convert all anime details to dictionary format.
         
         Returns:
-            Dictionary containing all anime details
+            Dictionary containing all anime details, in list order
         """
-        return {name: details.to_dict() for name, details in self.anime_details.items()}
+        return {name: self._peek_anime(name).to_dict() for name in self.iter_names()}
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'AnimeDetailsManager':
@@ -162,6 +1067,7 @@ class AnimeDetailsManager:
         """
         manager = cls()
         for name in data:
-            manager.anime_list.append(name)
+            manager.normalized_names.setdefault(normalize_name(name), name)
+            manager._register_name(name)
             manager.anime_details[name] = AnimeDetails.from_dict(name, data[name])
         return manager
@@ -0,0 +1,187 @@
+"""Order of the anime list, with stable indexes for callbacks."""
+
+from typing import Dict, Iterator, List, Optional
+
+# Label slots of an empty order; doubled when the labels run out while at
+# least half of them are in use
+_INITIAL_CAPACITY = 64
+
+
+class AnimeOrder:
+    """
+    Ordered collection of anime indexes.
+
+    Every index holds an integer label, and labels sort in list order. A
+    Fenwick tree counts the labels in use, so the position of a label, the
+    label at a position and removing a label are O(log n). Moving an anime
+    one step swaps its label with its neighbour's, and removing one frees a
+    single label, so neither shifts the other indexes.
+
+    Freed labels are not handed out again until the order is compacted:
+    once more than half of the label slots are freed, or when the labels
+    run out, the indexes get the labels 0..n-1 in list order again. Labels
+    kept elsewhere are stale after that; relabels counts the compactions
+    that changed any label.
+    """
+
+    def __init__(self):
+        """Initialize an empty order."""
+        self._index_by_label: Dict[int, int] = {}
+        self._label_by_index: Dict[int, int] = {}
+        self._next_label = 0
+        # 1-based Fenwick tree over the label slots, 1 per label in use
+        self._tree: List[int] = [0] * (_INITIAL_CAPACITY + 1)
+        self.relabels = 0
+
+    def _add(self, label: int, delta: int) -> None:
+        """Add delta to the count of a label slot."""
+        i = label + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_below(self, label: int) -> int:
+        """Count the labels in use that are smaller than a label."""
+        count = 0
+        i = label
+        while i:
+            count += self._tree[i]
+            i -= i & -i
+        return count
+
+    def _label_at(self, pos: int) -> int:
+        """Find the label at a position by descending the tree."""
+        label = 0
+        step = len(self._tree) - 1
+        while step:
+            if label + step < len(self._tree) and self._tree[label + step] <= pos:
+                label += step
+                pos -= self._tree[label]
+            step >>= 1
+        return label
+
+    def _compact(self, capacity: int) -> None:
+        """Give the indexes the labels 0..n-1 in list order and rebuild the tree in linear time."""
+        if self._next_label != len(self):
+            indexes = list(self)
+            self._index_by_label = dict(enumerate(indexes))
+            self._label_by_index = {index: label for label, index in enumerate(indexes)}
+            self._next_label = len(indexes)
+            self.relabels += 1
+        tree = [0] * (capacity + 1)
+        for label in range(1, self._next_label + 1):
+            tree[label] = 1
+        for i in range(1, capacity + 1):
+            parent = i + (i & -i)
+            if parent <= capacity:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def append(self, index: int) -> int:
+        """
+        Add an index at the end.
+
+        Args:
+            index: Index of the anime
+
+        Returns:
+            Label of the index
+        """
+        capacity = len(self._tree) - 1
+        if self._next_label >= capacity:
+            self._compact(capacity if len(self) < capacity // 2 else 2 * capacity)
+        label = self._next_label
+        self._next_label += 1
+        self._add(label, 1)
+        self._index_by_label[label] = index
+        self._label_by_index[index] = label
+        return label
+
+    def remove(self, index: int) -> int:
+        """
+        Remove an index.
+
+        Args:
+            index: Index of the anime
+
+        Returns:
+            Label the index had
+        """
+        label = self._label_by_index.pop(index)
+        del self._index_by_label[label]
+        self._add(label, -1)
+        capacity = len(self._tree) - 1
+        if self._next_label - len(self) > capacity // 2:
+            self._compact(capacity)
+        return label
+
+    def label(self, index: int) -> int:
+        """
+        Get the label of an index; labels sort in list order.
+
+        Args:
+            index: Index of the anime
+
+        Returns:
+            Label of the index
+        """
+        return self._label_by_index[index]
+
+    def position(self, index: int) -> int:
+        """
+        Get the position of an index in the list.
+
+        Args:
+            index: Index of the anime
+
+        Returns:
+            Position, starting at 0
+        """
+        return self._count_below(self._label_by_index[index])
+
+    def swap(self, index: int, offset: int) -> Optional[int]:
+        """
+        Swap an index with the one offset positions away.
+
+        Args:
+            index: Index of the anime
+            offset: -1 to move up, 1 to move down
+
+        Returns:
+            Index it was swapped with, or None at either end of the list
+        """
+        pos = self.position(index) + offset
+        if not 0 <= pos < len(self):
+            return None
+        label = self._label_by_index[index]
+        other_label = self._label_at(pos)
+        other = self._index_by_label[other_label]
+        self._index_by_label[label], self._index_by_label[other_label] = other, index
+        self._label_by_index[index], self._label_by_index[other] = other_label, label
+        return other
+
+    def page(self, start: int, stop: int) -> List[int]:
+        """
+        Get the indexes between two positions.
+
+        Args:
+            start: First position
+            stop: Position after the last one
+
+        Returns:
+            Indexes in list order
+        """
+        return [self._index_by_label[self._label_at(pos)] for pos in range(start, min(stop, len(self)))]
+
+    def __iter__(self) -> Iterator[int]:
+        # Freed labels are skipped until the next compaction
+        return (
+            self._index_by_label[label] for label in range(self._next_label)
+            if label in self._index_by_label
+        )
+
+    def __len__(self) -> int:
+        return len(self._label_by_index)
+
+    def __contains__(self, index: object) -> bool:
+        return index in self._label_by_index
@@ -0,0 +1,362 @@
+"""Memory-mapped catalog of known anime titles with their episode counts."""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import csv
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import struct
+import threading
+import time
+
+from src.constant.constant import (
+    CATALOG_INDEX_SUFFIX,
+    CATALOG_CHECK_INTERVAL,
+    CATALOG_BUILD_TIMEOUT,
+)
+from src.model.anime import normalize_name
+from src.model.serializer import write_atomic
+
+logger = logging.getLogger("tg_bot")
+
+CATALOG_MAGIC = b'ANICAT\x00\x01'
+# Magic, source mtime in ns, source size, number of keys, position of the records
+_HEADER = struct.Struct('<8sqqQQ')
+# Position of a key entry, one per key, in key order
+_OFFSET = struct.Struct('<Q')
+# After a key and its NUL byte: position of the record, 1 if the key is the whole title
+_KEY_TAIL = struct.Struct('<QB')
+# Episodes (0 if unknown), followed by the title and a NUL byte
+_RECORD = struct.Struct('<I')
+_MAX_EPISODES = 2 ** 32 - 1
+
+
+def _to_episodes(value) -> int:
+    """Parse an episode count of a dump, 0 if missing or invalid."""
+    try:
+        episodes = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return min(max(episodes, 0), _MAX_EPISODES)
+
+
+def read_catalog_source(path: str) -> Iterator[Tuple[str, int]]:
+    """
+    Read (title, episodes) pairs from a catalog dump.
+
+    CSV dumps need a title (or name) column and may have an episodes column.
+    JSON dumps are a list of objects with a title (or name) and episodes,
+    such an object holding the list under "data", or an object mapping
+    titles to episode counts.
+
+    Args:
+        path: Path of the dump
+
+    Returns:
+        Iterator of (title, episodes), episodes being 0 if unknown
+
+    Raises:
+        ValueError: If the dump is not in a supported layout
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            reader = csv.DictReader(file)
+            fields = reader.fieldnames or []
+            title_field = 'title' if 'title' in fields else 'name'
+            if title_field not in fields:
+                raise ValueError(f"{path}: CSV catalog needs a 'title' or 'name' column")
+            for row in reader:
+                yield row[title_field] or '', _to_episodes(row.get('episodes'))
+        return
+
+    with open(path, 'rb') as file:
+        data = json.load(file)
+    if isinstance(data, dict) and isinstance(data.get('data'), list):
+        data = data['data']
+    if isinstance(data, dict):
+        for title, value in data.items():
+            yield title, _to_episodes(value.get('episodes') if isinstance(value, dict) else value)
+    elif isinstance(data, list):
+        for entry in data:
+            if isinstance(entry, dict):
+                yield str(entry.get('title') or entry.get('name') or ''), _to_episodes(entry.get('episodes'))
+    else:
+        raise ValueError(f"{path}: expected a JSON list or object")
+
+
+def _source_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Get (mtime in ns, size) of a dump, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def build_catalog(source: str, index_path: str) -> int:
+    """
+    Build the index file of a catalog dump.
+
+    Every title gets a key per word it has, starting at that word, so a
+    title is found by the start of any of its words. Keys are sorted and
+    found by binary search on the mapped file.
+
+    Args:
+        source: Path of the dump
+        index_path: Path of the index file to write
+
+    Returns:
+        Number of titles indexed
+    """
+    signature = _source_signature(source)
+    if signature is None:
+        raise FileNotFoundError(source)
+    titles: Dict[str, Tuple[str, int]] = {}
+    for title, episodes in read_catalog_source(source):
+        title = ' '.join(title.replace('\0', ' ').split())
+        key = normalize_name(title)
+        # The first spelling is kept; a later one may only add the episodes
+        if key and (key not in titles or not titles[key][1]):
+            titles[key] = (titles[key][0] if key in titles else title, episodes)
+
+    records = bytearray()
+    entries = []
+    for key, (title, episodes) in titles.items():
+        position = len(records)
+        records += _RECORD.pack(episodes) + title.encode('utf-8') + b'\0'
+        for i in range(len(key)):
+            if i == 0 or key[i - 1] == ' ':
+                # Bytes of UTF-8 sort like the code points they encode
+                entries.append(key[i:].encode('utf-8') + b'\0' + _KEY_TAIL.pack(position, i == 0))
+    del titles
+    entries.sort()
+
+    table = bytearray()
+    position = _HEADER.size + _OFFSET.size * len(entries)
+    for entry in entries:
+        table += _OFFSET.pack(position)
+        position += len(entry)
+    header = _HEADER.pack(CATALOG_MAGIC, signature[0], signature[1], len(entries), position)
+    count = sum(1 for entry in entries if entry[-1])
+    write_atomic(index_path, [header, bytes(table), b''.join(entries), bytes(records)])
+    return count
+
+
+def _run_build(source: str, index_path: str) -> None:
+    """Entry point of the process building a catalog index."""
+    from src.log.logging_config import setup_root_logging, setup_logging
+
+    setup_root_logging()
+    setup_logging("tg_bot")
+    start = time.monotonic()
+    count = build_catalog(source, index_path)
+    logger.info(f"Indexed {count} catalog titles into {index_path} in {time.monotonic() - start:.1f} s")
+
+
+class Catalog:
+    """
+    Titles and episode counts of a catalog dump, looked up by word prefix.
+
+    Nothing is read until the first lookup. The index file next to the dump
+    is memory-mapped, so only the pages a lookup touches are loaded and
+    processes sharing the catalog share them. A missing or outdated index is
+    built in another process; lookups find nothing until it is ready.
+    """
+
+    def __init__(self, source: str):
+        """
+        Initialize a catalog for a dump.
+
+        Args:
+            source: Path of the dump
+        """
+        self.source = source
+        self.index_path = source + CATALOG_INDEX_SUFFIX
+        self._mm: Optional[mmap.mmap] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._count = 0
+        self._records = 0
+        self._checked: Optional[float] = None
+        self._builder: Optional[threading.Thread] = None
+        # Version of the dump that failed to index, not retried until it changes
+        self._failed: Optional[Tuple[int, int]] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether lookups can find titles."""
+        return self._ensure_index()
+
+    def _ensure_index(self) -> bool:
+        """Map the index, or start building it, at most every CATALOG_CHECK_INTERVAL."""
+        now = time.monotonic()
+        building = self._builder is not None and self._builder.is_alive()
+        if not building and (self._checked is None or now - self._checked >= CATALOG_CHECK_INTERVAL):
+            self._checked = now
+            signature = _source_signature(self.source)
+            if signature is None:
+                logger.warning(f"Catalog {self.source} not found")
+            elif signature not in (self._signature, self._failed) and not self._open(signature):
+                self._start_build(signature)
+        return self._mm is not None
+
+    def _open(self, signature: Tuple[int, int]) -> bool:
+        """Map the index file if it was built from this version of the dump."""
+        try:
+            with open(self.index_path, 'rb') as file:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return False
+        if len(mm) < _HEADER.size:
+            return False
+        magic, mtime_ns, size, count, records = _HEADER.unpack_from(mm)
+        if magic != CATALOG_MAGIC or (mtime_ns, size) != signature:
+            return False
+        # A replaced map stays valid until nothing refers to it anymore
+        self._mm, self._signature, self._count, self._records = mm, signature, count, records
+        logger.info(f"Catalog {self.source} ready, {count} keys")
+        return True
+
+    def _start_build(self, signature: Tuple[int, int]) -> None:
+        """Build the index in another process, unless another process already does."""
+        lock_path = self.index_path + '.lock'
+        try:
+            if time.time() - os.path.getmtime(lock_path) > CATALOG_BUILD_TIMEOUT:
+                os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            logger.info(f"Catalog {self.source} is being indexed by another process")
+            return
+        logger.info(f"Indexing catalog {self.source}")
+        self._builder = threading.Thread(target=self._build, args=(lock_path, signature), name="catalog-build", daemon=True)
+        self._builder.start()
+
+    def _build(self, lock_path: str, signature: Tuple[int, int]) -> None:
+        """Wait for the building process and check the index right after it."""
+        try:
+            process = multiprocessing.get_context('spawn').Process(
+                target=_run_build, args=(self.source, self.index_path), name="catalog-build"
+            )
+            process.start()
+            process.join(CATALOG_BUILD_TIMEOUT)
+            if process.is_alive():
+                logger.warning(f"Indexing {self.source} took over {CATALOG_BUILD_TIMEOUT} seconds, stopping it")
+                process.terminate()
+                self._failed = signature
+            elif process.exitcode:
+                logger.error(f"Indexing {self.source} failed with exit code {process.exitcode}")
+                self._failed = signature
+        finally:
+            os.remove(lock_path)
+            self._checked = None
+
+    def _key_at(self, i: int) -> Tuple[bytes, int]:
+        """Get the i-th key and the position of its tail."""
+        start = _OFFSET.unpack_from(self._mm, _HEADER.size + _OFFSET.size * i)[0]
+        end = self._mm.find(b'\0', start)
+        return self._mm[start:end], end + 1
+
+    def _bisect(self, key: bytes) -> int:
+        """Get the position of the first key not below key."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _record_at(self, position: int) -> Tuple[str, int]:
+        """Get the title and episodes of a record."""
+        start = self._records + position
+        episodes = _RECORD.unpack_from(self._mm, start)[0]
+        end = self._mm.find(b'\0', start + _RECORD.size)
+        return self._mm[start + _RECORD.size:end].decode('utf-8'), episodes
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """
+        Find titles with a word starting with the prefix.
+
+        Args:
+            prefix: Prefix to look up, case-insensitive
+            limit: Maximum number of titles to return
+
+        Returns:
+            (title, episodes) pairs ordered by the matching part of the
+            title, episodes being 0 if unknown; empty until the index is ready
+        """
+        key = normalize_name(prefix).encode('utf-8')
+        if not key or not self._ensure_index():
+            return []
+        results = {}
+        i = self._bisect(key)
+        while i < self._count and len(results) < limit:
+            entry_key, tail = self._key_at(i)
+            if not entry_key.startswith(key):
+                break
+            position = _KEY_TAIL.unpack_from(self._mm, tail)[0]
+            if position not in results:
+                results[position] = self._record_at(position)
+            i += 1
+        return list(results.values())
+
+    def lookup(self, name: str) -> Optional[Tuple[str, int]]:
+        """
+        Find the catalog entry of a title, ignoring case and spacing.
+
+        Args:
+            name: Title to look up
+
+        Returns:
+            (title as spelled in the catalog, episodes or 0 if unknown), or
+            None if the catalog has no such title or is not ready
+        """
+        key = normalize_name(name).encode('utf-8')
+        if not key or not self._ensure_index():
+            return None
+        i = self._bisect(key)
+        while i < self._count:
+            entry_key, tail = self._key_at(i)
+            if entry_key != key:
+                break
+            position, whole = _KEY_TAIL.unpack_from(self._mm, tail)
+            if whole:
+                return self._record_at(position)
+            i += 1
+        return None
+
+    def get_total_episodes(self, name: str) -> Optional[int]:
+        """
+        Get the number of episodes of a title.
+
+        Args:
+            name: Title to look up
+
+        Returns:
+            Episodes, or None if unknown
+        """
+        entry = self.lookup(name)
+        return entry[1] or None if entry is not None else None
+
+
+_catalogs: Dict[str, Catalog] = {}
+
+
+def get_catalog(source: str) -> Catalog:
+    """
+    Get the catalog of a dump, shared by every bot of the process.
+
+    Args:
+        source: Path of the dump
+
+    Returns:
+        Catalog
+    """
+    if source not in _catalogs:
+        _catalogs[source] = Catalog(source)
+    return _catalogs[source]
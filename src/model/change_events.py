@@ -0,0 +1,220 @@
+"""Change events of an anime collection and the bus delivering them to subscribers."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+import logging
+
+if TYPE_CHECKING:
+    from src.model.anime import AnimeDetails
+
+logger = logging.getLogger("tg_bot")
+
+
+@dataclass(frozen=True)
+class AnimeAdded:
+    """An anime was added at the end of the list."""
+    version: int
+    time: float
+    index: int
+    label: int
+    anime: 'AnimeDetails'
+
+
+@dataclass(frozen=True)
+class AnimeUpdated:
+    """Fields of an anime changed."""
+    version: int
+    time: float
+    index: int
+    label: int
+    before: 'AnimeDetails'
+    after: 'AnimeDetails'
+    fields: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class AnimeRemoved:
+    """An anime was removed; its details are None when no subscriber needed them."""
+    version: int
+    time: float
+    index: int
+    label: int
+    name: str
+    anime: Optional['AnimeDetails']
+
+
+@dataclass(frozen=True)
+class AnimeMoved:
+    """Two neighbouring animes exchanged their places in the list."""
+    version: int
+    time: float
+    index: int
+    label: int
+    anime: 'AnimeDetails'
+    other: int
+    other_label: int
+    other_anime: 'AnimeDetails'
+
+
+ChangeEvent = Union[AnimeAdded, AnimeUpdated, AnimeRemoved, AnimeMoved]
+
+
+class ChangeEventBus:
+    """
+    Queue of change events read by named subscribers at their own pace.
+
+    Publishing only appends to the queue. A subscriber receives everything
+    published since its last delivery as one batch, when deliver() is
+    called for it or for all subscribers, so derived views are updated off
+    the path of the change and several changes cost one call. A batch
+    counts as received once its consumer returns. Events are dropped once
+    every subscriber received them.
+    """
+
+    def __init__(self):
+        """Initialize a bus without subscribers."""
+        self._events: List[ChangeEvent] = []
+        # Number of events published before the first queued one
+        self._start = 0
+        # Subscriber name -> (consumer, number of events it received)
+        self._subscribers: Dict[str, Tuple[Callable[[List[ChangeEvent]], None], int]] = {}
+        # Subscriber name -> called with the name after its consumer failed
+        self._error_handlers: Dict[str, Callable[[str], None]] = {}
+
+    @property
+    def published(self) -> int:
+        """Number of events published so far."""
+        return self._start + len(self._events)
+
+    @property
+    def depth(self) -> int:
+        """Number of events not yet received by every subscriber."""
+        return len(self._events)
+
+    def subscribe(
+        self,
+        name: str,
+        consumer: Callable[[List[ChangeEvent]], None],
+        on_error: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Deliver the events published from now on to a consumer.
+
+        A consumer that raises keeps its batch queued, and the error is
+        raised to the caller of deliver(). With on_error, the error is
+        logged instead, the subscriber is unsubscribed and on_error is
+        called with its name, so it can drop the state it could not update.
+
+        Args:
+            name: Name of the subscriber
+            consumer: Called with each batch of events, oldest first
+            on_error: Called with the name after the consumer failed
+        """
+        self._subscribers[name] = (consumer, self.published)
+        if on_error is not None:
+            self._error_handlers[name] = on_error
+        else:
+            self._error_handlers.pop(name, None)
+
+    def unsubscribe(self, name: str) -> None:
+        """
+        Stop delivering events to a subscriber, dropping the ones it did not receive.
+
+        Args:
+            name: Name of the subscriber
+        """
+        self._error_handlers.pop(name, None)
+        if self._subscribers.pop(name, None) is not None:
+            self._trim()
+
+    def is_subscribed(self, name: str) -> bool:
+        """
+        Check whether a subscriber is registered.
+
+        Args:
+            name: Name of the subscriber
+
+        Returns:
+            True if it receives events
+        """
+        return name in self._subscribers
+
+    def publish(self, event: ChangeEvent) -> None:
+        """
+        Queue an event for every subscriber.
+
+        Args:
+            event: The event
+        """
+        if self._subscribers:
+            self._events.append(event)
+        else:
+            self._start += 1
+
+    def skip(self, name: str) -> None:
+        """
+        Mark the queued events as received by a subscriber without delivering them.
+
+        Args:
+            name: Name of the subscriber
+        """
+        if name in self._subscribers:
+            self._subscribers[name] = (self._subscribers[name][0], self.published)
+            self._trim()
+
+    def deliver(self, name: Optional[str] = None) -> int:
+        """
+        Deliver the queued events to one subscriber or to all of them.
+
+        Args:
+            name: Name of the subscriber, or None for all
+
+        Returns:
+            Number of events delivered
+        """
+        delivered = 0
+        for subscriber in ([name] if name is not None else list(self._subscribers)):
+            if subscriber not in self._subscribers:
+                continue
+            consumer, received = self._subscribers[subscriber]
+            batch = self._events[received - self._start:]
+            if not batch:
+                continue
+            try:
+                consumer(batch)
+            except Exception:
+                on_error = self._error_handlers.get(subscriber)
+                if on_error is None:
+                    self._trim()
+                    raise
+                logger.error(f"Change event subscriber {subscriber} failed, unsubscribing it", exc_info=True)
+                self.unsubscribe(subscriber)
+                on_error(subscriber)
+                continue
+            if subscriber in self._subscribers:
+                self._subscribers[subscriber] = (consumer, received + len(batch))
+            delivered += len(batch)
+        self._trim()
+        return delivered
+
+    def _trim(self) -> None:
+        """Drop the events every subscriber received."""
+        received = min((position for _, position in self._subscribers.values()), default=self.published)
+        if received > self._start:
+            del self._events[:received - self._start]
+            self._start = received
+
+    def get_status(self) -> Dict:
+        """
+        Get the queue figures; safe to call from any thread.
+
+        Returns:
+            Dictionary with the number of published and queued events and
+            the events waiting for each subscriber
+        """
+        published = self.published
+        return {
+            'published': published,
+            'queued': self.depth,
+            'pending': {name: published - position for name, (_, position) in list(self._subscribers.items())},
+        }
@@ -0,0 +1,136 @@
+"""Incrementally maintained statistics of an anime collection."""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from src.model.anime import AnimeDetails
+
+
+class CollectionStats:
+    """
+    Aggregates of a collection, updated with deltas on every change.
+
+    Reading the counts, averages and totals is O(1); the most-watched
+    titles are the head of a list kept sorted by episodes. The list is
+    sorted once when the statistics are built; later changes keep it sorted.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.total = 0
+        self.status_counts: Counter = Counter()
+        self.rating_sum = 0.0
+        self.rated_count = 0
+        self.total_episodes = 0
+        self._by_episodes: List[Tuple[int, str]] = []
+
+    @classmethod
+    def build(cls, animes: Iterable['AnimeDetails']) -> 'CollectionStats':
+        """
+        Compute the statistics of many animes with a single sort.
+
+        Args:
+            animes: Animes to count
+
+        Returns:
+            The statistics
+        """
+        stats = cls()
+        for anime in animes:
+            rating = float(anime.rating or 0)
+            stats.total += 1
+            stats.status_counts[anime.status] += 1
+            if rating:
+                stats.rating_sum += rating
+                stats.rated_count += 1
+            stats.total_episodes += anime.episodes
+            stats._by_episodes.append((-anime.episodes, anime.name))
+        stats._by_episodes.sort()
+        return stats
+
+    def add(self, anime: 'AnimeDetails') -> None:
+        """
+        Count an anime.
+
+        Args:
+            anime: The anime
+        """
+        rating = float(anime.rating or 0)
+        self.total += 1
+        self.status_counts[anime.status] += 1
+        if rating:
+            self.rating_sum += rating
+            self.rated_count += 1
+        self.total_episodes += anime.episodes
+        insort(self._by_episodes, (-anime.episodes, anime.name))
+
+    def remove(self, anime: 'AnimeDetails') -> None:
+        """
+        Stop counting an anime.
+
+        Args:
+            anime: The anime as it was counted
+        """
+        rating = float(anime.rating or 0)
+        self.total -= 1
+        self.status_counts[anime.status] -= 1
+        if not self.status_counts[anime.status]:
+            del self.status_counts[anime.status]
+        if rating:
+            self.rating_sum -= rating
+            self.rated_count -= 1
+        self.total_episodes -= anime.episodes
+        del self._by_episodes[bisect_left(self._by_episodes, (-anime.episodes, anime.name))]
+
+    def update(self, before: 'AnimeDetails', after: 'AnimeDetails') -> None:
+        """
+        Apply the change of an anime.
+
+        Args:
+            before: The anime before the change
+            after: The anime after the change
+        """
+        self.remove(before)
+        self.add(after)
+
+    def average_rating(self) -> float:
+        """
+        Average rating over rated animes.
+
+        Returns:
+            Average rating, or 0.0 if no anime is rated
+        """
+        return self.rating_sum / self.rated_count if self.rated_count else 0.0
+
+    def most_watched(self, limit: int) -> List[Tuple[str, int]]:
+        """
+        Titles with the most episodes watched.
+
+        Args:
+            limit: Maximum number of titles
+
+        Returns:
+            List of (name, episodes), most episodes first
+        """
+        return [(name, -episodes) for episodes, name in self._by_episodes[:limit] if episodes]
+
+    def snapshot(self, top: int) -> Dict:
+        """
+        Get all statistics as a plain dictionary.
+
+        Args:
+            top: Number of most-watched titles to include
+
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            'total': self.total,
+            'status_counts': dict(self.status_counts),
+            'average_rating': self.average_rating(),
+            'rated_count': self.rated_count,
+            'total_episodes': self.total_episodes,
+            'most_watched': self.most_watched(top),
+        }
@@ -0,0 +1,165 @@
+"""Columnar in-memory storage for large anime collections."""
+
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Dict, Iterator, List, MutableMapping
+import sys
+
+from src.constant.constant import (
+    DEFAULT_STATUS,
+    STATUS_WATCHING,
+    STATUS_COMPLETED,
+    STATUS_ON_HOLD,
+    STATUS_DROPPED,
+    STATUS_PLANNED,
+)
+from src.model.anime import AnimeDetails
+
+
+class ColumnarAnimeStore(MutableMapping[str, AnimeDetails]):
+    """
+    Mapping of anime name to AnimeDetails backed by parallel columns.
+
+    Episodes, ratings and status codes live in typed arrays and names are
+    interned, so a collection costs a few bytes per entry instead of one
+    Python object per anime. AnimeDetails instances are materialized on
+    access; assigning one back writes its fields into the columns.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._slots: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._descriptions: List[str] = []
+        self._ratings = array('d')
+        self._episodes = array('q')
+        self._status_codes = array('B')
+        self._status_table: List[str] = [
+            DEFAULT_STATUS,
+            STATUS_WATCHING,
+            STATUS_COMPLETED,
+            STATUS_ON_HOLD,
+            STATUS_DROPPED,
+            STATUS_PLANNED,
+        ]
+        self._status_lookup: Dict[str, int] = {
+            status: code for code, status in enumerate(self._status_table)
+        }
+
+    def _status_code(self, status: str) -> int:
+        """
+        Get the code of a status, registering unknown statuses on the fly.
+
+        Args:
+            status: Status string
+
+        Returns:
+            Code stored in the status column
+        """
+        code = self._status_lookup.get(status)
+        if code is None:
+            code = len(self._status_table)
+            self._status_table.append(status)
+            self._status_lookup[status] = code
+            if code >= 1 << (8 * self._status_codes.itemsize):
+                # One byte per anime covers the known statuses; a config
+                # with more distinct ones widens the column instead of
+                # overflowing it
+                self._status_codes = array('H' if self._status_codes.typecode == 'B' else 'I', self._status_codes)
+        return code
+
+    def __getitem__(self, name: str) -> AnimeDetails:
+        slot = self._slots[name]
+        return AnimeDetails(
+            name=self._names[slot],
+            description=self._descriptions[slot],
+            rating=self._ratings[slot],
+            status=self._status_table[self._status_codes[slot]],
+            episodes=self._episodes[slot],
+        )
+
+    def __setitem__(self, name: str, anime: AnimeDetails) -> None:
+        rating = float(anime.rating or 0)
+        episodes = int(anime.episodes)
+        status_code = self._status_code(anime.status)
+        slot = self._slots.get(name)
+        if slot is None:
+            name = sys.intern(name)
+            self._slots[name] = len(self._names)
+            self._names.append(name)
+            self._descriptions.append(anime.description)
+            self._ratings.append(rating)
+            self._episodes.append(episodes)
+            self._status_codes.append(status_code)
+            return
+        self._descriptions[slot] = anime.description
+        self._ratings[slot] = rating
+        self._episodes[slot] = episodes
+        self._status_codes[slot] = status_code
+
+    def __delitem__(self, name: str) -> None:
+        # Move the last entry into the freed slot so no other slot shifts
+        slot = self._slots.pop(name)
+        last = len(self._names) - 1
+        if slot != last:
+            last_name = self._names[last]
+            self._slots[last_name] = slot
+            self._names[slot] = last_name
+            self._descriptions[slot] = self._descriptions[last]
+            self._ratings[slot] = self._ratings[last]
+            self._episodes[slot] = self._episodes[last]
+            self._status_codes[slot] = self._status_codes[last]
+        self._names.pop()
+        self._descriptions.pop()
+        self._ratings.pop()
+        self._episodes.pop()
+        self._status_codes.pop()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def count_by_status(self) -> Dict[str, int]:
+        """
+        Count entries per status in a single pass over the status column.
+
+        Returns:
+            Dictionary of status to number of entries
+        """
+        return {
+            self._status_table[code]: count
+            for code, count in Counter(self._status_codes).items()
+        }
+
+    def average_rating(self) -> float:
+        """
+        Average rating over rated entries (a rating of 0 means not rated).
+
+        Returns:
+            Average rating, or 0.0 if nothing is rated
+        """
+        rated = len(self._ratings) - self._ratings.count(0.0)
+        if not rated:
+            return 0.0
+        return sum(self._ratings) / rated
+
+    def names_with_status(self, status: str) -> List[str]:
+        """
+        Get the names of all entries with the given status.
+
+        Args:
+            status: Status to filter by
+
+        Returns:
+            Names in storage order
+        """
+        code = self._status_lookup.get(status)
+        if code is None:
+            return []
+        return list(compress(self._names, map(code.__eq__, self._status_codes)))
@@ -0,0 +1,270 @@
+"""Lazily indexed, memory-mapped storage for large anime configs."""
+
+from typing import Callable, Dict, Iterable, Iterator, MutableMapping, Optional, Tuple
+import json
+import mmap
+import os
+import re
+import struct
+
+from src.model.anime import AnimeDetails
+from src.model.serializer import (
+    FORMAT_JSON,
+    FORMAT_MSGPACK,
+    ConfigSerializer,
+    MsgpackSerializer,
+    detect_format,
+    get_serializer,
+    msgpack,
+    write_atomic,
+)
+
+# One top-level `"name": {...}` pair. Values are flat objects, so a value
+# ends at the first closing brace outside of a string.
+_JSON_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_JSON_OPEN = re.compile(rb'\s*\{')
+_JSON_ENTRY = re.compile(
+    rb'\s*,?\s*(' + _JSON_STRING + rb')\s*:\s*(\{(?:[^{}"]+|' + _JSON_STRING + rb')*\})',
+    re.S,
+)
+_JSON_CLOSE = re.compile(rb'\s*,?\s*\}\s*\Z')
+
+
+class LazyAnimeStore(MutableMapping[str, AnimeDetails]):
+    """
+    Mapping of anime name to AnimeDetails backed by a memory-mapped config.
+
+    Loading only records the byte range of every entry. An AnimeDetails is
+    decoded the first time its name is accessed and kept afterwards, so
+    startup cost and memory do not depend on how many entries are never
+    opened. Passes over the whole collection use peek(), which decodes
+    without keeping, so only entries opened one by one stay in memory.
+    Both JSON configs and msgpack snapshots are supported.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize an empty store for a config path.
+
+        Args:
+            path: Path to the config file
+        """
+        self.path = path
+        self._mm: Optional[mmap.mmap] = None
+        self._format = FORMAT_JSON
+        # Name to byte range in the mapped file, or None for unsaved entries
+        self._ranges: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._loaded: Dict[str, AnimeDetails] = {}
+
+    def load(self) -> None:
+        """
+        Map the config file and index its entries.
+
+        Raises:
+            FileNotFoundError: If the config file does not exist
+            ValueError: If the config file is empty or malformed
+        """
+        self._mm = self._map()
+        self._format = detect_format(self._mm[:64])
+        if self._format == FORMAT_MSGPACK:
+            self._ranges = self._index_msgpack()
+        else:
+            self._ranges = self._index_json()
+        self._loaded.clear()
+
+    def _map(self) -> mmap.mmap:
+        """Map the config file for reading."""
+        with open(self.path, 'rb') as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _index_json(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        """Index a JSON config with one regex match per entry."""
+        mm = self._mm
+        match = _JSON_OPEN.match(mm)
+        if not match:
+            raise ValueError(f"{self.path}: expected a JSON object")
+        ranges = {}
+        pos = match.end()
+        while True:
+            match = _JSON_ENTRY.match(mm, pos)
+            if not match:
+                break
+            raw_name = match.group(1)
+            if b'\\' in raw_name:
+                name = json.loads(raw_name)
+            else:
+                name = raw_name[1:-1].decode('utf-8')
+            ranges[name] = match.span(2)
+            pos = match.end()
+        if not _JSON_CLOSE.match(mm, pos):
+            raise ValueError(f"{self.path}: malformed entry at byte {pos}")
+        return ranges
+
+    def _index_msgpack(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        """Index a msgpack snapshot by skipping over each value."""
+        if msgpack is None:
+            raise RuntimeError(f"{self.path} is a msgpack snapshot but msgpack is not installed")
+        self._mm.seek(0)
+        unpacker = msgpack.Unpacker(self._mm, raw=False)
+        ranges = {}
+        for _ in range(unpacker.read_map_header()):
+            name = unpacker.unpack()
+            start = unpacker.tell()
+            unpacker.skip()
+            ranges[name] = (start, unpacker.tell())
+        return ranges
+
+    def iter_raw_details(self, wanted: Optional[Callable[[str], bool]] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Decode every entry once, without keeping the decoded entries.
+
+        Args:
+            wanted: Only decode entries whose name it returns True for
+
+        Returns:
+            Iterator of (name, details dictionary) in file order
+        """
+        serializer = get_serializer(self._format)
+        for name, byte_range in self._ranges.items():
+            if wanted is not None and not wanted(name):
+                continue
+            if byte_range is None:
+                yield name, self._loaded[name].to_dict()
+            else:
+                yield name, serializer.loads(self._mm[byte_range[0]:byte_range[1]])
+
+    def is_decoded(self, name: str) -> bool:
+        """
+        Check whether an entry was accessed since the config was mapped.
+
+        Args:
+            name: Name of the anime
+
+        Returns:
+            True if the entry is held as an AnimeDetails
+        """
+        return name in self._loaded
+
+    def adopt(self, other: 'LazyAnimeStore') -> None:
+        """
+        Switch to the map of a store loaded from a newer version of the file.
+
+        Decoded entries are kept, so they must already match the new file;
+        the other store is left empty.
+
+        Args:
+            other: Store loaded from the same path
+        """
+        self.close()
+        self._mm, other._mm = other._mm, None
+        self._format = other._format
+        self._ranges, other._ranges = other._ranges, {}
+        self._loaded = {name: anime for name, anime in self._loaded.items() if name in self._ranges}
+
+    def close(self) -> None:
+        """Release the memory map."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def peek(self, name: str) -> AnimeDetails:
+        """
+        Get an entry for reading without keeping it decoded.
+
+        Changes to the returned AnimeDetails are only kept once it is
+        assigned back to the store.
+
+        Args:
+            name: Name of the anime
+
+        Returns:
+            The decoded entry, or the kept one if it was accessed before
+
+        Raises:
+            KeyError: If the store has no such entry
+        """
+        anime = self._loaded.get(name)
+        if anime is None:
+            start, end = self._ranges[name]
+            anime = AnimeDetails.from_dict(name, get_serializer(self._format).loads(self._mm[start:end]))
+        return anime
+
+    def __getitem__(self, name: str) -> AnimeDetails:
+        anime = self._loaded.get(name)
+        if anime is None:
+            anime = self._loaded[name] = self.peek(name)
+        return anime
+
+    def __setitem__(self, name: str, anime: AnimeDetails) -> None:
+        if name not in self._ranges:
+            self._ranges[name] = None
+        self._loaded[name] = anime
+
+    def __delitem__(self, name: str) -> None:
+        del self._ranges[name]
+        self._loaded.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ranges
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ranges)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def save(self, serializer: ConfigSerializer, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Write the config, copying untouched entries straight from the map.
+
+        Only entries that were accessed are re-encoded. The new byte ranges
+        are recorded while writing, so the file is not re-indexed.
+
+        Args:
+            serializer: Serializer for the target format
+            names: Every name in the order to write, defaults to the
+                order of the store
+        """
+        binary = isinstance(serializer, MsgpackSerializer)
+        reuse_raw = binary == (self._format == FORMAT_MSGPACK)
+        new_ranges: Dict[str, Optional[Tuple[int, int]]] = {}
+
+        def chunks() -> Iterator[bytes]:
+            offset = 0
+            if binary:
+                head = b'\xdf' + struct.pack('>I', len(self._ranges))
+            else:
+                head = b'{'
+            for name in self._ranges if names is None else names:
+                byte_range = self._ranges[name]
+                if name in self._loaded or not reuse_raw:
+                    value = serializer.dumps(self.peek(name).to_dict())
+                else:
+                    value = self._mm[byte_range[0]:byte_range[1]]
+                if binary:
+                    key = msgpack.packb(name, use_bin_type=True)
+                else:
+                    key = (',\n' if new_ranges else '\n').encode('utf-8') + json.dumps(name).encode('utf-8') + b': '
+                start = offset + len(head) + len(key)
+                new_ranges[name] = (start, start + len(value))
+                offset = start + len(value)
+                yield head + key + value
+                head = b''
+            yield head + (b'' if binary else b'\n}')
+            if os.name == 'nt':
+                # Windows does not replace a mapped file; runs once every
+                # chunk is written, before the file is replaced
+                self.close()
+
+        mapped = self._mm is not None
+        try:
+            write_atomic(self.path, chunks())
+        except BaseException:
+            if mapped and self._mm is None:
+                # The old file is still in place and matches the old ranges
+                self._mm = self._map()
+            raise
+        self.close()
+        self._ranges = new_ranges
+        self._format = FORMAT_MSGPACK if binary else FORMAT_JSON
+        self._mm = self._map()
@@ -0,0 +1,150 @@
+"""Secondary indexes for filtered and sorted anime list views."""
+
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+from src.constant.constant import (
+    LIST_FILTER_ALL,
+    LIST_SORT_ADDED,
+    LIST_SORT_RATING,
+    LIST_SORT_EPISODES,
+    LIST_SORT_NAME,
+)
+
+if TYPE_CHECKING:
+    from src.model.anime import AnimeDetails
+
+LIST_SORTS = (LIST_SORT_ADDED, LIST_SORT_RATING, LIST_SORT_EPISODES, LIST_SORT_NAME)
+
+
+def _sort_keys(index: int, label: int, anime: 'AnimeDetails') -> Dict[str, tuple]:
+    """Get the key of an anime in every sorted view; list order breaks ties."""
+    return {
+        LIST_SORT_ADDED: (label, index),
+        LIST_SORT_RATING: (-float(anime.rating or 0), label, index),
+        LIST_SORT_EPISODES: (-int(anime.episodes), label, index),
+        LIST_SORT_NAME: (anime.name.casefold(), label, index),
+    }
+
+
+class ListViewIndex:
+    """
+    Sorted views of the anime list per status.
+
+    Every (status filter, sort) pair is a sorted list of keys ending with the
+    anime's index, so a page of any view is a slice. Changing an anime moves
+    its keys in the affected views only. Keys include the anime's label in
+    AnimeOrder, so the list order applies within ties. The views are built
+    with one sort each; later changes keep them sorted.
+    """
+
+    def __init__(self):
+        """Initialize empty views."""
+        self._views: Dict[Tuple[str, str], List[tuple]] = {}
+
+    @classmethod
+    def build(cls, animes: Iterable[Tuple[int, int, 'AnimeDetails']]) -> 'ListViewIndex':
+        """
+        Build the views of many animes with one sort per view.
+
+        Args:
+            animes: (index, label, anime) of every anime
+
+        Returns:
+            The index
+        """
+        list_view_index = cls()
+        views = list_view_index._views
+        for index, label, anime in animes:
+            for sort, key in _sort_keys(index, label, anime).items():
+                views.setdefault((LIST_FILTER_ALL, sort), []).append(key)
+                views.setdefault((anime.status, sort), []).append(key)
+        for view in views.values():
+            view.sort()
+        return list_view_index
+
+    def _insert(self, status: str, keys: Dict[str, tuple]) -> None:
+        for sort, key in keys.items():
+            insort(self._views.setdefault((status, sort), []), key)
+
+    def _remove(self, status: str, keys: Dict[str, tuple]) -> None:
+        for sort, key in keys.items():
+            view = self._views[(status, sort)]
+            del view[bisect_left(view, key)]
+
+    def add(self, index: int, label: int, anime: 'AnimeDetails') -> None:
+        """
+        Add an anime to the views.
+
+        Args:
+            index: Index of the anime
+            label: Label of the anime in the list order
+            anime: The anime
+        """
+        keys = _sort_keys(index, label, anime)
+        self._insert(LIST_FILTER_ALL, keys)
+        self._insert(anime.status, keys)
+
+    def remove(self, index: int, label: int, anime: 'AnimeDetails') -> None:
+        """
+        Remove an anime from the views.
+
+        Args:
+            index: Index of the anime
+            label: Label of the anime in the list order
+            anime: The anime as it was added
+        """
+        keys = _sort_keys(index, label, anime)
+        self._remove(LIST_FILTER_ALL, keys)
+        self._remove(anime.status, keys)
+
+    def update(self, index: int, label: int, before: 'AnimeDetails', after: 'AnimeDetails') -> None:
+        """
+        Move an anime in the views after it changed.
+
+        Args:
+            index: Index of the anime
+            label: Label of the anime in the list order
+            before: The anime before the change
+            after: The anime after the change
+        """
+        old_keys = _sort_keys(index, label, before)
+        new_keys = _sort_keys(index, label, after)
+        changed_old = {sort: key for sort, key in old_keys.items() if key != new_keys[sort]}
+        changed_new = {sort: new_keys[sort] for sort in changed_old}
+        if before.status != after.status:
+            self._remove(before.status, old_keys)
+            self._insert(after.status, new_keys)
+        elif changed_old:
+            self._remove(after.status, changed_old)
+            self._insert(after.status, changed_new)
+        if changed_old:
+            self._remove(LIST_FILTER_ALL, changed_old)
+            self._insert(LIST_FILTER_ALL, changed_new)
+
+    def count(self, status: str) -> int:
+        """
+        Count the animes in a view.
+
+        Args:
+            status: Status to filter by, or LIST_FILTER_ALL
+
+        Returns:
+            Number of animes
+        """
+        return len(self._views.get((status, LIST_SORT_ADDED), ()))
+
+    def get_page(self, status: str, sort: str, start: int, stop: int) -> List[int]:
+        """
+        Get a slice of a view.
+
+        Args:
+            status: Status to filter by, or LIST_FILTER_ALL
+            sort: One of LIST_SORTS
+            start: First position in the view
+            stop: Position after the last one
+
+        Returns:
+            Indexes of the animes in the slice
+        """
+        return [key[-1] for key in self._views.get((status, sort), [])[start:stop]]
@@ -0,0 +1,95 @@
+"""Sorted prefix index over anime names."""
+
+from bisect import bisect_left
+from typing import Iterable, List
+
+# Sorts after every character, closing the range of keys with a prefix
+_PREFIX_END = '\U0010ffff'
+
+
+def _word_suffixes(name: str) -> List[str]:
+    """Get the case-folded name starting at each of its words."""
+    folded = ' '.join(name.casefold().split())
+    return [folded[i:] for i in range(len(folded)) if i == 0 or folded[i - 1] == ' ']
+
+
+class PrefixIndex:
+    """
+    Sorted keys for prefix lookups by any word of an anime name.
+
+    "Sousou no Frieren" is found by "sou", "no f" and "frie". Lookups are
+    two binary searches; the index is built with one sort and later
+    inserts keep the keys sorted.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._keys: List[str] = []
+        self._names: List[str] = []
+
+    @classmethod
+    def build(cls, names: Iterable[str]) -> 'PrefixIndex':
+        """
+        Index many names with a single sort.
+
+        Inserting one key at a time shifts the lists on every insert, which
+        is quadratic for a whole collection.
+
+        Args:
+            names: Anime names to index
+
+        Returns:
+            The index
+        """
+        pairs = sorted((key, name) for name in names for key in _word_suffixes(name))
+        index = cls()
+        index._keys = [key for key, _ in pairs]
+        index._names = [name for _, name in pairs]
+        return index
+
+    def add(self, name: str) -> None:
+        """
+        Index an anime name.
+
+        Args:
+            name: Name of the anime
+        """
+        for key in _word_suffixes(name):
+            pos = bisect_left(self._keys, key)
+            self._keys.insert(pos, key)
+            self._names.insert(pos, name)
+
+    def remove(self, name: str) -> None:
+        """
+        Remove an anime name from the index.
+
+        Args:
+            name: Name of the anime
+        """
+        for key in _word_suffixes(name):
+            pos = bisect_left(self._keys, key)
+            while self._names[pos] != name:
+                pos += 1
+            del self._keys[pos]
+            del self._names[pos]
+
+    def search(self, prefix: str, limit: int) -> List[str]:
+        """
+        Find names with a word starting with the prefix.
+
+        Args:
+            prefix: Prefix to look up, case-insensitive
+            limit: Maximum number of names to return
+
+        Returns:
+            Matching names, ordered by the matching part of the name
+        """
+        prefix = ' '.join(prefix.casefold().split())
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + _PREFIX_END, start)
+        names = {}
+        for name in self._names[start:end]:
+            names[name] = None
+            if len(names) >= limit:
+                break
+        return list(names)
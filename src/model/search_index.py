@@ -0,0 +1,151 @@
+"""Trigram index for searching anime names and descriptions."""
+
+from math import ceil
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+# Share of the query's trigrams a fuzzy result has to contain
+SEARCH_MIN_SIMILARITY = 0.5
+
+_NO_NAMES: FrozenSet[str] = frozenset()
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """
+    Split text into case-insensitive trigrams.
+
+    Words are padded like in PostgreSQL's pg_trgm, so short words and word
+    starts still produce trigrams.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Set of trigrams
+    """
+    result = set()
+    for word in text.casefold().split():
+        padded = f"  {word} "
+        result.update([padded[i:i + 3] for i in range(len(padded) - 2)])
+    return frozenset(result)
+
+
+class TrigramIndex:
+    """Inverted index from trigram to the names of animes containing it."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[str, Set[str]] = {}
+        self._documents: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, name: str, description: str) -> None:
+        """
+        Index an anime.
+
+        Args:
+            name: Name of the anime
+            description: Description of the anime
+        """
+        if name in self._documents:
+            self.remove(name)
+        name_trigrams = trigrams(name)
+        description_trigrams = trigrams(description)
+        self._documents[name] = (name_trigrams, description_trigrams)
+        postings = self._postings
+        for trigram in name_trigrams | description_trigrams:
+            names = postings.get(trigram)
+            if names is None:
+                postings[trigram] = {name}
+            else:
+                names.add(name)
+
+    def update(self, name: str, description: str) -> None:
+        """
+        Re-index the description of an anime, touching only changed trigrams.
+
+        Args:
+            name: Name of the anime
+            description: New description
+        """
+        if name not in self._documents:
+            self.add(name, description)
+            return
+        name_trigrams, old_description_trigrams = self._documents[name]
+        new_description_trigrams = trigrams(description)
+        old_all = name_trigrams | old_description_trigrams
+        new_all = name_trigrams | new_description_trigrams
+        for trigram in old_all - new_all:
+            self._discard(trigram, name)
+        for trigram in new_all - old_all:
+            self._postings.setdefault(trigram, set()).add(name)
+        self._documents[name] = (name_trigrams, new_description_trigrams)
+
+    def remove(self, name: str) -> None:
+        """
+        Remove an anime from the index.
+
+        Args:
+            name: Name of the anime
+        """
+        name_trigrams, description_trigrams = self._documents.pop(name)
+        for trigram in name_trigrams | description_trigrams:
+            self._discard(trigram, name)
+
+    def _discard(self, trigram: str, name: str) -> None:
+        """Remove a name from a posting list, dropping empty lists."""
+        names = self._postings[trigram]
+        names.discard(name)
+        if not names:
+            del self._postings[trigram]
+
+    def search(self, text: str) -> List[str]:
+        """
+        Find animes matching the text, best matches first.
+
+        Animes containing every query trigram come first, those matching in
+        the name before those matching only in the description. When no
+        anime contains all of them, animes containing at least
+        SEARCH_MIN_SIMILARITY of the query trigrams are ranked by how many
+        they contain, so misspelled queries still find something.
+
+        Args:
+            text: Search text
+
+        Returns:
+            Names of matching animes
+        """
+        query = trigrams(text)
+        if not query:
+            return []
+        postings = sorted((self._postings.get(trigram, _NO_NAMES) for trigram in query), key=len)
+
+        # Intersect smallest posting lists first, so the work is bounded by
+        # the rarest trigram rather than by the collection size
+        matches = set(postings[0])
+        for names in postings[1:]:
+            if not matches:
+                break
+            matches &= names
+        documents = self._documents
+        results = sorted(
+            matches,
+            key=lambda name: (not query <= documents[name][0], len(name), name)
+        )
+        if results:
+            return results
+
+        required = max(1, ceil(len(query) * SEARCH_MIN_SIMILARITY))
+        # A result containing `required` of the query trigrams must contain at
+        # least one of any len(query) - required + 1 of them, so only the
+        # rarest ones need to be read to collect candidates.
+        candidates = set().union(*postings[:len(query) - required + 1])
+        scored = []
+        for name in candidates:
+            name_trigrams, description_trigrams = documents[name]
+            if len(query & (name_trigrams | description_trigrams)) >= required:
+                score = 2 * len(query & name_trigrams) + len(query & description_trigrams)
+                scored.append((-score, name))
+        scored.sort()
+        return [name for _, name in scored]
@@ -0,0 +1,98 @@
+"""Recently handled update IDs, for dropping updates Telegram delivers again."""
+
+from collections import OrderedDict
+from typing import Optional
+import logging
+import time
+
+from src.model.serializer import ConfigSerializer, load_config, dump_config
+
+logger = logging.getLogger("tg_bot")
+
+
+class SeenUpdates:
+    """
+    Keys of the updates handled within the last window seconds, at most limit.
+
+    Keys are kept in the order they were seen, so expired ones and, when the
+    limit is reached, the oldest ones are evicted from the front. Checking
+    and recording a key is O(1), and each key costs one dictionary entry.
+    Changes only mark the cache dirty; flush() writes it, so a restart still
+    recognizes updates redelivered because their offset was never confirmed.
+    """
+
+    def __init__(self, path: str, serializer: ConfigSerializer, window: float, limit: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            path: Path of the file the keys are kept in
+            serializer: Serializer used when writing the file
+            window: Seconds a key is remembered
+            limit: Maximum number of keys remembered
+        """
+        self.path = path
+        self.serializer = serializer
+        self.window = window
+        self.limit = limit
+        self.dirty = False
+        self.duplicates = 0
+        # Key -> time it was seen, oldest first
+        self._seen: OrderedDict[str, float] = OrderedDict()
+
+    def load(self) -> None:
+        """
+        Restore the keys of the file that are still within the window.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        now = time.time()
+        self._seen = OrderedDict(
+            (key, seen_at) for key, seen_at in load_config(self.path).get('seen', [])
+            if now - seen_at < self.window
+        )
+        while len(self._seen) > self.limit:
+            self._seen.popitem(last=False)
+
+    def flush(self) -> bool:
+        """
+        Write the file if a key was added since the last write.
+
+        Returns:
+            True if the file was written
+        """
+        if not self.dirty:
+            return False
+        dump_config({'seen': [[key, seen_at] for key, seen_at in self._seen.items()]}, self.path, self.serializer)
+        self.dirty = False
+        return True
+
+    def check(self, *keys: Optional[str]) -> bool:
+        """
+        Record the keys of an update and tell whether any was seen before.
+
+        Args:
+            keys: Keys identifying the update, e.g. its update ID and its
+                callback query ID; None is ignored
+
+        Returns:
+            True if the update is a duplicate
+        """
+        now = time.time()
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+            if now - seen_at < self.window and len(self._seen) < self.limit:
+                break
+            del self._seen[key]
+        keys = [key for key in keys if key is not None]
+        if any(key in self._seen for key in keys):
+            self.duplicates += 1
+            return True
+        for key in keys:
+            self._seen[key] = now
+        self.dirty = True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._seen)
@@ -0,0 +1,212 @@
+"""Serializers for the anime config file."""
+
+from typing import Dict, Iterable, Optional, Tuple
+import json
+import logging
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger("tg_bot")
+
+FORMAT_JSON = "json"
+FORMAT_COMPACT_JSON = "compact_json"
+FORMAT_ORJSON = "orjson"
+FORMAT_MSGPACK = "msgpack"
+
+
+class ConfigSerializer:
+    """Pretty-printed stdlib JSON, the original anime_config.json format."""
+
+    name = FORMAT_JSON
+
+    def dumps(self, data: Dict) -> bytes:
+        """
+        Encode the anime config.
+
+        Args:
+            data: Dictionary of anime name to details
+
+        Returns:
+            Encoded config
+        """
+        return json.dumps(data, indent=4).encode('utf-8')
+
+    def loads(self, raw: bytes) -> Dict:
+        """
+        Decode the anime config.
+
+        Args:
+            raw: Encoded config
+
+        Returns:
+            Dictionary of anime name to details
+        """
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+
+
+class CompactJsonSerializer(ConfigSerializer):
+    """Stdlib JSON without indentation or padding."""
+
+    name = FORMAT_COMPACT_JSON
+
+    def dumps(self, data: Dict) -> bytes:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class OrjsonSerializer(ConfigSerializer):
+    """Compact JSON encoded with orjson."""
+
+    name = FORMAT_ORJSON
+
+    def dumps(self, data: Dict) -> bytes:
+        return orjson.dumps(data)
+
+
+class MsgpackSerializer(ConfigSerializer):
+    """Binary msgpack snapshot."""
+
+    name = FORMAT_MSGPACK
+
+    def dumps(self, data: Dict) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, raw: bytes) -> Dict:
+        return msgpack.unpackb(raw, raw=False)
+
+
+def get_serializer(config_format: str) -> ConfigSerializer:
+    """
+    Get the serializer for a config format.
+
+    Formats whose optional dependency is not installed fall back to
+    stdlib JSON so the config stays readable.
+
+    Args:
+        config_format: One of json, compact_json, orjson, msgpack
+
+    Returns:
+        Serializer instance
+    """
+    if config_format == FORMAT_JSON:
+        return ConfigSerializer()
+    if config_format == FORMAT_COMPACT_JSON:
+        return CompactJsonSerializer()
+    if config_format == FORMAT_ORJSON:
+        if orjson is not None:
+            return OrjsonSerializer()
+        logger.warning("orjson is not installed, falling back to compact JSON")
+        return CompactJsonSerializer()
+    if config_format == FORMAT_MSGPACK:
+        if msgpack is not None:
+            return MsgpackSerializer()
+        logger.warning("msgpack is not installed, falling back to JSON")
+        return ConfigSerializer()
+    raise ValueError(f"Unknown anime config format: {config_format}")
+
+
+def detect_format(raw: bytes) -> str:
+    """
+    Detect the format of an encoded config from its first byte.
+
+    Args:
+        raw: Encoded config
+
+    Returns:
+        FORMAT_MSGPACK for msgpack maps, FORMAT_JSON otherwise
+    """
+    head = raw.lstrip()[:1]
+    if head and (0x80 <= head[0] <= 0x8f or head[0] in (0xde, 0xdf)):
+        return FORMAT_MSGPACK
+    return FORMAT_JSON
+
+
+def load_config(path: str) -> Dict:
+    """
+    Load an anime config file, auto-detecting its format.
+
+    Args:
+        path: Path to the config file
+
+    Returns:
+        Dictionary of anime name to details
+    """
+    with open(path, 'rb') as file:
+        raw = file.read()
+    config_format = detect_format(raw)
+    if config_format == FORMAT_MSGPACK and msgpack is None:
+        raise RuntimeError(f"{path} is a msgpack snapshot but msgpack is not installed")
+    return get_serializer(config_format).loads(raw)
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Get a value that changes whenever a file is replaced or modified.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        (inode, modification time in ns, size), or None if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def write_atomic(path: str, chunks: Iterable[bytes]) -> None:
+    """
+    Write a file through a temporary sibling and rename it into place.
+
+    Readers (including memory maps of the old file) never see a partially
+    written config.
+
+    Args:
+        path: Path to write
+        chunks: Byte chunks making up the file
+    """
+    # Named per process, so worker processes sharing the config never write
+    # into each other's temporary file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        for chunk in chunks:
+            file.write(chunk)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def dump_config(data: Dict, path: str, serializer: ConfigSerializer) -> None:
+    """
+    Write an anime config file.
+
+    Args:
+        data: Dictionary of anime name to details
+        path: Path to the config file
+        serializer: Serializer to encode with
+    """
+    write_atomic(path, [serializer.dumps(data)])
+
+
+def convert_config(source: str, target: str, config_format: str) -> None:
+    """
+    Convert an anime config file to another format.
+
+    Args:
+        source: Path of the existing config, in any supported format
+        target: Path to write the converted config to
+        config_format: Format to convert to
+    """
+    dump_config(load_config(source), target, get_serializer(config_format))
@@ -0,0 +1,258 @@
+"""Persistent store for pending edits and conversation states."""
+
+from collections import Counter
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Tuple
+import logging
+import time
+
+from src.model.serializer import (
+    ConfigSerializer,
+    load_config,
+    dump_config,
+)
+
+logger = logging.getLogger("tg_bot")
+
+
+class SessionStore(MutableMapping[int, Dict]):
+    """
+    Pending edits keyed by user ID, plus the conversation state, the panel
+    message and named values such as the last search of each user.
+
+    Edits, states and values expire ttl seconds after they were last written, panels
+    panel_max_age seconds after the message was sent. Changes only
+    mark the store dirty; flush() writes everything in one compact file, so
+    a burst of updates costs a single write.
+    """
+
+    def __init__(self, path: str, serializer: ConfigSerializer, ttl: float, panel_max_age: float):
+        """
+        Initialize an empty store.
+
+        Args:
+            path: Path of the session file
+            serializer: Serializer used when writing the file
+            ttl: Seconds an untouched edit, state or value is kept
+            panel_max_age: Seconds a panel message is kept after it was sent
+        """
+        self.path = path
+        self.serializer = serializer
+        self.ttl = ttl
+        self.panel_max_age = panel_max_age
+        self.dirty = False
+        # Time of the last successful write and the error of the last
+        # failed one, for health checks
+        self.last_flush: Optional[float] = None
+        self.flush_error: Optional[str] = None
+        # User ID -> (edit data, expiry time)
+        self._edits: Dict[int, Tuple[Dict, float]] = {}
+        # User ID -> (conversation state, expiry time)
+        self._states: Dict[int, Tuple[str, float]] = {}
+        # User ID -> (chat ID, message ID, time the message was sent)
+        self._panels: Dict[int, Tuple[int, int, float]] = {}
+        # (user ID, name) -> (value, expiry time)
+        self._values: Dict[Tuple[int, str], Tuple[Any, float]] = {}
+
+    def load(self) -> None:
+        """
+        Restore the entries of the session file, dropping expired ones.
+
+        Raises:
+            FileNotFoundError: If the session file does not exist
+        """
+        data = load_config(self.path)
+        now = time.time()
+        self._edits = {
+            user_id: (edit, expires)
+            for user_id, expires, edit in data.get('edits', [])
+            if expires > now
+        }
+        self._states = {
+            user_id: (state, expires)
+            for user_id, state, expires in data.get('states', [])
+            if expires > now
+        }
+        self._panels = {
+            user_id: (chat_id, message_id, sent_at)
+            for user_id, chat_id, message_id, sent_at in data.get('panels', [])
+            if sent_at + self.panel_max_age > now
+        }
+        self._values = {
+            (user_id, name): (value, expires)
+            for user_id, name, value, expires in data.get('values', [])
+            if expires > now
+        }
+        logger.info(f"Restored {len(self._edits)} pending edits and "
+                    f"{len(self._states)} conversations from {self.path}")
+
+    def flush(self) -> bool:
+        """
+        Write the session file if anything changed since the last write.
+
+        Returns:
+            True if the file was written
+
+        Raises:
+            OSError: If the file cannot be written; the store stays dirty
+        """
+        if not self.dirty:
+            return False
+        data = {
+            'edits': [[user_id, expires, edit] for user_id, (edit, expires) in self._edits.items()],
+            'states': [[user_id, state, expires] for user_id, (state, expires) in self._states.items()],
+            'panels': [[user_id, *panel] for user_id, panel in self._panels.items()],
+            'values': [[user_id, name, value, expires] for (user_id, name), (value, expires) in self._values.items()],
+        }
+        try:
+            dump_config(data, self.path, self.serializer)
+        except OSError as e:
+            self.flush_error = str(e)
+            raise
+        self.dirty = False
+        self.last_flush = time.time()
+        self.flush_error = None
+        return True
+
+    def sweep(self, now: Optional[float] = None) -> Counter:
+        """
+        Evict expired edits, conversation states, panels and values.
+
+        Args:
+            now: Current time, defaults to time.time()
+
+        Returns:
+            Number of evicted conversations per state
+        """
+        now = time.time() if now is None else now
+        expired_edits = [user_id for user_id, (_, expires) in self._edits.items() if expires <= now]
+        for user_id in expired_edits:
+            del self._edits[user_id]
+        expired_states = Counter()
+        for user_id in [user_id for user_id, (_, expires) in self._states.items() if expires <= now]:
+            expired_states[self._states.pop(user_id)[0]] += 1
+        expired_panels = [
+            user_id for user_id, (_, _, sent_at) in self._panels.items()
+            if sent_at + self.panel_max_age <= now
+        ]
+        for user_id in expired_panels:
+            del self._panels[user_id]
+        expired_values = [key for key, (_, expires) in self._values.items() if expires <= now]
+        for key in expired_values:
+            del self._values[key]
+        if expired_edits or expired_states or expired_panels or expired_values:
+            self.dirty = True
+        return expired_states
+
+    def get_state(self, user_id: int) -> Tuple[Optional[str], bool]:
+        """
+        Get the conversation state of a user.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            The state, or None if the user is not in a conversation, and
+            whether that state has expired
+        """
+        entry = self._states.get(user_id)
+        if entry is None:
+            return None, False
+        return entry[0], entry[1] <= time.time()
+
+    def set_state(self, user_id: int, state: Optional[str]) -> None:
+        """
+        Record the conversation state of a user, restarting its TTL.
+
+        Args:
+            user_id: ID of the user
+            state: New state, or None if the conversation ended
+        """
+        if state is None:
+            if self._states.pop(user_id, None) is None:
+                return
+        else:
+            self._states[user_id] = (state, time.time() + self.ttl)
+        self.dirty = True
+
+    def get_panel(self, user_id: int) -> Optional[Tuple[int, int, float]]:
+        """
+        Get the panel message of a user.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            (chat ID, message ID, time sent), or None if there is no panel
+            young enough to edit
+        """
+        panel = self._panels.get(user_id)
+        if panel is None or panel[2] + self.panel_max_age <= time.time():
+            return None
+        return panel
+
+    def set_panel(self, user_id: int, chat_id: int, message_id: int, sent_at: float) -> None:
+        """
+        Record the panel message of a user.
+
+        Args:
+            user_id: ID of the user
+            chat_id: ID of the chat of the message
+            message_id: ID of the message
+            sent_at: Time the message was sent
+        """
+        panel = (chat_id, message_id, sent_at)
+        if self._panels.get(user_id) != panel:
+            self._panels[user_id] = panel
+            self.dirty = True
+
+    def get_value(self, user_id: int, name: str) -> Optional[Any]:
+        """
+        Get a named value of a user.
+
+        Args:
+            user_id: ID of the user
+            name: Name of the value
+
+        Returns:
+            The value, or None if it is not set or has expired
+        """
+        entry = self._values.get((user_id, name))
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def set_value(self, user_id: int, name: str, value: Optional[Any]) -> None:
+        """
+        Record a named value of a user, restarting its TTL.
+
+        Args:
+            user_id: ID of the user
+            name: Name of the value
+            value: The value, which must be serializable, or None to drop it
+        """
+        if value is None:
+            if self._values.pop((user_id, name), None) is None:
+                return
+        else:
+            self._values[(user_id, name)] = (value, time.time() + self.ttl)
+        self.dirty = True
+
+    def __getitem__(self, user_id: int) -> Dict:
+        return self._edits[user_id][0]
+
+    def __setitem__(self, user_id: int, edit: Dict) -> None:
+        self._edits[user_id] = (edit, time.time() + self.ttl)
+        self.dirty = True
+
+    def __delitem__(self, user_id: int) -> None:
+        del self._edits[user_id]
+        self.dirty = True
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._edits
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._edits)
+
+    def __len__(self) -> int:
+        return len(self._edits)
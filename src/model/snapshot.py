@@ -0,0 +1,160 @@
+"""Compressed, deduplicated snapshots of the anime config."""
+
+from typing import List, NamedTuple, Optional
+import calendar
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import time
+
+from src.model.serializer import load_config
+
+SNAPSHOT_CHUNK_SIZE = 1 << 20
+
+
+class Snapshot(NamedTuple):
+    """A snapshot file and what its name records."""
+
+    path: str
+    created: float
+    digest: str
+
+
+def _name_parts(config_path: str):
+    """Split the config file name into stem and extension."""
+    return os.path.splitext(os.path.basename(config_path))
+
+
+def list_snapshots(directory: str, config_path: str) -> List[Snapshot]:
+    """
+    List the snapshots of a config, newest first.
+
+    Args:
+        directory: Snapshot directory
+        config_path: Path of the config the snapshots were taken of
+
+    Returns:
+        Snapshots, newest first; an empty list if the directory does not exist
+    """
+    stem, ext = _name_parts(config_path)
+    pattern = re.compile(rf'^{re.escape(stem)}-(\d{{8}}-\d{{6}})-([0-9a-f]{{16}}){re.escape(ext)}\.gz$')
+    try:
+        entries = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    snapshots = []
+    for entry in entries:
+        match = pattern.match(entry)
+        if match:
+            created = calendar.timegm(time.strptime(match.group(1), '%Y%m%d-%H%M%S'))
+            snapshots.append(Snapshot(os.path.join(directory, entry), created, match.group(2)))
+    snapshots.sort(key=lambda snapshot: snapshot.created, reverse=True)
+    return snapshots
+
+
+def take_snapshot(config_path: str, directory: str, previous_digest: Optional[str] = None) -> Optional[Snapshot]:
+    """
+    Compress the config into a new snapshot unless it equals the previous one.
+
+    The config is only ever replaced atomically, so the open file is one
+    consistent version even if the bot writes a new one meanwhile. The file
+    is hashed while it is compressed, in one pass.
+
+    Args:
+        config_path: Path of the config
+        directory: Snapshot directory, created if missing
+        previous_digest: Digest of the newest existing snapshot
+
+    Returns:
+        The new snapshot, or None if the content did not change
+
+    Raises:
+        FileNotFoundError: If the config does not exist
+    """
+    os.makedirs(directory, exist_ok=True)
+    stem, ext = _name_parts(config_path)
+    tmp_path = os.path.join(directory, f".{stem}{ext}.gz.tmp")
+    digest = hashlib.blake2b(digest_size=8)
+    with open(config_path, 'rb') as source:
+        created = os.fstat(source.fileno()).st_mtime
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as target:
+            for chunk in iter(lambda: source.read(SNAPSHOT_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                target.write(chunk)
+    hexdigest = digest.hexdigest()
+    if hexdigest == previous_digest:
+        os.remove(tmp_path)
+        return None
+    # Named after the time the config was written, so an unchanged config
+    # snapshotted again keeps its name
+    created = int(created)
+    path = os.path.join(directory, f"{stem}-{time.strftime('%Y%m%d-%H%M%S', time.gmtime(created))}-{hexdigest}{ext}.gz")
+    os.replace(tmp_path, path)
+    return Snapshot(path, created, hexdigest)
+
+
+def prune_snapshots(snapshots: List[Snapshot], keep_last: int, keep_daily: int) -> List[Snapshot]:
+    """
+    Delete the snapshots a retention policy does not keep.
+
+    The keep_last newest snapshots are kept, plus the newest snapshot of each
+    of the keep_daily most recent days that have one.
+
+    Args:
+        snapshots: Snapshots, newest first
+        keep_last: Number of newest snapshots to keep
+        keep_daily: Number of days to keep one snapshot of
+
+    Returns:
+        The deleted snapshots
+    """
+    kept = set(snapshot.path for snapshot in snapshots[:keep_last])
+    days = []
+    for snapshot in snapshots:
+        day = time.gmtime(snapshot.created)[:3]
+        if day not in days:
+            if len(days) == keep_daily:
+                break
+            days.append(day)
+            kept.add(snapshot.path)
+    removed = [snapshot for snapshot in snapshots if snapshot.path not in kept]
+    for snapshot in removed:
+        os.remove(snapshot.path)
+    return removed
+
+
+def restore_snapshot(snapshot_path: str, config_path: str) -> int:
+    """
+    Replace the config with the content of a snapshot.
+
+    The snapshot is decompressed next to the config and checked to load
+    before it atomically replaces the config, so a running bot picks it up
+    as an external edit.
+
+    Args:
+        snapshot_path: Path of the snapshot
+        config_path: Path of the config to replace
+
+    Returns:
+        Number of animes restored
+
+    Raises:
+        ValueError: If the snapshot does not hold a valid config
+    """
+    tmp_path = f"{config_path}.restore"
+    try:
+        with gzip.open(snapshot_path, 'rb') as source, open(tmp_path, 'wb') as target:
+            shutil.copyfileobj(source, target, SNAPSHOT_CHUNK_SIZE)
+            target.flush()
+            os.fsync(target.fileno())
+        try:
+            count = len(load_config(tmp_path))
+        except Exception as e:
+            raise ValueError(f"{snapshot_path} does not hold a valid anime config: {e}") from e
+        os.replace(tmp_path, config_path)
+        return count
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,137 @@
+"""Streaming export and import of anime collections as documents."""
+
+from typing import Dict, Iterable, Iterator, Tuple
+import csv
+import io
+import json
+import math
+
+from src.constant.constant import (
+    DEFAULT_DESCRIPTION,
+    DEFAULT_RATING,
+    DEFAULT_STATUS,
+    DEFAULT_EPISODES,
+    KNOWN_STATUSES,
+    MAX_RATING,
+)
+from src.model.anime import AnimeDetails
+from src.model.lazy_store import LazyAnimeStore
+
+EXPORT_FORMAT_JSON = "json"
+EXPORT_FORMAT_CSV = "csv"
+CSV_FIELDS = ['name', 'description', 'rating', 'status', 'episodes']
+
+
+def iter_export_chunks(animes: Iterable[AnimeDetails], export_format: str) -> Iterator[bytes]:
+    """
+    Encode animes one at a time as a JSON or CSV document.
+
+    The JSON layout is the one of anime_config.json, so an export can also
+    be used as a config file.
+
+    Args:
+        animes: Animes to export, typically a generator
+        export_format: EXPORT_FORMAT_JSON or EXPORT_FORMAT_CSV
+
+    Returns:
+        Iterator of encoded chunks, one per anime plus header and footer
+    """
+    if export_format == EXPORT_FORMAT_CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_FIELDS)
+        for anime in animes:
+            details = anime.to_dict()
+            writer.writerow([anime.name] + [details[field] for field in CSV_FIELDS[1:]])
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode('utf-8')
+        return
+
+    separator = '{\n'
+    for anime in animes:
+        yield f"{separator}{json.dumps(anime.name)}: {json.dumps(anime.to_dict())}".encode('utf-8')
+        separator = ',\n'
+    yield b'{}' if separator == '{\n' else b'\n}\n'
+
+
+def parse_import_record(name: str, details: Dict) -> AnimeDetails:
+    """
+    Check an imported record and turn it into AnimeDetails.
+
+    Missing fields get their defaults. Numbers may be given as strings, as
+    CSV files have nothing else.
+
+    Args:
+        name: Name of the anime
+        details: Details dictionary of the record
+
+    Returns:
+        AnimeDetails of the record
+
+    Raises:
+        ValueError: If the name is empty or a field has a wrong type or value
+    """
+    if not name or not isinstance(name, str) or not isinstance(details, dict):
+        raise ValueError(f"invalid record: {name!r}")
+
+    description = details.get('description', DEFAULT_DESCRIPTION)
+    if not isinstance(description, str):
+        raise ValueError(f"{name!r}: description must be text, got {description!r}")
+
+    status = details.get('status', DEFAULT_STATUS)
+    if status not in KNOWN_STATUSES:
+        raise ValueError(f"{name!r}: unknown status {status!r}")
+
+    rating = details.get('rating', DEFAULT_RATING)
+    if isinstance(rating, bool) or not isinstance(rating, (int, float, str)):
+        raise ValueError(f"{name!r}: rating must be a number, got {rating!r}")
+    rating = float(rating)
+    if not (math.isfinite(rating) and 0 <= rating <= MAX_RATING):
+        raise ValueError(f"{name!r}: rating must be between 0 and {MAX_RATING}, got {rating!r}")
+
+    episodes = details.get('episodes', DEFAULT_EPISODES)
+    if isinstance(episodes, bool) or not isinstance(episodes, (int, str)):
+        raise ValueError(f"{name!r}: episodes must be a whole number, got {episodes!r}")
+    episodes = int(episodes)
+    if episodes < 0:
+        raise ValueError(f"{name!r}: episodes must not be negative, got {episodes!r}")
+
+    return AnimeDetails(name=name, description=description, rating=rating, status=status, episodes=episodes)
+
+
+def iter_import_records(path: str, file_name: str) -> Iterator[Tuple[str, Dict]]:
+    """
+    Read (name, details) records from an uploaded document one at a time.
+
+    CSV files need a name column; other columns are optional. JSON files and
+    msgpack snapshots use the anime_config layout and are memory-mapped, so
+    only one entry is decoded at a time.
+
+    Args:
+        path: Path of the downloaded document
+        file_name: Original file name, used to recognize CSV
+
+    Returns:
+        Iterator of (name, details dictionary)
+
+    Raises:
+        ValueError: If the document is not in a supported layout
+    """
+    if file_name.lower().endswith('.csv'):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            reader = csv.DictReader(file)
+            if not reader.fieldnames or 'name' not in reader.fieldnames:
+                raise ValueError("CSV file needs a 'name' column")
+            for row in reader:
+                name = (row.pop('name') or '').strip()
+                yield name, {key: value for key, value in row.items() if key and value not in ('', None)}
+        return
+
+    store = LazyAnimeStore(path)
+    store.load()
+    try:
+        yield from store.iter_raw_details()
+    finally:
+        store.close()
@@ -0,0 +1,128 @@
+"""Warm-start file keeping derived indexes of an anime config across restarts."""
+
+from typing import Any, Dict, Optional, Tuple
+import logging
+import pickle
+
+from src.constant.constant import WARM_START_FORMAT
+from src.model.serializer import file_signature, write_atomic
+
+logger = logging.getLogger("tg_bot")
+
+
+def save_warm_start(path: str, signature: Tuple[int, int, int], parts: Dict[str, Any]) -> None:
+    """
+    Write derived state of an anime config.
+
+    The file starts with a header holding the format, the signature of the
+    config the parts were derived from and where each part is, so a reader
+    checks the header without reading the parts and loads each one alone.
+
+    Args:
+        path: Path to write
+        signature: Signature of the config the parts belong to
+        parts: Objects to keep, by name
+    """
+    bodies = {name: pickle.dumps(part, protocol=pickle.HIGHEST_PROTOCOL) for name, part in parts.items()}
+    offsets, offset = {}, 0
+    for name, body in bodies.items():
+        offsets[name] = (offset, len(body))
+        offset += len(body)
+    header = pickle.dumps(
+        {'format': WARM_START_FORMAT, 'signature': signature, 'offsets': offsets},
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    write_atomic(path, [header, *bodies.values()])
+
+
+class WarmStart:
+    """
+    Parts of a warm-start file that matches the loaded config.
+
+    Parts are read on first use, each at most once.
+    """
+
+    def __init__(self, path: str, base: int, offsets: Dict[str, Tuple[int, int]],
+                 file_version: Optional[Tuple[int, int, int]]):
+        """
+        Initialize from a checked header.
+
+        Args:
+            path: Path of the file
+            base: Position of the first part
+            offsets: (offset from base, length) of each part, by name
+            file_version: Signature of the file when the header was read
+        """
+        self.path = path
+        self._base = base
+        self._offsets = offsets
+        self._file_version = file_version
+
+    @classmethod
+    def open(cls, path: str, signature: Optional[Tuple[int, int, int]]) -> Optional['WarmStart']:
+        """
+        Read the header of a warm-start file.
+
+        Args:
+            path: Path of the file
+            signature: Signature of the loaded config
+
+        Returns:
+            WarmStart, or None if the file is missing, of another format or
+            derived from another version of the config
+        """
+        file_version = file_signature(path)
+        try:
+            with open(path, 'rb') as file:
+                header = pickle.load(file)
+                base = file.tell()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable {path}: {e}")
+            return None
+        if not isinstance(header, dict) or header.get('format') != WARM_START_FORMAT:
+            logger.info(f"Ignoring {path} written in another format")
+            return None
+        if signature is None or tuple(header['signature']) != tuple(signature):
+            logger.info(f"Ignoring {path}, the anime config changed since it was written")
+            return None
+        return cls(path, base, header['offsets'], file_version)
+
+    def has(self, name: str) -> bool:
+        """
+        Check whether a part is still available.
+
+        Args:
+            name: Name of the part
+
+        Returns:
+            True if the part is in the file and was not loaded yet
+        """
+        return name in self._offsets
+
+    def load(self, name: str) -> Optional[Any]:
+        """
+        Read a part.
+
+        Args:
+            name: Name of the part
+
+        Returns:
+            The part, or None if it is not available or cannot be read
+        """
+        location = self._offsets.pop(name, None)
+        if location is None:
+            return None
+        if file_signature(self.path) != self._file_version:
+            # Replaced since the header was read, e.g. by another process
+            self._offsets.clear()
+            return None
+        offset, length = location
+        try:
+            with open(self.path, 'rb') as file:
+                file.seek(self._base + offset)
+                return pickle.loads(file.read(length))
+        except Exception as e:
+            logger.warning(f"Failed to load {name} from {self.path}: {e}")
+            return None
@@ -0,0 +1,88 @@
+"""Index of the animes being watched and when they were last touched."""
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from src.constant.constant import STATUS_WATCHING
+
+if TYPE_CHECKING:
+    from src.model.anime import AnimeDetails
+
+
+class WatchingIndex:
+    """
+    Animes with the watching status and the time each was last changed.
+
+    Kept current by add/update/remove, so a digest reads the watching titles
+    without scanning the collection. Times of titles that were not changed
+    while the bot ran come from the times passed to the constructor, e.g.
+    restored from the digest state, or default to when the index was built.
+    """
+
+    def __init__(self, touched: Optional[Dict[str, float]] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            touched: Known times titles were last changed, by name
+        """
+        self._known = touched or {}
+        # Name -> (episodes, last changed)
+        self._watching: Dict[str, Tuple[int, float]] = {}
+
+    def add(self, anime: 'AnimeDetails', now: float) -> None:
+        """
+        Index an anime if it is being watched.
+
+        Args:
+            anime: The anime
+            now: Time to use if the anime has no known time
+        """
+        if anime.status == STATUS_WATCHING:
+            self._watching[anime.name] = (anime.episodes, self._known.pop(anime.name, now))
+
+    def remove(self, name: str) -> None:
+        """
+        Stop indexing an anime.
+
+        Args:
+            name: Name of the anime
+        """
+        self._watching.pop(name, None)
+
+    def update(self, anime: 'AnimeDetails', now: float) -> None:
+        """
+        Re-index a changed anime as touched now.
+
+        Args:
+            anime: The anime after the change
+            now: Time of the change
+        """
+        if anime.status == STATUS_WATCHING:
+            self._watching[anime.name] = (anime.episodes, now)
+        else:
+            self._watching.pop(anime.name, None)
+
+    def get_watching(self) -> List[Tuple[str, int, float]]:
+        """
+        Get the watching titles.
+
+        Returns:
+            (name, episodes, last changed), longest untouched first
+        """
+        return sorted(
+            ((name, episodes, touched) for name, (episodes, touched) in self._watching.items()),
+            key=lambda item: item[2],
+        )
+
+    def touched(self) -> Iterator[Tuple[str, float]]:
+        """
+        Iterate over the times the watching titles were last changed.
+
+        Returns:
+            Iterator of (name, last changed)
+        """
+        for name, (_, touched) in self._watching.items():
+            yield name, touched
+
+    def __len__(self) -> int:
+        return len(self._watching)
@@ -0,0 +1,101 @@
+"""Tests of the Fenwick-tree list order."""
+
+import random
+
+from src.model.anime_order import AnimeOrder, _INITIAL_CAPACITY
+
+
+def test_append_keeps_order_and_positions():
+    order = AnimeOrder()
+    for index in range(10, 20):
+        order.append(index)
+    assert list(order) == list(range(10, 20))
+    assert [order.position(index) for index in range(10, 20)] == list(range(10))
+    assert len(order) == 10 and 15 in order and 9 not in order
+
+
+def test_remove_shifts_later_positions_only():
+    order = AnimeOrder()
+    for index in range(5):
+        order.append(index)
+    label = order.label(2)
+    assert order.remove(2) == label
+    assert list(order) == [0, 1, 3, 4]
+    assert order.position(1) == 1 and order.position(3) == 2
+    assert 2 not in order
+
+
+def test_swap_exchanges_labels_and_stops_at_the_ends():
+    order = AnimeOrder()
+    for index in range(3):
+        order.append(index)
+    first, second = order.label(0), order.label(1)
+    assert order.swap(0, 1) == 1
+    assert list(order) == [1, 0, 2]
+    assert (order.label(0), order.label(1)) == (second, first)
+    assert order.swap(1, -1) is None
+    assert order.swap(2, 1) is None
+
+
+def test_page_clips_to_the_end():
+    order = AnimeOrder()
+    for index in range(7):
+        order.append(index)
+    assert order.page(2, 5) == [2, 3, 4]
+    assert order.page(5, 50) == [5, 6]
+    assert order.page(9, 12) == []
+
+
+def test_grows_past_the_initial_capacity():
+    order = AnimeOrder()
+    count = 3 * _INITIAL_CAPACITY + 5
+    for index in range(count):
+        order.append(index)
+    assert list(order) == list(range(count))
+    assert order.page(count - 2, count + 2) == [count - 2, count - 1]
+    assert order.position(count - 1) == count - 1
+
+
+def test_matches_a_plain_list_under_random_operations():
+    rng = random.Random(7)
+    order, expected = AnimeOrder(), []
+    next_index = 0
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.45 or not expected:
+            order.append(next_index)
+            expected.append(next_index)
+            next_index += 1
+        elif op < 0.75:
+            index = rng.choice(expected)
+            order.remove(index)
+            expected.remove(index)
+        else:
+            index = rng.choice(expected)
+            offset = rng.choice((-1, 1))
+            pos = expected.index(index) + offset
+            other = order.swap(index, offset)
+            if 0 <= pos < len(expected):
+                assert other == expected[pos]
+                expected[pos - offset], expected[pos] = expected[pos], expected[pos - offset]
+            else:
+                assert other is None
+        assert len(order) == len(expected)
+    assert list(order) == expected
+    assert [order.position(index) for index in expected] == list(range(len(expected)))
+    assert order.page(0, len(expected)) == expected
+    labels = [order.label(index) for index in expected]
+    assert labels == sorted(labels)
+
+
+def test_compacts_freed_labels():
+    order = AnimeOrder()
+    for index in range(10 * _INITIAL_CAPACITY):
+        order.append(index)
+        if index >= 3:
+            order.remove(index - 3)
+    assert list(order) == list(range(10 * _INITIAL_CAPACITY - 3, 10 * _INITIAL_CAPACITY))
+    assert len(order._tree) - 1 == _INITIAL_CAPACITY
+    assert order.relabels > 0
+    assert [order.label(index) for index in order] == sorted(order.label(index) for index in order)
+    assert order.page(0, 3) == list(order)
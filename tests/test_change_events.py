@@ -0,0 +1,77 @@
+"""Tests of the change event bus."""
+
+import pytest
+
+from src.model.change_events import ChangeEventBus
+
+
+def test_delivers_each_event_once_per_subscriber():
+    bus, first, second = ChangeEventBus(), [], []
+    bus.subscribe('first', first.append)
+    bus.subscribe('second', second.append)
+    bus.publish('a')
+    bus.publish('b')
+    assert bus.deliver('first') == 2
+    assert first == [['a', 'b']] and second == []
+    assert bus.depth == 2
+    assert bus.deliver() == 2
+    assert second == [['a', 'b']]
+    assert bus.depth == 0 and bus.published == 2
+    assert bus.deliver() == 0
+
+
+def test_events_before_subscribing_are_not_delivered():
+    bus, received = ChangeEventBus(), []
+    bus.publish('old')
+    bus.subscribe('late', received.extend)
+    bus.publish('new')
+    bus.deliver()
+    assert received == ['new']
+
+
+def test_skip_and_unsubscribe_trim_the_queue():
+    bus, received = ChangeEventBus(), []
+    bus.subscribe('skipped', received.extend)
+    bus.subscribe('gone', received.extend)
+    bus.publish('a')
+    bus.skip('skipped')
+    assert bus.get_status()['pending'] == {'skipped': 0, 'gone': 1}
+    bus.unsubscribe('gone')
+    assert bus.depth == 0
+    bus.deliver()
+    assert received == []
+
+
+def test_failing_consumer_keeps_its_batch():
+    bus, batches = ChangeEventBus(), []
+
+    def consumer(batch):
+        batches.append(list(batch))
+        if len(batches) == 1:
+            raise OSError("disk full")
+
+    bus.subscribe('writer', consumer)
+    bus.publish('a')
+    with pytest.raises(OSError):
+        bus.deliver()
+    assert bus.get_status()['pending'] == {'writer': 1}
+    bus.publish('b')
+    assert bus.deliver() == 2
+    assert batches == [['a'], ['a', 'b']]
+    assert bus.depth == 0
+
+
+def test_failing_consumer_with_on_error_is_unsubscribed():
+    bus, received, failed = ChangeEventBus(), [], []
+
+    def consumer(batch):
+        raise ValueError("bad event")
+
+    bus.subscribe('index', consumer, on_error=failed.append)
+    bus.subscribe('other', received.extend)
+    bus.publish('a')
+    assert bus.deliver() == 1
+    assert failed == ['index']
+    assert not bus.is_subscribed('index')
+    assert received == ['a']
+    assert bus.depth == 0
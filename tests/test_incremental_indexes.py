@@ -0,0 +1,98 @@
+"""Randomized checks of the incrementally updated indexes against full rebuilds."""
+
+import random
+
+import pytest
+
+from src.constant.constant import KNOWN_STATUSES, LIST_FILTER_ALL
+from src.model.anime import AnimeDetailsManager
+from src.model.list_view_index import LIST_SORTS
+
+WORDS = ["sousou", "no", "frieren", "one", "piece", "cowboy", "bebop", "mob", "psycho", "100"]
+PREFIXES = ["s", "so", "f", "fri", "o", "one p", "p", "b", "m", "1", "x"]
+QUERIES = ["frieren", "piece", "bebop", "psycho mob", "quiet", "episode"]
+
+
+def _assert_matches_rebuild(manager: AnimeDetailsManager) -> None:
+    # Builds the indexes dropped when the list order was compacted
+    manager.prepare_indexes()
+    manager.search_animes_by_prefix('', 1)
+    manager.deliver_events()
+    names = list(manager.iter_names())
+    assert [manager.get_anime_position(name) for name in names] == list(range(len(names)))
+
+    rebuilt = manager._build_list_view_index()
+    for status in (LIST_FILTER_ALL,) + KNOWN_STATUSES:
+        for sort in LIST_SORTS:
+            assert (
+                manager.list_view_index.get_page(status, sort, 0, len(names))
+                == rebuilt.get_page(status, sort, 0, len(names))
+            ), (status, sort)
+        assert manager.list_view_index.count(status) == rebuilt.count(status)
+
+    rebuilt_prefix = manager._build_prefix_index()
+    for prefix in PREFIXES:
+        assert sorted(manager.prefix_index.search(prefix, 1000)) == sorted(rebuilt_prefix.search(prefix, 1000))
+
+    rebuilt_search = manager._build_search_index()
+    for query in QUERIES:
+        assert manager.search_index.search(query) == rebuilt_search.search(query)
+
+    snapshot, expected = manager.stats.snapshot(5), manager._build_stats().snapshot(5)
+    assert snapshot.pop('average_rating') == pytest.approx(expected.pop('average_rating'))
+    assert snapshot == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_indexes_match_a_rebuild_after_random_changes(tmp_path, seed):
+    rng = random.Random(seed)
+    manager = AnimeDetailsManager(path=str(tmp_path / 'anime_config.json'))
+    manager.prepare_indexes()
+    manager.search_animes_by_prefix('', 1)
+
+    def random_name():
+        return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))) + f" {rng.randint(0, 30)}"
+
+    for step in range(300):
+        names = list(manager.iter_names())
+        op = rng.random()
+        if op < 0.3 or not names:
+            manager.add_animes([random_name() for _ in range(rng.randint(1, 3))])
+        elif op < 0.6:
+            name = rng.choice(names)
+            field = rng.choice(('rating', 'status', 'episodes', 'description'))
+            value = {
+                'rating': float(rng.randint(0, 10)),
+                'status': rng.choice(KNOWN_STATUSES),
+                'episodes': rng.randint(0, 24),
+                'description': ' '.join(rng.choice(WORDS + ["quiet", "episode"]) for _ in range(4)),
+            }[field]
+            manager.update_anime(name, **{field: value})
+        elif op < 0.75:
+            manager.delete_anime(manager.get_anime_index(rng.choice(names)))
+        else:
+            manager.move_anime(manager.get_anime_index(rng.choice(names)), rng.choice((-1, 1)))
+        if step % 25 == 0:
+            _assert_matches_rebuild(manager)
+    _assert_matches_rebuild(manager)
+    assert manager.anime_order.relabels > 0
+
+    reloaded = AnimeDetailsManager(path=manager.config)
+    assert reloaded.to_dict() == manager.to_dict()
+    assert list(reloaded.to_dict()) == list(manager.to_dict())
+
+
+def test_failing_index_is_rebuilt(tmp_path):
+    manager = AnimeDetailsManager(path=str(tmp_path / 'anime_config.json'))
+    manager.add_animes(["Frieren", "Bebop"])
+    manager.search_animes_by_prefix('f', 10)
+
+    def fail(events):
+        raise RuntimeError("broken consumer")
+
+    manager.events.subscribe('prefix_index', fail, on_error=manager._drop_index)
+    manager.add_animes(["Fate Zero"])
+    assert manager.deliver_events() == 0
+    assert manager.prefix_index is None
+    found = manager.search_animes_by_prefix('f', 10)
+    assert sorted(manager.anime_names[index] for index in found) == ["Fate Zero", "Frieren"]
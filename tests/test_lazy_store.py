@@ -0,0 +1,51 @@
+"""Tests of the memory-mapped anime store."""
+
+import json
+
+import pytest
+
+from src.model.lazy_store import LazyAnimeStore
+from src.model.serializer import FORMAT_JSON, FORMAT_MSGPACK, get_serializer, msgpack
+
+
+def _store(tmp_path):
+    path = tmp_path / 'anime_config.json'
+    path.write_text(json.dumps({"Frieren": {"episodes": 3}, "Bebop": {"rating": 9}}))
+    store = LazyAnimeStore(str(path))
+    store.load()
+    return store
+
+
+def test_save_keeps_untouched_entries_undecoded(tmp_path):
+    store = _store(tmp_path)
+    store["Frieren"].episodes = 4
+    store.save(get_serializer(FORMAT_JSON))
+    assert json.loads((tmp_path / 'anime_config.json').read_text())["Frieren"]["episodes"] == 4
+    assert not store.is_decoded("Bebop")
+    assert store.peek("Bebop").rating == 9
+
+
+def test_failed_replace_keeps_the_store_readable(tmp_path, monkeypatch):
+    store = _store(tmp_path)
+    store["Frieren"].episodes = 4
+
+    def fail(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr('os.replace', fail)
+    with pytest.raises(OSError):
+        store.save(get_serializer(FORMAT_JSON))
+    monkeypatch.undo()
+    assert store.peek("Bebop").rating == 9
+    assert store["Frieren"].episodes == 4
+    store.save(get_serializer(FORMAT_JSON))
+    assert json.loads((tmp_path / 'anime_config.json').read_text())["Frieren"]["episodes"] == 4
+
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack is not installed")
+def test_converting_formats_does_not_keep_entries_decoded(tmp_path):
+    store = _store(tmp_path)
+    store.save(get_serializer(FORMAT_MSGPACK))
+    assert not store.is_decoded("Bebop")
+    assert store.peek("Bebop").rating == 9
+    assert store.peek("Frieren").episodes == 3
@@ -0,0 +1,62 @@
+"""Tests of the sorted list views."""
+
+from src.constant.constant import (
+    DEFAULT_STATUS,
+    LIST_FILTER_ALL,
+    LIST_SORT_ADDED,
+    LIST_SORT_EPISODES,
+    LIST_SORT_NAME,
+    LIST_SORT_RATING,
+    STATUS_COMPLETED,
+    STATUS_WATCHING,
+)
+from src.model.anime import AnimeDetails
+from src.model.list_view_index import LIST_SORTS, ListViewIndex
+
+ANIMES = [
+    AnimeDetails("beta", rating=7, status=STATUS_WATCHING, episodes=3),
+    AnimeDetails("Alpha", rating=9, status=STATUS_COMPLETED, episodes=12),
+    AnimeDetails("gamma", rating=7, episodes=3),
+]
+
+
+def _build():
+    return ListViewIndex.build((index, index, anime) for index, anime in enumerate(ANIMES))
+
+
+def test_sorts_with_list_order_breaking_ties():
+    index = _build()
+    assert index.get_page(LIST_FILTER_ALL, LIST_SORT_ADDED, 0, 10) == [0, 1, 2]
+    assert index.get_page(LIST_FILTER_ALL, LIST_SORT_RATING, 0, 10) == [1, 0, 2]
+    assert index.get_page(LIST_FILTER_ALL, LIST_SORT_EPISODES, 0, 10) == [1, 0, 2]
+    assert index.get_page(LIST_FILTER_ALL, LIST_SORT_NAME, 0, 10) == [1, 0, 2]
+    assert index.get_page(LIST_FILTER_ALL, LIST_SORT_ADDED, 1, 2) == [1]
+
+
+def test_filters_by_status():
+    index = _build()
+    assert index.count(LIST_FILTER_ALL) == 3
+    assert index.count(STATUS_WATCHING) == 1
+    assert index.get_page(DEFAULT_STATUS, LIST_SORT_NAME, 0, 10) == [2]
+    assert index.get_page("dropped", LIST_SORT_NAME, 0, 10) == []
+    assert index.count("dropped") == 0
+
+
+def test_update_moves_the_anime_between_views():
+    index = _build()
+    after = AnimeDetails("gamma", rating=10, status=STATUS_WATCHING, episodes=3)
+    index.update(2, 2, ANIMES[2], after)
+    assert index.get_page(LIST_FILTER_ALL, LIST_SORT_RATING, 0, 10) == [2, 1, 0]
+    assert index.get_page(STATUS_WATCHING, LIST_SORT_ADDED, 0, 10) == [0, 2]
+    assert index.count(DEFAULT_STATUS) == 0
+
+
+def test_add_and_remove_match_a_build():
+    index = ListViewIndex()
+    for position, anime in enumerate(ANIMES):
+        index.add(position, position, anime)
+    index.remove(0, 0, ANIMES[0])
+    rebuilt = ListViewIndex.build((position, position, anime) for position, anime in enumerate(ANIMES) if position)
+    for status in (LIST_FILTER_ALL, DEFAULT_STATUS, STATUS_WATCHING, STATUS_COMPLETED):
+        for sort in LIST_SORTS:
+            assert index.get_page(status, sort, 0, 10) == rebuilt.get_page(status, sort, 0, 10)
@@ -0,0 +1,27 @@
+"""Tests of the name prefix index."""
+
+from src.model.prefix_index import PrefixIndex
+
+
+def test_finds_names_by_any_word():
+    index = PrefixIndex.build(["Sousou no Frieren", "Frieren Extras", "Naruto"])
+    assert set(index.search("frie", 10)) == {"Sousou no Frieren", "Frieren Extras"}
+    assert index.search("no f", 10) == ["Sousou no Frieren"]
+    assert index.search("  SOU  ", 10) == ["Sousou no Frieren"]
+    assert index.search("ruto", 10) == []
+
+
+def test_limit_counts_names_not_keys():
+    index = PrefixIndex.build(["Aa Ab", "Ac", "Ad"])
+    assert index.search("a", 2) == ["Aa Ab", "Ac"]
+
+
+def test_add_and_remove_match_a_build():
+    names = ["One Piece", "One Punch Man", "Piece of Cake", "Cake"]
+    index = PrefixIndex()
+    for name in names:
+        index.add(name)
+    index.remove("One Punch Man")
+    rebuilt = PrefixIndex.build(["One Piece", "Piece of Cake", "Cake"])
+    for prefix in ("o", "one", "p", "pie", "cake", "of", "man"):
+        assert index.search(prefix, 10) == rebuilt.search(prefix, 10)